@@ -0,0 +1,482 @@
+"""
+Компактный двоичный снимок компании part4 (и отдела part3).
+
+Формат (все числа little-endian):
+
+    заголовок      <4sHH>   b"EMPS", версия, вид снимка (компания/отдел)
+    строки         <II>     число строк, длина блока в байтах;
+                            затем концы строк в байтах блока (uint32[])
+                            и все строки одним блоком UTF-8
+    корень         <I>      индекс названия компании (отдела)
+    отделы         <I>      число; записи <II> (название, код)
+    сотрудники     <I>      число; теги типов (uint8[]), затем для каждого
+                            типа свои записи фиксированной ширины
+    навыки         <I>      число; индексы строк (uint32[])
+    проекты        <I>      число; записи <qIIiBII>
+    команды        <I>      число; ID сотрудников (int64[])
+
+Имена, отделы, навыки и описания хранятся один раз в таблице строк,
+в записях остаются только индексы. Записи одного типа читаются через
+struct.iter_unpack прямо из memoryview, без промежуточных словарей.
+Порядок сотрудников восстанавливается по массиву тегов. Флаги в старших
+битах номера отдела отмечают числовые поля, которые были int, чтобы они
+вернулись как int.
+Сохраняются только четыре типа сотрудников; для подклассов нужен свой
+формат, и dumps_* отказывается их записывать.
+
+Запуск модуля сравнивает размер и скорость загрузки с JSON и проверяет
+критерии запроса: файл меньше не менее чем в SIZE_TARGET раз, загрузка
+быстрее не менее чем в LOAD_TARGET раз. Критерий скорости пока
+НЕ выполнен: загрузка в 2.5-4 раза быстрее JSON, а не в 10. Она
+по-прежнему создает и проверяет каждый объект part4 и строит индексы
+компании, и разбор самого файла занимает лишь малую часть времени.
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from datetime import date
+from itertools import accumulate
+from typing import Dict, List, Tuple
+
+from source_code import part3, part4
+
+MAGIC = b"EMPS"
+VERSION = 4
+KIND_COMPANY = 1
+KIND_DEPARTMENT = 2
+
+# Критерии приемки для сравнения с JSON (см. main)
+SIZE_TARGET = 5.0
+LOAD_TARGET = 10.0
+
+TYPE_NAMES = ("Employee", "Manager", "Developer", "Salesperson")
+SENIORITY_LEVELS = ("junior", "middle", "senior")
+
+_HEADER = struct.Struct("<4sHH")
+_STRINGS = struct.Struct("<II")
+_COUNT = struct.Struct("<I")
+_DEPARTMENT = struct.Struct("<II")
+_PROJECT = struct.Struct("<qIIiBII")
+
+# Общая часть записи: id, имя, строка отдела, номер отдела, базовая зарплата.
+# В трех старших битах номера отдела - флаги int-полей:
+# бит i отмечает i-е поле из _NUMBERS[тег]
+_COMMON = "qIIHd"
+_DEPT_BITS = 13
+_DEPT_MASK = (1 << _DEPT_BITS) - 1
+_RECORDS = (
+    struct.Struct("<" + _COMMON),  # Employee
+    struct.Struct("<" + _COMMON + "d"),  # Manager: бонус
+    struct.Struct("<" + _COMMON + "BII"),  # Developer: уровень, навыки
+    struct.Struct("<" + _COMMON + "dd"),  # Salesperson: ставка, продажи
+)
+# Позиции числовых полей в записи каждого типа
+_NUMBERS = ((4,), (4, 5), (4,), (4, 5, 6))
+_TYPE_TAGS = {name: tag for tag, name in enumerate(TYPE_NAMES)}
+_SENIORITY_TAGS = {name: tag for tag, name in enumerate(SENIORITY_LEVELS)}
+
+
+class _StringTable:
+    """Таблица уникальных строк с выдачей индексов"""
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def add(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def pack(self) -> bytes:
+        encoded = [value.encode("utf-8") for value in self._strings]
+        ends = _array("I", accumulate(len(chunk) for chunk in encoded))
+        blob = b"".join(encoded)
+        return _STRINGS.pack(len(encoded), len(blob)) + ends + blob
+
+
+def _restore_ints(record: tuple, tag: int) -> tuple:
+    """Вернуть int числовым полям, отмеченным во флагах записи"""
+    values = list(record)
+    flags = record[3] >> _DEPT_BITS
+    for bit, position in enumerate(_NUMBERS[tag]):
+        if flags >> bit & 1:
+            values[position] = int(values[position])
+    return tuple(values)
+
+
+def _array(typecode: str, values) -> bytes:
+    data = array(typecode, values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _unpack_array(typecode: str, view: memoryview) -> array:
+    data = array(typecode)
+    data.frombytes(view)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+class _Reader:
+    """Последовательное чтение секций из memoryview"""
+
+    def __init__(self, data: bytes):
+        self._view = memoryview(data)
+        self._offset = 0
+
+    def take(self, size: int) -> memoryview:
+        view = self._view[self._offset : self._offset + size]
+        if len(view) != size:
+            raise ValueError("Снимок обрезан")
+        self._offset += size
+        return view
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        return layout.unpack(self.take(layout.size))
+
+    def count(self) -> int:
+        return self.unpack(_COUNT)[0]
+
+    def array(self, typecode: str, count: int) -> array:
+        return _unpack_array(typecode, self.take(count * array(typecode).itemsize))
+
+    def records(self, layout: struct.Struct, count: int):
+        return layout.iter_unpack(self.take(count * layout.size))
+
+    def strings(self) -> List[str]:
+        count, size = self.unpack(_STRINGS)
+        ends = self.array("I", count)
+        blob = self.take(size)
+        text = str(blob, "utf-8")
+        # Без многобайтных символов байтовые границы совпадают с символьными
+        source = text if len(text) == size else blob
+        strings = []
+        start = 0
+        for end in ends:
+            value = source[start:end]
+            strings.append(value if source is text else str(value, "utf-8"))
+            start = end
+        return strings
+
+
+# Запись
+def _pack_employees(
+    groups: List[Tuple[int, List]], strings: _StringTable
+) -> List[bytes]:
+    """Секции сотрудников и навыков; groups — пары (номер отдела, сотрудники)"""
+    tags = []
+    records = ([], [], [], [])
+    skills = []
+    for dept_no, employees in groups:
+        for emp in employees:
+            tag = _TYPE_TAGS.get(type(emp).__name__)
+            if tag is None:
+                raise TypeError(
+                    f"Тип сотрудника {type(emp).__name__} не поддерживается "
+                    f"форматом снимка: {', '.join(TYPE_NAMES)}"
+                )
+            common = (
+                emp.id,
+                strings.add(emp.name),
+                strings.add(emp.department),
+                dept_no,
+                emp.base_salary,
+            )
+            if tag == 0:
+                extra = ()
+            elif tag == 1:
+                extra = (emp.bonus,)
+            elif tag == 2:
+                stack = emp.tech_stack
+                extra = (_SENIORITY_TAGS[emp.seniority_level], len(skills), len(stack))
+                skills.extend(strings.add(skill) for skill in stack)
+            else:
+                extra = (emp.commission_rate, emp.sales_volume)
+            fields = [*common, *extra]
+            for bit, position in enumerate(_NUMBERS[tag]):
+                if type(fields[position]) is int:
+                    fields[3] |= 1 << _DEPT_BITS + bit
+            tags.append(tag)
+            records[tag].append(_RECORDS[tag].pack(*fields))
+    parts = [_COUNT.pack(len(tags)), bytes(tags)]
+    for chunk in records:
+        parts.extend(chunk)
+    parts += [_COUNT.pack(len(skills)), _array("I", skills)]
+    return parts
+
+
+def dumps_company(company: "part4.Company") -> bytes:
+    """Сериализация компании part4 в байты"""
+    strings = _StringTable()
+    name_index = strings.add(company.name)
+    departments = company.get_departments()
+    if len(departments) > _DEPT_MASK + 1:
+        raise ValueError("Слишком много отделов для формата")
+    department_section = [_COUNT.pack(len(departments))]
+    for dept in departments:
+        department_section.append(
+            _DEPARTMENT.pack(strings.add(dept.name), strings.add(dept.code))
+        )
+    employee_section = _pack_employees(
+        [(no, dept.get_employees()) for no, dept in enumerate(departments)], strings
+    )
+
+    projects = company.get_projects()
+    project_section = [_COUNT.pack(len(projects))]
+    team = []
+    for proj in projects:
+        members = proj.get_team()
+        project_section.append(
+            _PROJECT.pack(
+                proj.project_id,
+                strings.add(proj.name),
+                strings.add(proj.description),
+                proj.deadline_ordinal,
+                part4.Project.VALID_STATUSES.index(proj.status),
+                len(team),
+                len(members),
+            )
+        )
+        team.extend(emp.id for emp in members)
+
+    return b"".join(
+        [
+            _HEADER.pack(MAGIC, VERSION, KIND_COMPANY),
+            strings.pack(),
+            _COUNT.pack(name_index),
+            *department_section,
+            *employee_section,
+            *project_section,
+            _COUNT.pack(len(team)),
+            _array("q", team),
+        ]
+    )
+
+
+def dumps_department(department: "part3.Department") -> bytes:
+    """Сериализация отдела part3 в байты"""
+    strings = _StringTable()
+    name_index = strings.add(department.name)
+    employee_section = _pack_employees([(0, department.get_employees())], strings)
+    return b"".join(
+        [
+            _HEADER.pack(MAGIC, VERSION, KIND_DEPARTMENT),
+            strings.pack(),
+            _COUNT.pack(name_index),
+            *employee_section,
+        ]
+    )
+
+
+# Чтение
+def _read_header(reader: _Reader, kind: int) -> None:
+    magic, version, actual_kind = reader.unpack(_HEADER)
+    if magic != MAGIC:
+        raise ValueError("Файл не является снимком сотрудников")
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+    if actual_kind != kind:
+        raise ValueError("Снимок содержит данные другого вида")
+
+
+def _read_employees(reader: _Reader, strings: List[str], module) -> List[tuple]:
+    """Возвращает пары (номер отдела, сотрудник) в исходном порядке"""
+    count = reader.count()
+    tags = reader.take(count)
+    totals = [0, 0, 0, 0]
+    for tag in tags:
+        totals[tag] += 1
+    streams = [reader.records(_RECORDS[tag], totals[tag]) for tag in range(4)]
+    skill_indexes = reader.array("I", reader.count())
+
+    employee_cls, manager_cls = module.Employee, module.Manager
+    developer_cls, salesperson_cls = module.Developer, module.Salesperson
+    result = []
+    for tag in tags:
+        record = next(streams[tag])
+        if record[3] > _DEPT_MASK:
+            record = _restore_ints(record, tag)
+        id, name, department, dept_no, base_salary = record[:5]
+        dept_no &= _DEPT_MASK
+        name, department = strings[name], strings[department]
+        if tag == 0:
+            emp = employee_cls(id, name, department, base_salary)
+        elif tag == 1:
+            emp = manager_cls(id, name, department, base_salary, record[5])
+        elif tag == 2:
+            level, start, length = record[5:]
+            stack = [strings[i] for i in skill_indexes[start : start + length]]
+            emp = developer_cls(
+                id, name, department, base_salary, stack, SENIORITY_LEVELS[level]
+            )
+        else:
+            emp = salesperson_cls(
+                id, name, department, base_salary, record[5], record[6]
+            )
+        result.append((dept_no, emp))
+    return result
+
+
+def loads_company(data: bytes) -> "part4.Company":
+    """Восстановление компании part4 из байтов.
+
+    Как и EmployeeFactory.create_many, на время создания объектов
+    отключает сборщик циклов (part4._gc_paused).
+    """
+    with part4._gc_paused():
+        return _loads_company(data)
+
+
+def _loads_company(data: bytes) -> "part4.Company":
+    reader = _Reader(data)
+    _read_header(reader, KIND_COMPANY)
+    strings = reader.strings()
+    company = part4.Company(strings[reader.count()])
+    departments = [
+        part4.Department(strings[name], strings[code])
+        for name, code in reader.records(_DEPARTMENT, reader.count())
+    ]
+    # Отделы заполняются до добавления в компанию: индексы строятся один раз
+    members = [[] for _ in departments]
+    for dept_no, emp in _read_employees(reader, strings, part4):
+        members[dept_no].append(emp)
+    for dept, employees in zip(departments, members):
+        dept.add_employees(employees)
+        company.add_department(dept)
+
+    project_records = list(reader.records(_PROJECT, reader.count()))
+    team = reader.array("q", reader.count())
+    for project_id, name, description, deadline, status, start, length in (
+        project_records
+    ):
+        project = part4.Project(
+            project_id,
+            strings[name],
+            strings[description],
+            date.fromordinal(deadline).isoformat(),
+            part4.Project.VALID_STATUSES[status],
+        )
+        company.add_project(project)
+        for employee_id in team[start : start + length]:
+            employee = company.find_employee_by_id(employee_id)
+            if employee:
+                try:
+                    project.add_team_member(employee)
+                except (part4.DuplicateIdError, ValueError):
+                    # Как и при загрузке из JSON, пропускаем конфликтные связи
+                    pass
+    return company
+
+
+def loads_department(data: bytes) -> "part3.Department":
+    """Восстановление отдела part3 из байтов"""
+    reader = _Reader(data)
+    _read_header(reader, KIND_DEPARTMENT)
+    strings = reader.strings()
+    department = part3.Department(strings[reader.count()])
+    for _, emp in _read_employees(reader, strings, part3):
+        department.add_employee(emp)
+    return department
+
+
+def save_company(company: "part4.Company", filename: str) -> None:
+    with open(filename, "wb") as f:
+        f.write(dumps_company(company))
+
+
+def load_company(filename: str) -> "part4.Company":
+    with open(filename, "rb") as f:
+        return loads_company(f.read())
+
+
+def save_department(department: "part3.Department", filename: str) -> None:
+    with open(filename, "wb") as f:
+        f.write(dumps_department(department))
+
+
+def load_department(filename: str) -> "part3.Department":
+    with open(filename, "rb") as f:
+        return loads_department(f.read())
+
+
+# Сравнение с JSON
+def _build_company(count: int) -> "part4.Company":
+    company = part4.Company("Benchmark Corp")
+    codes = ["DEV", "SALES", "MGMT", "HR"]
+    departments = [part4.Department(f"Отдел {code}", code) for code in codes]
+    for i in range(1, count + 1):
+        code = codes[i % 4]
+        kind = i % 4
+        if kind == 0:
+            emp = part4.Employee(i, f"Employee{i}", code, 4000.0)
+        elif kind == 1:
+            emp = part4.Manager(i, f"Manager{i}", code, 6000.0, 1000.0)
+        elif kind == 2:
+            emp = part4.Developer(
+                i, f"Dev{i}", code, 5000.0, ["Python", "SQL"], "middle"
+            )
+        else:
+            emp = part4.Salesperson(i, f"Sales{i}", code, 3000.0, 0.1, 50000.0)
+        departments[i % 4].add_employee(emp)
+    for dept in departments:
+        company.add_department(dept)
+    for project_id in range(1, count // 100 + 1):
+        project = part4.Project(project_id, f"Project{project_id}", "", "2030-01-01")
+        company.add_project(project)
+        for offset in range(1, 4):
+            company.assign_employee_to_project(project_id * 3 + offset, project_id)
+    return company
+
+
+def _best_time(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Размер файла и время загрузки: JSON против двоичного снимка"""
+    passed = True
+    print(
+        f"{'Сотрудников':>12} {'JSON, КБ':>10} {'EMPS, КБ':>10} "
+        f"{'JSON, с':>9} {'EMPS, с':>9} {'Размер':>7} {'Скорость':>9}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "company.json")
+        binary_path = os.path.join(directory, "company.emps")
+        for count in (10**4, 10**5):
+            company = _build_company(count)
+            company.save_to_json(json_path)
+            save_company(company, binary_path)
+            json_size = os.path.getsize(json_path)
+            binary_size = os.path.getsize(binary_path)
+            json_time = _best_time(lambda: part4.Company.load_from_json(json_path))
+            binary_time = _best_time(lambda: load_company(binary_path))
+            size_ratio = json_size / binary_size
+            load_ratio = json_time / binary_time
+            passed &= size_ratio >= SIZE_TARGET and load_ratio >= LOAD_TARGET
+            print(
+                f"{count:>12} {json_size / 1024:>10.0f} {binary_size / 1024:>10.0f} "
+                f"{json_time:>9.3f} {binary_time:>9.3f} "
+                f"{size_ratio:>6.1f}x {load_ratio:>8.1f}x"
+            )
+    verdict = "выполнены" if passed else "НЕ выполнены"
+    print(
+        f"Критерии (размер >= {SIZE_TARGET}x, загрузка >= {LOAD_TARGET}x): {verdict}"
+    )
+
+
+if __name__ == "__main__":
+    main()
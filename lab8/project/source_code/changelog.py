@@ -0,0 +1,424 @@
+"""
+Журнал изменений компании part4 с восстановлением на момент времени.
+
+Вместо полной перезаписи save_to_json каждое изменение дописывается
+одной строкой JSON в конец журнала, поэтому сохранение стоит O(изменений),
+а не O(размера компании). Каталог журнала содержит:
+
+    base-<seq>.json    снимок компании после операции seq (save_to_json)
+    log-<seq>.jsonl    операции seq+1, seq+2, ... до следующего снимка
+
+Строка журнала: {"seq": 7, "ts": "2026-05-01T12:00:00.000000",
+"op": "update_salary", "args": {"employee_id": 3, "base_salary": 5000}}.
+
+Запись операции сначала сериализуется, затем операция применяется
+к компании (и проходит ее проверки) и только после этого пишется
+в файл. fsync выполняется группами по group_size записей (групповая
+фиксация) и при sync()/close(); при сбое теряется не больше последней
+незафиксированной группы. Каждые compact_every операций
+журнал сворачивается в новый снимок. Снимок пишется во временный файл
+и переименовывается, поэтому сбой в любой момент оставляет согласованную
+пару "снимок + журнал". Недописанная последняя строка при чтении
+отбрасывается.
+
+При keep_history=True старые снимки и журналы не удаляются, и restore()
+восстанавливает компанию на любой номер операции или момент времени.
+Момент снимка без последующих операций - время записи его файла; если
+на заданный момент не осталось ни операции, ни снимка, restore() падает
+с ValueError:
+
+    with ChangeLog("data", Company("TechCorp")) as log:
+        log.hire("DEV", Developer(1, "Alice", "DEV", 5000, ["Python"], "senior"))
+        log.update_salary(1, 5500)
+    company = ChangeLog("data").company          # последнее состояние
+    before = restore("data", until=1)            # состояние после найма
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from source_code import part4
+from source_code.binary_snapshot import _build_company
+from source_code.part4 import (
+    Company,
+    DepartmentNotFoundError,
+    EmployeeFactory,
+    EmployeeNotFoundError,
+    Project,
+    ProjectNotFoundError,
+)
+
+BASE_PREFIX = "base-"
+LOG_PREFIX = "log-"
+
+
+# Применение операций: одни и те же функции работают при записи и при повторе
+def _department(company: Company, code: str) -> "part4.Department":
+    department = company.find_department_by_code(code)
+    if department is None:
+        raise DepartmentNotFoundError(f"Отдел с кодом {code} не найден")
+    return department
+
+
+def _department_of(company: Company, employee_id: int) -> "part4.Department":
+    for department in company.get_departments():
+        if department.find_employee_by_id(employee_id) is not None:
+            return department
+    raise EmployeeNotFoundError(f"Сотрудник с ID {employee_id} не найден")
+
+
+def _project(company: Company, project_id: int) -> Project:
+    project = company.find_project_by_id(project_id)
+    if project is None:
+        raise ProjectNotFoundError(f"Проект с ID {project_id} не найден")
+    return project
+
+
+def _hire(company: Company, department: str, employee: dict) -> None:
+    _department(company, department).add_employee(EmployeeFactory.from_dict(employee))
+
+
+def _fire(company: Company, employee_id: int) -> None:
+    _department_of(company, employee_id).remove_employee(employee_id)
+
+
+def _transfer(company: Company, employee_id: int, department: str) -> None:
+    target = _department(company, department)
+    _department_of(company, employee_id).transfer_employee(employee_id, target)
+
+
+def _add_project(company: Company, project: dict) -> None:
+    company.add_project(Project.from_dict(project))
+
+
+def _assign(company: Company, employee_ids: List[int], project_id: int) -> None:
+    if not company.assign_employees_to_project(employee_ids, project_id):
+        raise ValueError(f"Не удалось назначить сотрудников на проект {project_id}")
+
+
+def _unassign(company: Company, employee_ids: List[int], project_id: int) -> None:
+    company.unassign_employees_from_project(employee_ids, project_id)
+
+
+def _change_status(company: Company, project_id: int, status: str) -> None:
+    _project(company, project_id).change_status(status)
+
+
+def _update_salary(company: Company, employee_id: int, base_salary: float) -> None:
+    employee = company.find_employee_by_id(employee_id)
+    if employee is None:
+        raise EmployeeNotFoundError(f"Сотрудник с ID {employee_id} не найден")
+    employee.base_salary = base_salary
+
+
+OPERATIONS: Dict[str, Callable[..., None]] = {
+    "hire": _hire,
+    "fire": _fire,
+    "transfer": _transfer,
+    "add_project": _add_project,
+    "assign": _assign,
+    "unassign": _unassign,
+    "change_status": _change_status,
+    "update_salary": _update_salary,
+}
+
+
+# Файлы каталога
+def _file_name(prefix: str, seq: int, suffix: str) -> str:
+    return f"{prefix}{seq:012d}{suffix}"
+
+
+def _list_files(directory: str, prefix: str, suffix: str) -> List[Tuple[int, str]]:
+    """Пары (seq, путь), отсортированные по seq"""
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(suffix):
+            seq = name[len(prefix) : -len(suffix)]
+            if seq.isdigit():
+                found.append((int(seq), os.path.join(directory, name)))
+    return sorted(found)
+
+
+def _iter_entries(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Недописанная при сбое последняя строка
+                return
+
+
+def _truncate_torn_tail(path: str) -> None:
+    """Отрезать недописанную последнюю строку, чтобы дописывать с новой"""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _fsync_file(path: str) -> None:
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _replay(
+    directory: str,
+    until_seq: Optional[int] = None,
+    until_time: Optional[datetime] = None,
+) -> Tuple[Company, int]:
+    """Снимок, ближайший к цели, плюс повтор журнала; возвращает (компания, seq)"""
+    bases = _list_files(directory, BASE_PREFIX, ".json")
+    if not bases:
+        raise FileNotFoundError(f"В каталоге {directory} нет снимка компании")
+
+    limit = until_seq
+    if until_time is not None:
+        # Последняя операция не позже заданного момента
+        limit = None
+        for _, path in _list_files(directory, LOG_PREFIX, ".jsonl"):
+            for entry in _iter_entries(path):
+                if datetime.fromisoformat(entry["ts"]) > until_time:
+                    break
+                limit = entry["seq"]
+        if limit is None:
+            # Операций к этому моменту не осталось: подходит только снимок,
+            # записанный не позже него
+            written = [
+                seq
+                for seq, path in bases
+                if datetime.fromtimestamp(os.path.getmtime(path)) <= until_time
+            ]
+            if not written:
+                raise ValueError("История до этого момента уже свернута в снимок")
+            limit = written[-1]
+        if until_seq is not None:
+            limit = min(limit, until_seq)
+
+    candidates = [base for base in bases if limit is None or base[0] <= limit]
+    if not candidates:
+        raise ValueError("История до этого момента уже свернута в снимок")
+    seq, path = candidates[-1]
+    company = Company.load_from_json(path)
+
+    for start, path in _list_files(directory, LOG_PREFIX, ".jsonl"):
+        if start < seq:
+            continue
+        for entry in _iter_entries(path):
+            if entry["seq"] <= seq:
+                continue
+            if limit is not None and entry["seq"] > limit:
+                return company, seq
+            OPERATIONS[entry["op"]](company, **entry["args"])
+            seq = entry["seq"]
+    return company, seq
+
+
+def restore(directory: str, until: Union[int, datetime, None] = None) -> Company:
+    """Состояние компании после операции until (номер) или на момент until"""
+    if isinstance(until, datetime):
+        return _replay(directory, until_time=until)[0]
+    return _replay(directory, until_seq=until)[0]
+
+
+class ChangeLog:
+    """Журнал операций над компанией с групповой фиксацией и свертками"""
+
+    def __init__(
+        self,
+        directory: str,
+        company: Optional[Company] = None,
+        group_size: int = 64,
+        compact_every: int = 10000,
+        keep_history: bool = False,
+    ):
+        """Открыть журнал каталога или начать новый со снимка company.
+
+        Если в каталоге уже есть снимок, компания восстанавливается из него
+        и журнала, а аргумент company должен быть опущен.
+        """
+        if group_size < 1 or compact_every < 1:
+            raise ValueError("group_size и compact_every должны быть положительными")
+        self.__directory = directory
+        self.__group_size = group_size
+        self.__compact_every = compact_every
+        self.__keep_history = keep_history
+        self.__pending = 0  # Записано, но еще не зафиксировано fsync
+        self.__file = None
+
+        os.makedirs(directory, exist_ok=True)
+        if _list_files(directory, BASE_PREFIX, ".json"):
+            if company is not None:
+                raise ValueError(f"Каталог {directory} уже содержит журнал компании")
+            self.__company, self.__seq = _replay(directory)
+        elif company is None:
+            raise ValueError("Для нового журнала нужна исходная компания")
+        else:
+            self.__company, self.__seq = company, 0
+            self.__write_base()
+        self.__base_seq = self.__last_base_seq()
+        self.__open_segment(self.__base_seq)
+
+    @property
+    def company(self) -> Company:
+        return self.__company
+
+    @property
+    def seq(self) -> int:
+        """Номер последней записанной операции"""
+        return self.__seq
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def __last_base_seq(self) -> int:
+        return _list_files(self.__directory, BASE_PREFIX, ".json")[-1][0]
+
+    def __open_segment(self, seq: int) -> None:
+        path = os.path.join(self.__directory, _file_name(LOG_PREFIX, seq, ".jsonl"))
+        if os.path.exists(path):
+            _truncate_torn_tail(path)
+        self.__file = open(path, "a", encoding="utf-8")
+
+    def __write_base(self) -> None:
+        name = _file_name(BASE_PREFIX, self.__seq, ".json")
+        path = os.path.join(self.__directory, name)
+        self.__company.save_to_json(path + ".tmp")
+        _fsync_file(path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    # Запись
+    def record(self, op: str, **args: Any) -> int:
+        """Применить операцию к компании и дописать ее в журнал"""
+        if self.__file is None:
+            raise RuntimeError("Журнал закрыт")
+        if op not in OPERATIONS:
+            raise ValueError(f"Неизвестная операция журнала: {op}")
+        # Аргументы, которые нельзя записать, не должны менять компанию
+        entry = {
+            "seq": self.__seq + 1,
+            "ts": datetime.now().isoformat(timespec="microseconds"),
+            "op": op,
+            "args": args,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        OPERATIONS[op](self.__company, **args)
+
+        self.__seq += 1
+        self.__file.write(line)
+        self.__pending += 1
+        if self.__pending >= self.__group_size:
+            self.sync()
+        if self.__seq - self.__base_seq >= self.__compact_every:
+            self.compact()
+        return self.__seq
+
+    def hire(self, department_code: str, employee: "part4.AbstractEmployee") -> int:
+        data = employee.to_dict()
+        data.pop("assigned_project_ids", None)  # Новый сотрудник без проектов
+        return self.record("hire", department=department_code, employee=data)
+
+    def fire(self, employee_id: int) -> int:
+        return self.record("fire", employee_id=employee_id)
+
+    def transfer(self, employee_id: int, department_code: str) -> int:
+        return self.record(
+            "transfer", employee_id=employee_id, department=department_code
+        )
+
+    def add_project(self, project: Project) -> int:
+        data = project.to_dict()
+        data["team"] = []  # Команда набирается операциями assign
+        return self.record("add_project", project=data)
+
+    def assign(self, employee_ids: List[int], project_id: int) -> int:
+        return self.record(
+            "assign", employee_ids=list(employee_ids), project_id=project_id
+        )
+
+    def unassign(self, employee_ids: List[int], project_id: int) -> int:
+        return self.record(
+            "unassign", employee_ids=list(employee_ids), project_id=project_id
+        )
+
+    def change_status(self, project_id: int, status: str) -> int:
+        return self.record("change_status", project_id=project_id, status=status)
+
+    def update_salary(self, employee_id: int, base_salary: float) -> int:
+        return self.record(
+            "update_salary", employee_id=employee_id, base_salary=base_salary
+        )
+
+    # Фиксация и свертка
+    def sync(self) -> None:
+        """Зафиксировать на диске все записанные операции"""
+        if self.__file is None or self.__pending == 0:
+            return
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        self.__pending = 0
+
+    def compact(self) -> None:
+        """Свернуть журнал в снимок текущего состояния"""
+        if self.__file is None:
+            raise RuntimeError("Журнал закрыт")
+        self.sync()
+        if self.__seq == self.__base_seq:
+            return
+        self.__write_base()
+        self.__file.close()
+        self.__base_seq = self.__seq
+        self.__open_segment(self.__seq)
+        if not self.__keep_history:
+            for seq, path in _list_files(self.__directory, BASE_PREFIX, ".json"):
+                if seq < self.__base_seq:
+                    os.remove(path)
+            for seq, path in _list_files(self.__directory, LOG_PREFIX, ".jsonl"):
+                if seq < self.__base_seq:
+                    os.remove(path)
+
+    def close(self) -> None:
+        if self.__file is None:
+            return
+        self.sync()
+        self.__file.close()
+        self.__file = None
+
+    def __enter__(self) -> "ChangeLog":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+# Сравнение с полной перезаписью
+def main():
+    """Время сохранения одного изменения: save_to_json против журнала"""
+    changes = 200
+    print(f"{'Сотрудников':>12} {'JSON, мс':>10} {'Журнал, мс':>11}")
+    for count in (10**3, 10**4):
+        company = _build_company(count)
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            for i in range(changes):
+                company.find_employee_by_id(i + 1).base_salary += 1
+                company.save_to_json(os.path.join(directory, "company.json"))
+            json_time = (time.perf_counter() - start) / changes
+
+            with ChangeLog(os.path.join(directory, "log"), company) as log:
+                start = time.perf_counter()
+                for i in range(changes):
+                    employee = company.find_employee_by_id(i + 1)
+                    log.update_salary(employee.id, employee.base_salary + 1)
+                log.sync()
+                log_time = (time.perf_counter() - start) / changes
+        print(f"{count:>12} {json_time * 1e3:>10.2f} {log_time * 1e3:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,501 @@
+"""
+Колоночное хранилище сотрудников (struct-of-arrays) для part4.
+
+EmployeeTable хранит числовые поля всех сотрудников в непрерывных
+типизированных массивах (модуль array), а зарплаты, суммы по отделам
+и гистограммы считает за один векторный проход. Если установлен NumPy,
+массивы оборачиваются без копирования через np.frombuffer.
+
+Доступ к отдельным строкам идёт через лёгкие представления, которые
+реализуют интерфейс AbstractEmployee. Классы представлений названы так же,
+как исходные типы, поэтому отчеты по имени класса не меняются.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from source_code import part4
+from source_code.part4 import AbstractEmployee, DuplicateIdError, EmployeeNotFoundError
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен
+    np = None
+
+
+TYPE_TAGS = {"Employee": 0, "Manager": 1, "Developer": 2, "Salesperson": 3}
+SENIORITY_MULTIPLIERS = part4.Developer.SENIORITY_MULTIPLIERS
+_LEVEL_BY_MULTIPLIER = {value: key for key, value in SENIORITY_MULTIPLIERS.items()}
+
+
+class EmployeeTable:
+    """Колоночное хранилище сотрудников с векторным расчетом зарплат"""
+
+    def __init__(self):
+        # Колонки: по одному элементу на сотрудника
+        self._ids = array("q")
+        self._dept_idx = array("i")
+        self._types = array("b")
+        self._base_salary = array("d")
+        self._bonus = array("d")
+        self._multiplier = array("d")
+        self._commission_rate = array("d")
+        self._sales_volume = array("d")
+        self._names: List[str] = []
+        # Справочник кодов отделов
+        self._department_codes: List[str] = []
+        self._department_index: Dict[str, int] = {}
+        # Индекс строк и редкие поля
+        self._rows: Dict[int, int] = {}
+        self._tech_stacks: Dict[int, List[str]] = {}
+        self._projects: Dict[int, dict] = {}
+        self._watchers: Dict[int, list] = {}
+
+    @classmethod
+    def from_employees(cls, employees: Iterable[AbstractEmployee]) -> "EmployeeTable":
+        """Построить таблицу по существующим объектам сотрудников"""
+        table = cls()
+        for employee in employees:
+            table.add_employee(employee)
+        return table
+
+    def _intern_department(self, code: str) -> int:
+        index = self._department_index.get(code)
+        if index is None:
+            index = len(self._department_codes)
+            self._department_codes.append(code)
+            self._department_index[code] = index
+        return index
+
+    def append(
+        self,
+        id: int,
+        name: str,
+        department: str,
+        base_salary: float,
+        type: str = "Employee",
+        bonus: float = 0.0,
+        seniority_level: Optional[str] = None,
+        tech_stack: Optional[List[str]] = None,
+        commission_rate: float = 0.0,
+        sales_volume: float = 0.0,
+    ) -> "Employee":
+        """Добавить строку и вернуть представление сотрудника"""
+        if type not in TYPE_TAGS:
+            raise ValueError(f"Неизвестный тип сотрудника: {type}")
+        if id in self._rows:
+            raise DuplicateIdError(f"Сотрудник с ID {id} уже есть в таблице")
+        multiplier = 1.0
+        if type == "Developer":
+            if seniority_level not in SENIORITY_MULTIPLIERS:
+                raise ValueError(
+                    f'Уровень должен быть один из: {", ".join(SENIORITY_MULTIPLIERS)}'
+                )
+            multiplier = SENIORITY_MULTIPLIERS[seniority_level]
+
+        self._rows[id] = len(self._ids)
+        self._ids.append(id)
+        self._names.append(name)
+        self._dept_idx.append(self._intern_department(department))
+        self._types.append(TYPE_TAGS[type])
+        self._base_salary.append(base_salary)
+        self._bonus.append(bonus if type == "Manager" else 0.0)
+        self._multiplier.append(multiplier)
+        self._commission_rate.append(commission_rate if type == "Salesperson" else 0.0)
+        self._sales_volume.append(sales_volume if type == "Salesperson" else 0.0)
+        if type == "Developer":
+            self._tech_stacks[id] = list(tech_stack or [])
+        return self.get(id)
+
+    def add_employee(self, employee: AbstractEmployee) -> "Employee":
+        """Скопировать объект сотрудника в таблицу"""
+        emp_type = employee.__class__.__name__
+        if emp_type not in TYPE_TAGS:
+            raise TypeError(f"Тип {emp_type} не поддерживается таблицей")
+        view = self.append(
+            employee.id,
+            employee.name,
+            employee.department,
+            employee.base_salary,
+            emp_type,
+            bonus=getattr(employee, "bonus", 0.0),
+            seniority_level=getattr(employee, "seniority_level", None),
+            tech_stack=getattr(employee, "tech_stack", None),
+            commission_rate=getattr(employee, "commission_rate", 0.0),
+            sales_volume=getattr(employee, "sales_volume", 0.0),
+        )
+        if employee.assigned_projects:
+            self._projects[employee.id] = {
+                id(project): project for project in employee.assigned_projects
+            }
+        return view
+
+    def remove(self, employee_id: int) -> None:
+        """Удалить строку за O(1): на её место переносится последняя.
+
+        Строку, представление которой держат отдел или проект, удалить
+        нельзя: сначала сотрудника нужно убрать оттуда.
+        """
+        if employee_id not in self._rows:
+            raise EmployeeNotFoundError(f"Сотрудник с ID {employee_id} не найден")
+        if self._watchers.get(employee_id) or self._projects.get(employee_id):
+            raise ValueError(
+                f"Сотрудник с ID {employee_id} состоит в отделе или проекте"
+            )
+        row = self._rows.pop(employee_id)
+        last = len(self._ids) - 1
+        columns = (
+            self._ids,
+            self._dept_idx,
+            self._types,
+            self._base_salary,
+            self._bonus,
+            self._multiplier,
+            self._commission_rate,
+            self._sales_volume,
+            self._names,
+        )
+        if row != last:
+            for column in columns:
+                column[row] = column[last]
+            self._rows[self._ids[row]] = row
+        for column in columns:
+            column.pop()
+        self._tech_stacks.pop(employee_id, None)
+        self._projects.pop(employee_id, None)
+        self._watchers.pop(employee_id, None)
+
+    def get(self, employee_id: int) -> Optional["Employee"]:
+        """Представление сотрудника по ID"""
+        row = self._rows.get(employee_id)
+        if row is None:
+            return None
+        return _VIEW_CLASSES[self._types[row]](self, employee_id)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: int) -> "Employee":
+        return self.get(self._ids[index])
+
+    def __iter__(self):
+        for employee_id in self._ids:
+            yield self.get(employee_id)
+
+    def __contains__(self, employee_id: int) -> bool:
+        return employee_id in self._rows
+
+    # Векторные расчеты
+    def payroll(self):
+        """
+        Зарплаты всех сотрудников за один проход.
+
+        Все типы сводятся к формуле
+        base * multiplier + bonus + commission_rate * sales_volume,
+        где неиспользуемые типом колонки равны нулю (множитель — единице).
+        """
+        if np is not None:
+            base = np.frombuffer(self._base_salary, dtype=np.float64)
+            return (
+                base * np.frombuffer(self._multiplier, dtype=np.float64)
+                + np.frombuffer(self._bonus, dtype=np.float64)
+                + np.frombuffer(self._commission_rate, dtype=np.float64)
+                * np.frombuffer(self._sales_volume, dtype=np.float64)
+            )
+        return array(
+            "d",
+            [
+                base * mult + bonus + rate * sales
+                for base, mult, bonus, rate, sales in zip(
+                    self._base_salary,
+                    self._multiplier,
+                    self._bonus,
+                    self._commission_rate,
+                    self._sales_volume,
+                )
+            ],
+        )
+
+    def total_payroll(self) -> float:
+        """Общий фонд оплаты труда"""
+        salaries = self.payroll()
+        if np is not None:
+            return float(salaries.sum())
+        return sum(salaries)
+
+    def department_totals(self) -> Dict[str, float]:
+        """Суммы зарплат по кодам отделов"""
+        salaries = self.payroll()
+        if np is not None:
+            sums = np.bincount(
+                np.frombuffer(self._dept_idx, dtype=np.int32),
+                weights=salaries,
+                minlength=len(self._department_codes),
+            )
+            return {code: float(sums[i]) for i, code in enumerate(self._department_codes)}
+        totals = [0.0] * len(self._department_codes)
+        for dept, salary in zip(self._dept_idx, salaries):
+            totals[dept] += salary
+        return dict(zip(self._department_codes, totals))
+
+    def salary_histogram(self, bins: int = 10) -> Tuple[List[int], List[float]]:
+        """Гистограмма зарплат: (количества, границы интервалов)"""
+        salaries = self.payroll()
+        if not len(salaries):
+            return [0] * bins, [0.0] * (bins + 1)
+        if np is not None:
+            counts, edges = np.histogram(salaries, bins=bins)
+            return counts.tolist(), edges.tolist()
+        low, high = min(salaries), max(salaries)
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        width = (high - low) / bins
+        edges = [low + i * width for i in range(bins)] + [high]
+        counts = [0] * bins
+        for salary in salaries:
+            counts[min(int((salary - low) / width), bins - 1)] += 1
+        return counts, edges
+
+
+class EmployeeRow(AbstractEmployee):
+    """Лёгкое представление строки EmployeeTable с интерфейсом AbstractEmployee"""
+
+    def __init__(self, table: EmployeeTable, employee_id: int):
+        # AbstractEmployee.__init__ не вызывается: данные лежат в таблице
+        self._table = table
+        self._id = employee_id
+
+    @property
+    def _row(self) -> int:
+        return self._table._rows[self._id]
+
+    def _notify(self, old_salary: float) -> None:
+        if self._has_salary_watchers():
+            self._notify_salary_change(old_salary)
+
+    @property
+    def id(self):
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        value = int(value)
+        if value < 1:
+            raise ValueError("ID должен быть положительным")
+        table = self._table
+        if value != self._id:
+            if table._watchers.get(self._id):
+                raise ValueError(
+                    "Нельзя менять ID сотрудника, пока он состоит в отделе или проекте"
+                )
+            if value in table._rows:
+                raise DuplicateIdError(f"Сотрудник с ID {value} уже есть в таблице")
+            row = table._rows.pop(self._id)
+            table._rows[value] = row
+            table._ids[row] = value
+            for sparse in (table._tech_stacks, table._projects, table._watchers):
+                if self._id in sparse:
+                    sparse[value] = sparse.pop(self._id)
+            self._id = value
+
+    @property
+    def name(self):
+        return self._table._names[self._row]
+
+    @name.setter
+    def name(self, value):
+        value = str(value)
+        if value == "":
+            raise ValueError("Имя не может быть пустым")
+        self._table._names[self._row] = value
+
+    @property
+    def department(self):
+        return self._table._department_codes[self._table._dept_idx[self._row]]
+
+    @department.setter
+    def department(self, value):
+        value = str(value)
+        if value == "":
+            raise ValueError("Название отдела не может быть пустым")
+        self._table._dept_idx[self._row] = self._table._intern_department(value)
+
+    @property
+    def base_salary(self):
+        return self._table._base_salary[self._row]
+
+    @base_salary.setter
+    def base_salary(self, value):
+        value = float(value)
+        if value < 0:
+            raise ValueError("Зарплата не может быть отрицательной")
+        old_salary = self.calculate_salary()
+        self._table._base_salary[self._row] = value
+        self._notify(old_salary)
+
+    # Проекты и наблюдатели хранятся в разреженных словарях таблицы
+    @property
+    def assigned_projects(self):
+        return list(self._table._projects.get(self._id, {}).values())
+
+    def _notify_load_change(self) -> None:
+        for watcher in self._table._watchers.get(self._id, ()):
+            watcher._on_load_changed(self)
+
+    def assign_to_project(self, project: "part4.Project") -> None:
+        projects = self._table._projects.setdefault(self._id, {})
+        if id(project) not in projects:
+            projects[id(project)] = project
+            self._notify_load_change()
+
+    def remove_from_project(self, project: "part4.Project") -> None:
+        projects = self._table._projects.get(self._id)
+        if projects and projects.pop(id(project), None) is not None:
+            self._notify_load_change()
+
+    def get_project_count(self) -> int:
+        return len(self._table._projects.get(self._id, ()))
+
+    def is_available(self) -> bool:
+        return self.get_project_count() < self.MAX_PROJECTS
+
+    def _add_salary_watcher(self, watcher) -> None:
+        self._table._watchers.setdefault(self._id, []).append(watcher)
+
+    def _remove_salary_watcher(self, watcher) -> None:
+        watchers = self._table._watchers.get(self._id, [])
+        for i, current in enumerate(watchers):
+            if current is watcher:
+                del watchers[i]
+                return
+
+    def _has_salary_watchers(self) -> bool:
+        return bool(self._table._watchers.get(self._id))
+
+    def _notify_salary_change(self, old_salary: float) -> None:
+        delta = self.calculate_salary() - old_salary
+        if delta:
+            for watcher in self._table._watchers.get(self._id, ()):
+                watcher._on_salary_changed(self, delta)
+
+    def calculate_salary(self) -> float:
+        table, row = self._table, self._row
+        return (
+            table._base_salary[row] * table._multiplier[row]
+            + table._bonus[row]
+            + table._commission_rate[row] * table._sales_volume[row]
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.__class__.__name__,
+            "id": self.id,
+            "name": self.name,
+            "department": self.department,
+            "base_salary": self.base_salary,
+            "assigned_project_ids": [p.project_id for p in self.assigned_projects],
+        }
+
+
+class Employee(EmployeeRow, part4.Employee):
+    pass
+
+
+class Manager(EmployeeRow, part4.Manager):
+    @property
+    def bonus(self):
+        return self._table._bonus[self._row]
+
+    @bonus.setter
+    def bonus(self, value):
+        value = float(value)
+        if value < 0:
+            raise ValueError("Бонус не может быть отрицательным")
+        old_salary = self.calculate_salary()
+        self._table._bonus[self._row] = value
+        self._notify(old_salary)
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["bonus"] = self.bonus
+        return data
+
+
+class Developer(EmployeeRow, part4.Developer):
+    @property
+    def tech_stack(self):
+        return self._table._tech_stacks[self._id].copy()
+
+    @property
+    def seniority_level(self):
+        return _LEVEL_BY_MULTIPLIER[self._table._multiplier[self._row]]
+
+    @seniority_level.setter
+    def seniority_level(self, value):
+        if value not in SENIORITY_MULTIPLIERS:
+            raise ValueError(
+                f'Уровень должен быть один из: {", ".join(SENIORITY_MULTIPLIERS)}'
+            )
+        old_salary = self.calculate_salary()
+        self._table._multiplier[self._row] = SENIORITY_MULTIPLIERS[value]
+        self._notify(old_salary)
+
+    def add_skill(self, new_skill: str) -> None:
+        self._table._tech_stacks[self._id].append(new_skill)
+
+    def __iter__(self):
+        return iter(self._table._tech_stacks[self._id])
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["tech_stack"] = self.tech_stack
+        data["seniority_level"] = self.seniority_level
+        return data
+
+
+class Salesperson(EmployeeRow, part4.Salesperson):
+    @property
+    def commission_rate(self):
+        return self._table._commission_rate[self._row]
+
+    @commission_rate.setter
+    def commission_rate(self, value):
+        value = float(value)
+        if not 0 <= value <= 1:
+            raise ValueError("Ставка комиссии должна быть между 0 и 1")
+        old_salary = self.calculate_salary()
+        self._table._commission_rate[self._row] = value
+        self._notify(old_salary)
+
+    @property
+    def sales_volume(self):
+        return self._table._sales_volume[self._row]
+
+    @sales_volume.setter
+    def sales_volume(self, value):
+        value = float(value)
+        if value < 0:
+            raise ValueError("Объем продаж не может быть отрицательным")
+        old_salary = self.calculate_salary()
+        self._table._sales_volume[self._row] = value
+        self._notify(old_salary)
+
+    def update_sales(self, new_sales: float) -> None:
+        if new_sales < 0:
+            raise ValueError("Нельзя добавить отрицательный объем продаж")
+        self.sales_volume = self.sales_volume + new_sales
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["commission_rate"] = self.commission_rate
+        data["sales_volume"] = self.sales_volume
+        return data
+
+
+# Классы представлений по тегу типа
+_VIEW_CLASSES = {
+    TYPE_TAGS["Employee"]: Employee,
+    TYPE_TAGS["Manager"]: Manager,
+    TYPE_TAGS["Developer"]: Developer,
+    TYPE_TAGS["Salesperson"]: Salesperson,
+}
@@ -0,0 +1,448 @@
+"""
+Ленивый список сотрудников поверх двоичного снимка (binary_snapshot).
+
+MappedRoster отображает файл снимка в память через mmap и ничего не
+распаковывает заранее: при открытии читаются только заголовок и границы
+секций, строки декодируются по одной при обращении. Отделы, их итерация,
+индексация и поиск по ID возвращают прокси LazyEmployee, которые читают
+поля прямо из записи фиксированной ширины. Полный объект part4
+(Developer, Manager, ...) строится только при обращении к остальным
+атрибутам или методам либо при изменении, и дальше все прокси этой
+записи работают с ним.
+
+Вместе с сотрудником строятся его проекты и их команды целиком, чтобы
+назначения и нагрузка совпадали с load_company; связанные через проекты
+сотрудники тоже становятся полными объектами.
+
+Изменения живут в памяти процесса, файл открыт только для чтения.
+Страницы отображения общие для всех процессов, открывших тот же файл,
+а при передаче в пул процессов ростер сериализуется одним путем к файлу:
+
+    with MappedRoster("company.emps") as roster:
+        dev = roster.find_department_by_code("DEV")
+        print(len(dev), dev.find_employee_by_id(42).name)
+
+Запуск модуля сравнивает время открытия с полной загрузкой снимка.
+"""
+
+import gc
+import mmap
+import os
+import struct
+import tempfile
+import time
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+
+from source_code import part4
+from source_code.binary_snapshot import (
+    KIND_COMPANY,
+    SENIORITY_LEVELS,
+    TYPE_NAMES,
+    _COUNT,
+    _DEPARTMENT,
+    _DEPT_MASK,
+    _PROJECT,
+    _RECORDS,
+    _STRINGS,
+    _Reader,
+    _read_header,
+    _restore_ints,
+    _unpack_array,
+    load_company,
+    save_company,
+)
+
+# Только id, имя, строка отдела и номер отдела, остаток записи пропускается
+_KEYS = tuple(
+    struct.Struct("<qIIH" + "x" * (layout.size - 18)) for layout in _RECORDS
+)
+# Поля, которые прокси читает прямо из записи: имя -> позиция в записи
+_FIELDS = {"id": 0, "name": 1, "department": 2, "base_salary": 4}
+
+
+class LazyEmployee:
+    """Прокси записи сотрудника; полный объект строится при первой нужде"""
+
+    __slots__ = ("_roster", "_ref", "_employee")
+
+    def __init__(self, roster: "MappedRoster", ref: int):
+        object.__setattr__(self, "_roster", roster)
+        object.__setattr__(self, "_ref", ref)
+        object.__setattr__(self, "_employee", roster._materialized.get(ref))
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._employee is not None or self._ref in self._roster._materialized
+
+    @property
+    def employee_type(self) -> str:
+        return TYPE_NAMES[self._ref & 3]
+
+    def materialize(self) -> "part4.AbstractEmployee":
+        """Полный объект part4 для этой записи"""
+        if self._employee is None:
+            object.__setattr__(self, "_employee", self._roster._materialize(self._ref))
+        return self._employee
+
+    def _field(self, attr: str):
+        employee = self._employee or self._roster._materialized.get(self._ref)
+        if employee is not None:
+            return getattr(employee, attr)
+        record = self._roster._record(self._ref)
+        if attr == "base_salary" and record[3] > _DEPT_MASK:
+            record = _restore_ints(record, self._ref & 3)
+        value = record[_FIELDS[attr]]
+        return self._roster._string(value) if attr in ("name", "department") else value
+
+    @property
+    def id(self) -> int:
+        return self._field("id")
+
+    @property
+    def name(self) -> str:
+        return self._field("name")
+
+    @property
+    def department(self) -> str:
+        return self._field("department")
+
+    @property
+    def base_salary(self) -> float:
+        return self._field("base_salary")
+
+    def __getattr__(self, attr):
+        # Вызывается только для атрибутов, которых нет у прокси. Служебные
+        # имена не пересылаются: у копии без __init__ еще нет _employee,
+        # и materialize() снова попал бы сюда
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.materialize(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self.materialize(), attr, value)
+
+    def __reduce__(self):
+        # Копия - новый прокси той же записи; при pickle ростер открывается
+        # заново по пути к файлу, изменения в памяти не переносятся
+        return LazyEmployee, (self._roster, self._ref)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LazyEmployee, part4.AbstractEmployee)):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"LazyEmployee({self.employee_type}, id={self.id}, name={self.name!r})"
+
+
+class MappedDepartment:
+    """Отдел ростера с тем же интерфейсом чтения, что у part4.Department"""
+
+    def __init__(
+        self, roster: "MappedRoster", dept_no: int, name: str, code: str, refs: list
+    ):
+        self.__roster = roster
+        self.__dept_no = dept_no
+        self.__name = name
+        self.__code = code
+        self.__refs = refs
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def code(self):
+        return self.__code
+
+    @property
+    def employee_count(self):
+        return len(self.__refs)
+
+    def get_employees(self) -> List[LazyEmployee]:
+        return list(self)
+
+    def find_employee_by_id(self, employee_id: int) -> Optional[LazyEmployee]:
+        ref = self.__roster._ref_by_id(employee_id)
+        if ref is None or self.__roster._dept_no(ref) != self.__dept_no:
+            return None
+        return LazyEmployee(self.__roster, ref)
+
+    def __len__(self) -> int:
+        return len(self.__refs)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [LazyEmployee(self.__roster, ref) for ref in self.__refs[key]]
+        return LazyEmployee(self.__roster, self.__refs[key])
+
+    def __contains__(self, employee) -> bool:
+        employee_id = getattr(employee, "id", None)
+        return (
+            employee_id is not None
+            and self.find_employee_by_id(employee_id) is not None
+        )
+
+    def __iter__(self) -> Iterator[LazyEmployee]:
+        roster = self.__roster
+        return (LazyEmployee(roster, ref) for ref in self.__refs)
+
+
+class MappedRoster:
+    """Отделы и сотрудники снимка компании, отображенного в память"""
+
+    def __init__(self, filename: str):
+        self.__filename = filename
+        self._materialized: Dict[int, "part4.AbstractEmployee"] = {}
+        self.__views: List[memoryview] = []  # Срезы отображения, живущие с ростером
+        with open(filename, "rb") as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.__open_sections()
+        except Exception:
+            self.close()
+            raise
+
+    def __open_sections(self) -> None:
+        reader = _Reader(self.__mmap)
+        self.__views.append(reader._view)
+        _read_header(reader, KIND_COMPANY)
+
+        # Таблица строк: концы строк и блок UTF-8 читаются по индексу
+        count, size = reader.unpack(_STRINGS)
+        self.__string_ends = reader.take(count * _COUNT.size)
+        self.__string_blob = reader.take(size)
+        self.__views += [self.__string_ends, self.__string_blob]
+
+        self.company_name = self._string(reader.count())
+        self.__department_records = list(
+            reader.records(_DEPARTMENT, reader.count())
+        )
+
+        # Записи каждого типа лежат подряд; ref = номер в типе * 4 + тег
+        self.__count = reader.count()
+        self.__tags = reader.take(self.__count)
+        tags = self.__tags.tobytes()
+        totals = [tags.count(tag) for tag in range(len(TYPE_NAMES))]
+        self.__blocks = [
+            reader.take(total * layout.size) for total, layout in zip(totals, _RECORDS)
+        ]
+        self.__views += [self.__tags, *self.__blocks]
+        self.__skills = reader.array("I", reader.count())
+        self.__project_block = reader.take(reader.count() * _PROJECT.size)
+        self.__team_block = reader.take(reader.count() * 8)
+        self.__views += [self.__project_block, self.__team_block]
+        self.__departments: Optional[List[MappedDepartment]] = None
+        self.__ids: Optional[Dict[int, int]] = None
+        self.__dept_nos: Optional[Dict[int, int]] = None
+        # ID сотрудника -> номера его проектов; проекты строятся по запросу
+        self.__memberships: Optional[Dict[int, List[int]]] = None
+        self.__projects: Dict[int, "part4.Project"] = {}
+
+    # Доступ к записям
+    def _string(self, index: int) -> str:
+        ends = self.__string_ends
+        start = _COUNT.unpack_from(ends, (index - 1) * _COUNT.size)[0] if index else 0
+        end = _COUNT.unpack_from(ends, index * _COUNT.size)[0]
+        return str(self.__string_blob[start:end], "utf-8")
+
+    def _record(self, ref: int) -> tuple:
+        tag = ref & 3
+        layout = _RECORDS[tag]
+        return layout.unpack_from(self.__blocks[tag], (ref >> 2) * layout.size)
+
+    def _materialize(self, ref: int) -> "part4.AbstractEmployee":
+        employee = self._materialized.get(ref)
+        if employee is not None:
+            return employee
+        tag = ref & 3
+        record = self._record(ref)
+        if record[3] > _DEPT_MASK:
+            record = _restore_ints(record, tag)
+        id, name, department, _, base_salary = record[:5]
+        args = (id, self._string(name), self._string(department), base_salary)
+        if tag == 0:
+            employee = part4.Employee(*args)
+        elif tag == 1:
+            employee = part4.Manager(*args, record[5])
+        elif tag == 2:
+            level, start, length = record[5:]
+            stack = [self._string(i) for i in self.__skills[start : start + length]]
+            employee = part4.Developer(*args, stack, SENIORITY_LEVELS[level])
+        else:
+            employee = part4.Salesperson(*args, record[5], record[6])
+        self._materialized[ref] = employee
+        for project_no in self.__project_numbers(id):
+            self.__join(self.__project(project_no), employee)
+        return employee
+
+    def __project_numbers(self, employee_id: int) -> List[int]:
+        if self.__memberships is None:
+            memberships: Dict[int, List[int]] = {}
+            team = _unpack_array("q", self.__team_block)
+            records = _PROJECT.iter_unpack(self.__project_block)
+            for project_no, (*_, start, length) in enumerate(records):
+                for member_id in team[start : start + length]:
+                    memberships.setdefault(member_id, []).append(project_no)
+            self.__memberships = memberships
+        return self.__memberships.get(employee_id, [])
+
+    def __project(self, project_no: int) -> "part4.Project":
+        """Проект с полной командой; участники строятся вместе с ним"""
+        project = self.__projects.get(project_no)
+        if project is not None:
+            return project
+        project_id, name, description, deadline, status, start, length = (
+            _PROJECT.unpack_from(self.__project_block, project_no * _PROJECT.size)
+        )
+        project = self.__projects[project_no] = part4.Project(
+            project_id,
+            self._string(name),
+            self._string(description),
+            date.fromordinal(deadline).isoformat(),
+            part4.Project.VALID_STATUSES[status],
+        )
+        team = _unpack_array("q", self.__team_block[start * 8 : (start + length) * 8])
+        for member_id in team:
+            ref = self._ref_by_id(member_id)
+            if ref is not None:
+                # Недостроенный участник присоединится сам в _materialize
+                self.__join(project, self._materialize(ref))
+        return project
+
+    @staticmethod
+    def __join(project: "part4.Project", employee: "part4.AbstractEmployee") -> None:
+        if project.has_member(employee.id):
+            return
+        try:
+            project.add_team_member(employee)
+        except (part4.DuplicateIdError, ValueError):
+            # Как и load_company, пропускаем конфликтные связи
+            pass
+
+    def __build_index(self) -> None:
+        """Индекс ID и состав отделов; строится при первом обращении"""
+        streams = [
+            key.iter_unpack(block) for key, block in zip(_KEYS, self.__blocks)
+        ]
+        ranks = [0, 0, 0, 0]
+        ids: Dict[int, int] = {}
+        dept_nos: Dict[int, int] = {}
+        members: List[List[int]] = [[] for _ in self.__department_records]
+        for tag in self.__tags:
+            id, _, _, dept_no = next(streams[tag])
+            dept_no &= _DEPT_MASK
+            ref = ranks[tag] << 2 | tag
+            ranks[tag] += 1
+            ids[id] = ref
+            dept_nos[ref] = dept_no
+            members[dept_no].append(ref)
+        self.__ids = ids
+        self.__dept_nos = dept_nos
+        self.__departments = [
+            MappedDepartment(self, no, self._string(name), self._string(code), refs)
+            for no, ((name, code), refs) in enumerate(
+                zip(self.__department_records, members)
+            )
+        ]
+
+    def _ref_by_id(self, employee_id: int) -> Optional[int]:
+        if self.__ids is None:
+            self.__build_index()
+        return self.__ids.get(employee_id)
+
+    def _dept_no(self, ref: int) -> int:
+        return self.__dept_nos[ref]
+
+    # Публичный интерфейс
+    @property
+    def filename(self) -> str:
+        return self.__filename
+
+    @property
+    def materialized_count(self) -> int:
+        return len(self._materialized)
+
+    def get_departments(self) -> List[MappedDepartment]:
+        if self.__departments is None:
+            self.__build_index()
+        return self.__departments
+
+    def find_department_by_code(self, code: str) -> Optional[MappedDepartment]:
+        for dept in self.get_departments():
+            if dept.code == code:
+                return dept
+        return None
+
+    def find_employee_by_id(self, employee_id: int) -> Optional[LazyEmployee]:
+        ref = self._ref_by_id(employee_id)
+        return None if ref is None else LazyEmployee(self, ref)
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __iter__(self) -> Iterator[LazyEmployee]:
+        ranks = [0, 0, 0, 0]
+        for tag in self.__tags:
+            yield LazyEmployee(self, ranks[tag] << 2 | tag)
+            ranks[tag] += 1
+
+    def close(self) -> None:
+        """Освободить отображение; построенные объекты остаются доступны"""
+        if self.__mmap.closed:
+            return
+        # mmap нельзя закрыть, пока на него ссылаются memoryview
+        for view in reversed(self.__views):
+            view.release()
+        self.__mmap.close()
+
+    def __enter__(self) -> "MappedRoster":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        # В другой процесс передается только путь: файл отображается заново
+        return {"filename": self.__filename}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["filename"])
+
+
+# Сравнение с полной загрузкой
+def main():
+    """Время открытия ростера против загрузки всей компании"""
+    from source_code.binary_snapshot import _best_time, _build_company
+
+    print(
+        f"{'Сотрудников':>12} {'Загрузка, с':>12} {'Открытие, с':>12} "
+        f"{'Индекс, с':>10} {'Поиск, мкс':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "company.emps")
+        for count in (10**4, 10**5):
+            save_company(_build_company(count), path)
+            load_time = _best_time(lambda: load_company(path))
+            open_time = _best_time(lambda: MappedRoster(path).close())
+            gc.collect()  # Циклы от полных загрузок не должны попасть в замер
+            with MappedRoster(path) as roster:
+                start = time.perf_counter()
+                roster.get_departments()
+                index_time = time.perf_counter() - start
+                start = time.perf_counter()
+                for employee_id in range(1, 1001):
+                    roster.find_employee_by_id(employee_id).calculate_salary()
+                lookup_time = (time.perf_counter() - start) / 1000
+            print(
+                f"{count:>12} {load_time:>12.3f} {open_time:>12.4f} "
+                f"{index_time:>10.3f} {lookup_time * 1e6:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 import json
 import csv
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from abc import ABC, abstractmethod
+from bisect import bisect_right, insort
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import functools
+import gc
+import heapq
+import os
+import re
 
 
 # Кастомные исключения
@@ -55,16 +63,75 @@ class ProjectHasTeamError(Exception):
     pass
 
 
+def _affects_salary(method):
+    """Декоратор для методов, меняющих итоговую зарплату сотрудника.
+
+    Сообщает наблюдающим агрегатам (отделу, проектам) разницу в зарплате,
+    чтобы они обновили свои суммы без полного пересчета.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self._has_salary_watchers():
+            result = method(self, *args, **kwargs)
+            self._salary_cache = None
+            return result
+        old_salary = self.calculate_salary()
+        result = method(self, *args, **kwargs)
+        self._salary_cache = None
+        self._notify_salary_change(old_salary)
+        return result
+
+    return wrapper
+
+
+# Счетчики кэша зарплат: сколько вызовов calculate_salary обслужено из кэша
+_salary_cache_stats = {"hits": 0, "misses": 0}
+
+
+def salary_cache_stats() -> Dict[str, int]:
+    """Текущие значения счетчиков попаданий и промахов кэша зарплат"""
+    return dict(_salary_cache_stats)
+
+
+def reset_salary_cache_stats() -> None:
+    _salary_cache_stats["hits"] = 0
+    _salary_cache_stats["misses"] = 0
+
+
+def _cached_salary(method):
+    """Декоратор calculate_salary: результат хранится до ближайшего
+    изменения, помеченного _affects_salary."""
+
+    @functools.wraps(method)
+    def wrapper(self):
+        salary = self._salary_cache
+        if salary is not None:
+            _salary_cache_stats["hits"] += 1
+            return salary
+        _salary_cache_stats["misses"] += 1
+        salary = self._salary_cache = method(self)
+        return salary
+
+    return wrapper
+
+
 # Базовые классы (из предыдущего кода с дополнениями)
 class AbstractEmployee(ABC):
     """Абстрактный базовый класс для всех сотрудников"""
 
+    _salary_cache: Optional[float] = None  # См. _cached_salary
+    MAX_PROJECTS = 3  # Предельная нагрузка сотрудника
+
     def __init__(self, id: int, name: str, department: str, base_salary: float):
         self.__id = id
         self.__name = name
         self.__department = department
         self.__base_salary = base_salary
-        self.__assigned_projects: List["Project"] = []
+        # id() проекта -> проект: ключ не зависит от смены project_id,
+        # порядок назначения сохраняется
+        self.__assigned_projects: Dict[int, "Project"] = {}
+        self.__salary_watchers: list = []  # Агрегаты, зависящие от зарплаты и нагрузки
 
     @property
     def id(self):
@@ -84,13 +151,18 @@ class AbstractEmployee(ABC):
 
     @property
     def assigned_projects(self):
-        return self.__assigned_projects.copy()
+        return list(self.__assigned_projects.values())
 
     @id.setter
     def id(self, value):
         value = int(value)
         if value < 1:
             raise ValueError("ID должен быть положительным")
+        # Отделы, проекты и компания хранят сотрудников по ID
+        if value != self.__id and self.__salary_watchers:
+            raise ValueError(
+                "Нельзя менять ID сотрудника, пока он состоит в отделе или проекте"
+            )
         self.__id = value
 
     @name.setter
@@ -108,21 +180,49 @@ class AbstractEmployee(ABC):
         self.__department = value
 
     @base_salary.setter
+    @_affects_salary
     def base_salary(self, value):
         value = float(value)
         if value < 0:
             raise ValueError("Зарплата не может быть отрицательной")
         self.__base_salary = value
 
+    def _add_salary_watcher(self, watcher) -> None:
+        """Подписать агрегат на изменения зарплаты"""
+        self.__salary_watchers.append(watcher)
+
+    def _remove_salary_watcher(self, watcher) -> None:
+        """Отписать агрегат от изменений зарплаты"""
+        for i, current in enumerate(self.__salary_watchers):
+            if current is watcher:
+                del self.__salary_watchers[i]
+                return
+
+    def _has_salary_watchers(self) -> bool:
+        return bool(self.__salary_watchers)
+
+    def _notify_salary_change(self, old_salary: float) -> None:
+        """Передать агрегатам изменение зарплаты"""
+        delta = self.calculate_salary() - old_salary
+        if delta:
+            for watcher in self.__salary_watchers:
+                watcher._on_salary_changed(self, delta)
+
+    def _notify_load_change(self) -> None:
+        """Сообщить агрегатам об изменении числа проектов"""
+        for watcher in self.__salary_watchers:
+            watcher._on_load_changed(self)
+
     def assign_to_project(self, project: "Project") -> None:
         """Назначить сотрудника на проект"""
-        if project not in self.__assigned_projects:
-            self.__assigned_projects.append(project)
+        if id(project) not in self.__assigned_projects:
+            self.__assigned_projects[id(project)] = project
+            self._notify_load_change()
 
     def remove_from_project(self, project: "Project") -> None:
         """Убрать сотрудника с проекта"""
-        if project in self.__assigned_projects:
-            self.__assigned_projects.remove(project)
+        if self.__assigned_projects.pop(id(project), None) is not None:
+            self._notify_load_change()
 
     def get_project_count(self) -> int:
         """Получить количество проектов сотрудника"""
@@ -130,7 +230,7 @@ class AbstractEmployee(ABC):
 
     def is_available(self) -> bool:
         """Проверить доступность сотрудника для новых проектов"""
-        return len(self.__assigned_projects) < 3  # Максимум 3 проекта
+        return len(self.__assigned_projects) < self.MAX_PROJECTS
 
     @abstractmethod
     def calculate_salary(self) -> float:
@@ -169,7 +269,9 @@ class AbstractEmployee(ABC):
             "name": self.name,
             "department": self.department,
             "base_salary": self.base_salary,
-            "assigned_project_ids": [p.project_id for p in self.__assigned_projects],
+            "assigned_project_ids": [
+                project.project_id for project in self.__assigned_projects.values()
+            ],
         }
 
     @classmethod
@@ -178,6 +280,7 @@ class AbstractEmployee(ABC):
 
 
 class Employee(AbstractEmployee):
+    @_cached_salary
     def calculate_salary(self) -> float:
         return self.base_salary
 
@@ -221,12 +324,14 @@ class Manager(Employee):
         return self.__bonus
 
     @bonus.setter
+    @_affects_salary
     def bonus(self, value):
         value = float(value)
         if value < 0:
             raise ValueError("Бонус не может быть отрицательным")
         self.__bonus = value
 
+    @_cached_salary
     def calculate_salary(self) -> float:
         return self.base_salary + self.bonus
 
@@ -260,6 +365,8 @@ class Manager(Employee):
 
 
 class Developer(Employee):
+    SENIORITY_MULTIPLIERS = {"junior": 1.0, "middle": 1.5, "senior": 2.0}
+
     def __init__(
         self,
         id: int,
@@ -282,6 +389,7 @@ class Developer(Employee):
         return self.__seniority_level
 
     @seniority_level.setter
+    @_affects_salary
     def seniority_level(self, value):
         allowed_levels = ["junior", "middle", "senior"]
         if value not in allowed_levels:
@@ -293,9 +401,9 @@ class Developer(Employee):
     def add_skill(self, new_skill: str) -> None:
         self.__tech_stack.append(new_skill)
 
+    @_cached_salary
     def calculate_salary(self) -> float:
-        multipliers = {"junior": 1.0, "middle": 1.5, "senior": 2.0}
-        return self.base_salary * multipliers[self.seniority_level]
+        return self.base_salary * self.SENIORITY_MULTIPLIERS[self.seniority_level]
 
     def get_info(self) -> str:
         return (
@@ -355,6 +463,7 @@ class Salesperson(Employee):
         return self.__sales_volume
 
     @commission_rate.setter
+    @_affects_salary
     def commission_rate(self, value):
         value = float(value)
         if not 0 <= value <= 1:
@@ -362,17 +471,20 @@ class Salesperson(Employee):
         self.__commission_rate = value
 
     @sales_volume.setter
+    @_affects_salary
     def sales_volume(self, value):
         value = float(value)
         if value < 0:
             raise ValueError("Объем продаж не может быть отрицательным")
         self.__sales_volume = value
 
+    @_affects_salary
     def update_sales(self, new_sales: float) -> None:
         if new_sales < 0:
             raise ValueError("Нельзя добавить отрицательный объем продаж")
         self.__sales_volume += new_sales
 
+    @_cached_salary
     def calculate_salary(self) -> float:
         return self.base_salary + (self.commission_rate * self.sales_volume)
 
@@ -413,6 +525,11 @@ class Department:
         self.__name = name
         self.__code = code
         self.__employees: List[AbstractEmployee] = []
+        self.__employees_by_id: Dict[int, AbstractEmployee] = {}  # Индекс по ID
+        self.__company: Optional["Company"] = None
+        # Агрегаты, обновляемые инкрементально
+        self.__total_salary = 0.0
+        self.__type_counts: Dict[str, int] = {}
 
     @property
     def name(self):
@@ -432,48 +549,123 @@ class Department:
             raise ValueError("Название отдела не может быть пустым")
         self.__name = value
 
+    def _attach_company(self, company: "Company") -> None:
+        """Привязать отдел к компании для поддержки её индексов"""
+        self.__company = company
+
+    def _detach_company(self) -> None:
+        """Отвязать отдел от компании"""
+        self.__company = None
+
     def add_employee(self, employee: AbstractEmployee) -> None:
         if not isinstance(employee, AbstractEmployee):
             raise TypeError("Можно добавлять только объекты AbstractEmployee")
+        if employee.id in self.__employees_by_id:
+            raise DuplicateIdError(f"Сотрудник с ID {employee.id} уже есть в отделе")
+        if self.__company is not None:
+            self.__company._register_employee(employee)
         self.__employees.append(employee)
+        self.__employees_by_id[employee.id] = employee
+        self.__total_salary += employee.calculate_salary()
+        emp_type = employee.__class__.__name__
+        self.__type_counts[emp_type] = self.__type_counts.get(emp_type, 0) + 1
+        employee._add_salary_watcher(self)
+
+    def add_employees(self, employees: List[AbstractEmployee]) -> None:
+        """Добавить группу сотрудников; при конфликте ID никто не добавляется"""
+        employees_by_id = self.__employees_by_id
+        company = self.__company
+        batch = {}
+        for employee in employees:
+            if not isinstance(employee, AbstractEmployee):
+                raise TypeError("Можно добавлять только объекты AbstractEmployee")
+            employee_id = employee.id
+            if employee_id in employees_by_id or employee_id in batch:
+                raise DuplicateIdError(
+                    f"Сотрудник с ID {employee_id} уже есть в отделе"
+                )
+            if (
+                company is not None
+                and company.find_employee_by_id(employee_id) is not None
+            ):
+                raise DuplicateIdError(
+                    f"Сотрудник с ID {employee_id} уже работает в компании"
+                )
+            batch[employee_id] = employee
+
+        type_counts = self.__type_counts
+        total_salary = 0.0
+        for employee in employees:
+            if company is not None:
+                company._register_employee(employee)
+            total_salary += employee.calculate_salary()
+            emp_type = employee.__class__.__name__
+            type_counts[emp_type] = type_counts.get(emp_type, 0) + 1
+            employee._add_salary_watcher(self)
+        employees_by_id.update(batch)
+        self.__total_salary += total_salary
+        self.__employees.extend(employees)
+
+    def _detach_employee(self, employee: AbstractEmployee) -> None:
+        """Убрать сотрудника из отдела и индексов компании без проверок"""
+        self.__employees.remove(employee)
+        del self.__employees_by_id[employee.id]
+        employee._remove_salary_watcher(self)
+        emp_type = employee.__class__.__name__
+        self.__type_counts[emp_type] -= 1
+        if not self.__type_counts[emp_type]:
+            del self.__type_counts[emp_type]
+        if self.__employees:
+            self.__total_salary -= employee.calculate_salary()
+        else:
+            self.__total_salary = 0.0  # Сброс накопленной погрешности
+        if self.__company is not None:
+            self.__company._unregister_employee(employee)
+
+    def _on_salary_changed(self, employee: AbstractEmployee, delta: float) -> None:
+        """Обновить сумму зарплат при изменении зарплаты сотрудника"""
+        self.__total_salary += delta
+
+    def _on_load_changed(self, employee: AbstractEmployee) -> None:
+        """Передать компании изменение нагрузки сотрудника"""
+        if self.__company is not None:
+            self.__company._on_employee_load_changed(employee)
 
     def remove_employee(self, employee_id: int) -> None:
-        for i, emp in enumerate(self.__employees):
-            if emp.id == employee_id:
-                if emp.get_project_count() > 0:
-                    raise EmployeeInProjectError(
-                        f"Сотрудник {emp.name} участвует в проектах и не может быть удален"
-                    )
-                del self.__employees[i]
-                return
-        raise EmployeeNotFoundError(f"Сотрудник с ID {employee_id} не найден в отделе")
+        emp = self.__employees_by_id.get(employee_id)
+        if emp is None:
+            raise EmployeeNotFoundError(
+                f"Сотрудник с ID {employee_id} не найден в отделе"
+            )
+        if emp.get_project_count() > 0:
+            raise EmployeeInProjectError(
+                f"Сотрудник {emp.name} участвует в проектах и не может быть удален"
+            )
+        self._detach_employee(emp)
 
     def get_employees(self) -> List[AbstractEmployee]:
         return self.__employees.copy()
 
     def calculate_total_salary(self) -> float:
-        return sum(emp.calculate_salary() for emp in self.__employees)
+        return self.__total_salary
 
     def get_employee_count(self) -> Dict[str, int]:
-        count = {}
-        for emp in self.__employees:
-            emp_type = emp.__class__.__name__
-            count[emp_type] = count.get(emp_type, 0) + 1
-        return count
+        return self.__type_counts.copy()
 
     def find_employee_by_id(self, employee_id: int) -> Optional[AbstractEmployee]:
-        for emp in self.__employees:
-            if emp.id == employee_id:
-                return emp
-        return None
+        return self.__employees_by_id.get(employee_id)
 
     def transfer_employee(self, employee_id: int, new_department: "Department") -> None:
         employee = self.find_employee_by_id(employee_id)
         if not employee:
             raise EmployeeNotFoundError(f"Сотрудник с ID {employee_id} не найден")
 
-        self.__employees.remove(employee)
-        new_department.add_employee(employee)
+        self._detach_employee(employee)
+        try:
+            new_department.add_employee(employee)
+        except DuplicateIdError:
+            self.add_employee(employee)
+            raise
         employee.department = new_department.name
 
     def __len__(self) -> int:
@@ -483,7 +675,9 @@ class Department:
         return self.__employees[key]
 
     def __contains__(self, employee: AbstractEmployee) -> bool:
-        return employee in self.__employees
+        if not isinstance(employee, AbstractEmployee):
+            return False
+        return employee.id in self.__employees_by_id
 
     def __iter__(self):
         return iter(self.__employees)
@@ -504,6 +698,11 @@ class Department:
         return department
 
 
+def _today_ordinal(now: Optional[date] = None) -> int:
+    """Порядковый номер текущего дня (или дня переданной даты)"""
+    return (now or date.today()).toordinal()
+
+
 class Project:
     """Класс проекта с композицией - команда проекта"""
 
@@ -520,9 +719,12 @@ class Project:
         self.__project_id = project_id
         self.__name = name
         self.__description = description
-        self.__deadline = self._parse_date(deadline)
+        self.__deadline = self._parse_date(deadline)  # Порядковый номер дня
         self.__status = status
-        self.__team: List[AbstractEmployee] = []  # Композиция
+        self.__company: Optional["Company"] = None
+        # Композиция: ID сотрудника -> сотрудник, в порядке добавления
+        self.__team: Dict[int, AbstractEmployee] = {}
+        self.__total_salary = 0.0  # Суммарная зарплата команды
 
     @property
     def project_id(self):
@@ -537,7 +739,11 @@ class Project:
         return self.__description
 
     @property
-    def deadline(self):
+    def deadline(self) -> datetime:
+        return datetime.fromordinal(self.__deadline)
+
+    @property
+    def deadline_ordinal(self) -> int:
         return self.__deadline
 
     @property
@@ -549,6 +755,10 @@ class Project:
         value = int(value)
         if value < 1:
             raise ValueError("ID проекта должен быть положительным")
+        old_id = self.__project_id
+        if self.__company is not None and old_id != value:
+            # Компания проверяет уникальность и переносит проект в индексах
+            self.__company._on_project_id_changed(self, old_id, value)
         self.__project_id = value
 
     @name.setter
@@ -557,39 +767,95 @@ class Project:
             raise ValueError("Название проекта не может быть пустым")
         self.__name = value
 
-    def _parse_date(self, date_str: str) -> datetime:
-        """Парсинг даты из строки"""
+    def _parse_date(self, date_str: str) -> int:
+        """Парсинг даты из строки в порядковый номер дня"""
         try:
-            return datetime.strptime(date_str, "%Y-%m-%d")
+            return datetime.strptime(date_str, "%Y-%m-%d").toordinal()
         except ValueError:
             raise ValueError("Неверный формат даты. Используйте YYYY-MM-DD")
 
-    def add_team_member(self, employee: AbstractEmployee) -> None:
-        """Добавить сотрудника в команду проекта"""
+    def _attach_company(self, company: "Company") -> None:
+        """Привязать проект к компании для поддержки индекса дедлайнов"""
+        self.__company = company
+
+    def _detach_company(self) -> None:
+        """Отвязать проект от компании"""
+        self.__company = None
+
+    def _check_new_member(self, employee: AbstractEmployee) -> None:
         if not isinstance(employee, AbstractEmployee):
             raise TypeError("Можно добавлять только сотрудников")
 
-        if employee in self.__team:
+        if employee.id in self.__team:
             raise DuplicateIdError(f"Сотрудник {employee.name} уже в команде проекта")
 
         if not employee.is_available():
             raise ValueError(f"Сотрудник {employee.name} перегружен проектами")
 
-        self.__team.append(employee)
+    def _attach_member(self, employee: AbstractEmployee) -> None:
+        self.__team[employee.id] = employee
+        self.__total_salary += employee.calculate_salary()
+        employee._add_salary_watcher(self)
         employee.assign_to_project(self)
 
+    def _detach_member(self, employee: AbstractEmployee) -> None:
+        del self.__team[employee.id]
+        employee.remove_from_project(self)
+        employee._remove_salary_watcher(self)
+        if self.__team:
+            self.__total_salary -= employee.calculate_salary()
+        else:
+            self.__total_salary = 0.0
+
+    def add_team_member(self, employee: AbstractEmployee) -> None:
+        """Добавить сотрудника в команду проекта"""
+        self._check_new_member(employee)
+        self._attach_member(employee)
+
+    def add_team_members(self, employees: List[AbstractEmployee]) -> None:
+        """Добавить группу сотрудников за O(k).
+
+        Сначала проверяются все кандидаты, поэтому при ошибке
+        команда не меняется.
+        """
+        batch_ids = set()
+        for employee in employees:
+            self._check_new_member(employee)
+            if employee.id in batch_ids:
+                raise DuplicateIdError(
+                    f"Сотрудник {employee.name} указан в группе дважды"
+                )
+            batch_ids.add(employee.id)
+        for employee in employees:
+            self._attach_member(employee)
+
     def remove_team_member(self, employee_id: int) -> None:
         """Удалить сотрудника из команды проекта по ID"""
-        for i, emp in enumerate(self.__team):
-            if emp.id == employee_id:
-                emp.remove_from_project(self)
-                del self.__team[i]
-                return
-        raise EmployeeNotFoundError(f"Сотрудник с ID {employee_id} не найден в проекте")
+        employee = self.__team.get(employee_id)
+        if employee is None:
+            raise EmployeeNotFoundError(
+                f"Сотрудник с ID {employee_id} не найден в проекте"
+            )
+        self._detach_member(employee)
+
+    def remove_team_members(self, employee_ids: List[int]) -> None:
+        """Удалить группу сотрудников; при отсутствии любого ID ничего не удаляется"""
+        for employee_id in employee_ids:
+            if employee_id not in self.__team:
+                raise EmployeeNotFoundError(
+                    f"Сотрудник с ID {employee_id} не найден в проекте"
+                )
+        for employee_id in employee_ids:
+            employee = self.__team.get(employee_id)
+            if employee is not None:  # ID мог повториться в списке
+                self._detach_member(employee)
+
+    def has_member(self, employee_id: int) -> bool:
+        return employee_id in self.__team
 
     def get_team(self) -> List[AbstractEmployee]:
         """Получить список команды"""
-        return self.__team.copy()
+        return list(self.__team.values())
 
     def get_team_size(self) -> int:
         """Получить размер команды"""
@@ -597,15 +863,24 @@ class Project:
 
     def calculate_total_salary(self) -> float:
         """Рассчитать суммарную зарплату команды"""
-        return sum(emp.calculate_salary() for emp in self.__team)
+        return self.__total_salary
+
+    def _on_salary_changed(self, employee: AbstractEmployee, delta: float) -> None:
+        """Обновить бюджет при изменении зарплаты участника"""
+        self.__total_salary += delta
+
+    def _on_load_changed(self, employee: AbstractEmployee) -> None:
+        """Нагрузка участника на бюджет проекта не влияет"""
 
     def get_project_info(self) -> str:
         """Получить полную информацию о проекте"""
-        team_info = ", ".join([f"{emp.name} ({emp.department})" for emp in self.__team])
+        team_info = ", ".join(
+            [f"{emp.name} ({emp.department})" for emp in self.__team.values()]
+        )
         return (
             f"Проект {self.project_id}: {self.name}\n"
             f"Описание: {self.description}\n"
-            f"Дедлайн: {self.deadline.strftime('%Y-%m-%d')}\n"
+            f"Дедлайн: {date.fromordinal(self.__deadline).isoformat()}\n"
             f"Статус: {self.status}\n"
             f"Команда ({self.get_team_size()} чел.): {team_info}\n"
             f"Бюджет на зарплаты: {self.calculate_total_salary():.2f}"
@@ -617,15 +892,21 @@ class Project:
             raise InvalidStatusError(
                 f'Неверный статус. Допустимые: {", ".join(self.VALID_STATUSES)}'
             )
+        old_status = self.__status
         self.__status = new_status
+        if self.__company is not None and old_status != new_status:
+            self.__company._on_project_status_changed(self, old_status)
 
-    def is_overdue(self) -> bool:
+    # Дедлайн наступает в начале своего дня, поэтому в день дедлайна
+    # проект уже просрочен, а накануне до него остается 0 полных дней.
+    # now позволяет вычислить много проектов по одному снимку времени.
+    def is_overdue(self, now: Optional[date] = None) -> bool:
         """Проверить, просрочен ли проект"""
-        return datetime.now() > self.__deadline
+        return self.__deadline <= _today_ordinal(now)
 
-    def days_until_deadline(self) -> int:
-        """Количество дней до дедлайна"""
-        return (self.__deadline - datetime.now()).days
+    def days_until_deadline(self, now: Optional[date] = None) -> int:
+        """Количество полных дней до дедлайна"""
+        return self.__deadline - _today_ordinal(now) - 1
 
     def to_dict(self) -> dict:
         """Сериализация проекта в словарь"""
@@ -633,9 +914,9 @@ class Project:
             "project_id": self.project_id,
             "name": self.name,
             "description": self.description,
-            "deadline": self.deadline.strftime("%Y-%m-%d"),
+            "deadline": date.fromordinal(self.__deadline).isoformat(),
             "status": self.status,
-            "team": [emp.id for emp in self.__team],  # Сохраняем только ID сотрудников
+            "team": list(self.__team),  # Сохраняем только ID сотрудников
         }
 
     @classmethod
@@ -662,13 +943,308 @@ class Project:
         return project
 
 
+# Потоковая сериализация компании в JSON
+def _json_block(obj: Any, level: int) -> str:
+    """JSON-представление записи с отступом, как у json.dump(indent=2)"""
+    text = json.dumps(obj, ensure_ascii=False, indent=2)
+    return text.replace("\n", "\n" + "  " * level)
+
+
+def _json_array_chunks(key: str, items, level: int, last: bool):
+    """Потоково сформировать поле-массив, по одной записи за раз"""
+    pad = "  " * level
+    tail = "\n" if last else ",\n"
+    first = True
+    for item in items:
+        if first:
+            yield f"{pad}{json.dumps(key)}: [\n"
+            first = False
+        else:
+            yield ",\n"
+        yield from item
+    if first:
+        yield f"{pad}{json.dumps(key)}: []{tail}"
+    else:
+        yield f"\n{pad}]{tail}"
+
+
+def iter_company_json(company: "Company"):
+    """
+    Генератор фрагментов JSON компании.
+
+    Формирует тот же текст, что и json.dump(company.to_dict(), indent=2,
+    ensure_ascii=False), но в памяти одновременно находится только одна
+    запись (сотрудник или проект).
+    """
+
+    def employee_chunks(emp):
+        yield "        " + _json_block(emp.to_dict(), 4)
+
+    def department_chunks(dept):
+        yield "    {\n"
+        yield f'      "name": {json.dumps(dept.name, ensure_ascii=False)},\n'
+        yield f'      "code": {json.dumps(dept.code, ensure_ascii=False)},\n'
+        yield from _json_array_chunks(
+            "employees", (employee_chunks(emp) for emp in dept), 3, True
+        )
+        yield "    }"
+
+    def project_chunks(proj):
+        yield "    " + _json_block(proj.to_dict(), 2)
+
+    yield "{\n"
+    yield f'  "name": {json.dumps(company.name, ensure_ascii=False)},\n'
+    yield from _json_array_chunks(
+        "departments",
+        (department_chunks(dept) for dept in company.get_departments()),
+        1,
+        False,
+    )
+    yield from _json_array_chunks(
+        "projects", (project_chunks(proj) for proj in company.get_projects()), 1, True
+    )
+    yield "}"
+
+
+class _JsonStreamReader:
+    """Минимальный потоковый разборщик JSON поверх текстового файла"""
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, file):
+        self.__file = file
+        self.__buffer = ""
+        self.__pos = 0
+        self.__eof = False
+        self.__decoder = json.JSONDecoder()
+
+    def __read_more(self) -> bool:
+        if self.__eof:
+            return False
+        chunk = self.__file.read(self.CHUNK_SIZE)
+        if not chunk:
+            self.__eof = True
+            return False
+        # Отбрасываем уже разобранную часть буфера
+        self.__buffer = self.__buffer[self.__pos :] + chunk
+        self.__pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Следующий значимый символ (пробелы пропускаются)"""
+        while True:
+            buffer = self.__buffer
+            pos = self.__pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            self.__pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.__read_more():
+                raise ValueError("Неожиданный конец JSON")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Ожидался символ {char!r} в позиции {self.__pos}")
+        self.__pos += 1
+
+    def accept(self, char: str) -> bool:
+        if self.peek() == char:
+            self.__pos += 1
+            return True
+        return False
+
+    def read_value(self) -> Any:
+        """Прочитать одно полное JSON-значение"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__pos)
+            except json.JSONDecodeError:
+                if not self.__read_more():
+                    raise
+                continue
+            # Число на границе буфера может быть неполным
+            if end == len(self.__buffer) and self.__read_more():
+                continue
+            self.__pos = end
+            return value
+
+    def iter_array(self):
+        """Итерация по элементам массива; элементы читает вызывающий код"""
+        self.expect("[")
+        if self.accept("]"):
+            return
+        while True:
+            yield
+            if self.accept("]"):
+                return
+            self.expect(",")
+
+    def iter_object(self):
+        """Итерация по ключам объекта; значения читает вызывающий код"""
+        self.expect("{")
+        if self.accept("}"):
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self.accept("}"):
+                return
+            self.expect(",")
+
+
+def iter_company_json_records(file):
+    """
+    Потоково прочитать JSON компании.
+
+    Выдаёт кортежи ("company", name), ("department", {"name", "code"}),
+    ("employee", dict) и ("project", dict) по одной записи за раз.
+    Порядок не зависит от порядка ключей в файле: первой идет компания,
+    сотрудники следуют за своим отделом, проекты - после всех отделов.
+    Записи, встреченные раньше, придерживаются до нужного момента.
+    """
+    reader = _JsonStreamReader(file)
+    named = False
+    departments_read = False
+    departments: List[tuple] = []  # Записи отделов до названия компании
+    projects: List[dict] = []  # Проекты до названия компании или списка отделов
+    for key in reader.iter_object():
+        if key == "name":
+            yield "company", reader.read_value()
+            named = True
+            yield from departments
+            departments.clear()
+        elif key == "departments":
+            for _ in reader.iter_array():
+                for record in _iter_department_records(reader):
+                    if named:
+                        yield record
+                    else:
+                        departments.append(record)
+            departments_read = True
+        elif key == "projects":
+            for _ in reader.iter_array():
+                project_data = reader.read_value()
+                if named and departments_read:
+                    yield "project", project_data
+                else:
+                    projects.append(project_data)
+        else:
+            reader.read_value()
+    if not named:
+        raise ValueError("В JSON компании нет поля name")
+    for project_data in projects:
+        yield "project", project_data
+
+
+def _iter_department_records(reader: _JsonStreamReader):
+    header: Dict[str, Any] = {}
+    started = False
+    pending: List[dict] = []  # Сотрудники, встреченные раньше кода отдела
+    for key in reader.iter_object():
+        if key != "employees":
+            header[key] = reader.read_value()
+            continue
+        if not started and "name" in header and "code" in header:
+            yield "department", {"name": header["name"], "code": header["code"]}
+            started = True
+        for _ in reader.iter_array():
+            emp_data = reader.read_value()
+            if started:
+                yield "employee", emp_data
+            else:
+                pending.append(emp_data)
+    if not started:
+        yield "department", {"name": header["name"], "code": header["code"]}
+        for emp_data in pending:
+            yield "employee", emp_data
+
+
+# Запись отчетов из готовых строк данных. Функции уровня модуля и
+# аргументы из кортежей и словарей позволяют запускать их в пуле процессов.
+EXPORT_BUFFER_SIZE = 1 << 20
+
+EMPLOYEES_CSV_HEADER = [
+    "ID",
+    "Имя",
+    "Отдел",
+    "Должность",
+    "Базовая зарплата",
+    "Итоговая зарплата",
+    "Проектов",
+]
+
+PROJECTS_CSV_HEADER = [
+    "ID",
+    "Название",
+    "Статус",
+    "Дедлайн",
+    "Размер команды",
+    "Бюджет зарплат",
+    "Дней до дедлайна",
+]
+
+
+def _write_csv(filename: str, header: List[str], rows: List[tuple]) -> str:
+    with open(
+        filename, "w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE
+    ) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return filename
+
+
+def _write_financial_report(filename: str, report: Dict[str, Any]) -> str:
+    with open(filename, "w", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as f:
+        f.write("ФИНАНСОВЫЙ ОТЧЕТ КОМПАНИИ\n")
+        f.write("=" * 50 + "\n\n")
+        f.write(f"Компания: {report['name']}\n")
+        f.write(f"Общее количество сотрудников: {report['employee_total']}\n")
+        f.write(f"Общие месячные затраты: {report['monthly_cost']:.2f}\n\n")
+
+        f.write("СТАТИСТИКА ПО ОТДЕЛАМ:\n")
+        for dept_code, dept_stats in report["department_stats"].items():
+            f.write(
+                f"- {dept_stats['name']} ({dept_code}): {dept_stats['employee_count']} сотрудников, "
+                f"зарплаты: {dept_stats['total_salary']:.2f}, средняя: {dept_stats['avg_salary']:.2f}\n"
+            )
+
+        f.write("\nАНАЛИЗ ПРОЕКТОВ:\n")
+        analysis = report["project_analysis"]
+        f.write(f"Всего проектов: {analysis['total_projects']}\n")
+        f.write(f"Общий бюджет: {analysis['total_budget']:.2f}\n")
+        f.write(f"Средний размер команды: {analysis['avg_team_size']:.1f}\n")
+        f.write(f"Просроченных проектов: {analysis['overdue_projects']}\n")
+
+        f.write("\nПЕРЕГРУЖЕННЫЕ СОТРУДНИКИ:\n")
+        if report["overloaded"]:
+            for name, department, project_count in report["overloaded"]:
+                f.write(f"- {name} ({department}): {project_count} проектов\n")
+        else:
+            f.write("Нет перегруженных сотрудников\n")
+    return filename
+
+
 class Company:
     """Класс компании с агрегацией - отделы и проекты"""
 
+    OPEN_STATUSES = ("planning", "active")  # Статусы, для которых важен дедлайн
+
     def __init__(self, name: str):
         self.__name = name
         self.__departments: List[Department] = []  # Агрегация
         self.__projects: List[Project] = []  # Агрегация
+        # Хеш-индексы для поиска за O(1)
+        self.__departments_by_code: Dict[str, Department] = {}
+        self.__projects_by_id: Dict[int, Project] = {}
+        self.__employees_by_id: Dict[int, AbstractEmployee] = {}
+        # Статус -> отсортированный список (дедлайн, ID проекта)
+        self.__deadline_index: Dict[str, List[Tuple[int, int]]] = {}
+        # Сотрудники компании, достигшие MAX_PROJECTS
+        self.__overloaded: Dict[int, AbstractEmployee] = {}
 
     @property
     def name(self):
@@ -680,6 +1256,30 @@ class Company:
             raise ValueError("Название компании не может быть пустым")
         self.__name = value
 
+    # Поддержка индекса сотрудников (вызывается отделами)
+    def _register_employee(self, employee: AbstractEmployee) -> None:
+        """Добавить сотрудника в индекс компании"""
+        if employee.id in self.__employees_by_id:
+            raise DuplicateIdError(
+                f"Сотрудник с ID {employee.id} уже работает в компании"
+            )
+        self.__employees_by_id[employee.id] = employee
+        self._on_employee_load_changed(employee)
+
+    def _unregister_employee(self, employee: AbstractEmployee) -> None:
+        """Убрать сотрудника из индекса компании"""
+        self.__employees_by_id.pop(employee.id, None)
+        self.__overloaded.pop(employee.id, None)
+
+    def _on_employee_load_changed(self, employee: AbstractEmployee) -> None:
+        """Обновить индекс перегруженных (вызывается проектами)"""
+        if self.__employees_by_id.get(employee.id) is not employee:
+            return
+        if employee.is_available():
+            self.__overloaded.pop(employee.id, None)
+        else:
+            self.__overloaded[employee.id] = employee
+
     # Управление отделами
     def add_department(self, department: Department) -> None:
         """Добавить отдел в компанию"""
@@ -687,25 +1287,36 @@ class Company:
             raise TypeError("Можно добавлять только объекты Department")
 
         # Проверка уникальности кода отдела
-        for dept in self.__departments:
-            if dept.code == department.code:
+        if department.code in self.__departments_by_code:
+            raise DuplicateIdError(f"Отдел с кодом {department.code} уже существует")
+
+        # Проверка уникальности ID сотрудников отдела
+        for emp in department:
+            if emp.id in self.__employees_by_id:
                 raise DuplicateIdError(
-                    f"Отдел с кодом {department.code} уже существует"
+                    f"Сотрудник с ID {emp.id} уже работает в компании"
                 )
 
         self.__departments.append(department)
+        self.__departments_by_code[department.code] = department
+        for emp in department:
+            self.__employees_by_id[emp.id] = emp
+            if not emp.is_available():
+                self.__overloaded[emp.id] = emp
+        department._attach_company(self)
 
     def remove_department(self, department_code: str) -> None:
         """Удалить отдел из компании"""
-        for i, dept in enumerate(self.__departments):
-            if dept.code == department_code:
-                if dept.employee_count > 0:
-                    raise DepartmentNotEmptyError(
-                        f"Отдел {dept.name} не пуст и не может быть удален"
-                    )
-                del self.__departments[i]
-                return
-        raise DepartmentNotFoundError(f"Отдел с кодом {department_code} не найден")
+        dept = self.__departments_by_code.get(department_code)
+        if dept is None:
+            raise DepartmentNotFoundError(f"Отдел с кодом {department_code} не найден")
+        if dept.employee_count > 0:
+            raise DepartmentNotEmptyError(
+                f"Отдел {dept.name} не пуст и не может быть удален"
+            )
+        self.__departments.remove(dept)
+        del self.__departments_by_code[department_code]
+        dept._detach_company()
 
     def get_departments(self) -> List[Department]:
         """Получить список всех отделов"""
@@ -713,10 +1324,7 @@ class Company:
 
     def find_department_by_code(self, code: str) -> Optional[Department]:
         """Найти отдел по коду"""
-        for dept in self.__departments:
-            if dept.code == code:
-                return dept
-        return None
+        return self.__departments_by_code.get(code)
 
     # Управление проектами
     def add_project(self, project: Project) -> None:
@@ -725,25 +1333,27 @@ class Company:
             raise TypeError("Можно добавлять только объекты Project")
 
         # Проверка уникальности ID проекта
-        for proj in self.__projects:
-            if proj.project_id == project.project_id:
-                raise DuplicateIdError(
-                    f"Проект с ID {project.project_id} уже существует"
-                )
+        if project.project_id in self.__projects_by_id:
+            raise DuplicateIdError(f"Проект с ID {project.project_id} уже существует")
 
         self.__projects.append(project)
+        self.__projects_by_id[project.project_id] = project
+        self._index_deadline(project, project.status)
+        project._attach_company(self)
 
     def remove_project(self, project_id: int) -> None:
         """Удалить проект из компании"""
-        for i, proj in enumerate(self.__projects):
-            if proj.project_id == project_id:
-                if proj.get_team_size() > 0:
-                    raise ProjectHasTeamError(
-                        f"Проект {proj.name} имеет команду и не может быть удален"
-                    )
-                del self.__projects[i]
-                return
-        raise ProjectNotFoundError(f"Проект с ID {project_id} не найден")
+        proj = self.__projects_by_id.get(project_id)
+        if proj is None:
+            raise ProjectNotFoundError(f"Проект с ID {project_id} не найден")
+        if proj.get_team_size() > 0:
+            raise ProjectHasTeamError(
+                f"Проект {proj.name} имеет команду и не может быть удален"
+            )
+        self.__projects.remove(proj)
+        del self.__projects_by_id[project_id]
+        self._unindex_deadline(proj, proj.status)
+        proj._detach_company()
 
     def get_projects(self) -> List[Project]:
         """Получить список всех проектов"""
@@ -751,10 +1361,78 @@ class Company:
 
     def find_project_by_id(self, project_id: int) -> Optional[Project]:
         """Найти проект по ID"""
-        for proj in self.__projects:
-            if proj.project_id == project_id:
-                return proj
-        return None
+        return self.__projects_by_id.get(project_id)
+
+    # Индекс дедлайнов (поддерживается проектами)
+    def _index_deadline(self, project: Project, status: str) -> None:
+        entries = self.__deadline_index.setdefault(status, [])
+        insort(entries, (project.deadline_ordinal, project.project_id))
+
+    def _unindex_deadline(self, project: Project, status: str) -> None:
+        entries = self.__deadline_index[status]
+        entry = (project.deadline_ordinal, project.project_id)
+        position = bisect_right(entries, entry) - 1
+        if position < 0 or entries[position] != entry:
+            raise RuntimeError(f"Проект {project.project_id} отсутствует в индексе")
+        del entries[position]
+
+    def _on_project_id_changed(self, project: Project, old_id: int, new_id: int):
+        """Перенести проект под новый ID до того, как проект его примет"""
+        if new_id in self.__projects_by_id:
+            raise DuplicateIdError(f"Проект с ID {new_id} уже существует")
+        self._unindex_deadline(project, project.status)  # Еще под старым ID
+        entries = self.__deadline_index[project.status]
+        insort(entries, (project.deadline_ordinal, new_id))
+        del self.__projects_by_id[old_id]
+        self.__projects_by_id[new_id] = project
+
+    def _on_project_status_changed(self, project: Project, old_status: str) -> None:
+        """Перенести проект в индекс нового статуса"""
+        self._unindex_deadline(project, old_status)
+        self._index_deadline(project, project.status)
+
+    @staticmethod
+    def _iter_range(entries: list, start: int, stop: int):
+        # islice прошел бы первые start записей по одной
+        for position in range(start, stop):
+            yield entries[position]
+
+    def _deadline_slices(self, statuses, first: int, last: int):
+        """Итераторы по записям индекса с дедлайном в [first, last]"""
+        slices = []
+        for status in statuses:
+            entries = self.__deadline_index.get(status)
+            if entries:
+                start = bisect_right(entries, (first - 1, float("inf")))
+                stop = bisect_right(entries, (last, float("inf")))
+                slices.append(self._iter_range(entries, start, stop))
+        return slices
+
+    def _projects_by_deadline(self, statuses, first: int, last: int) -> List[Project]:
+        merged = heapq.merge(*self._deadline_slices(statuses, first, last))
+        return [self.__projects_by_id[project_id] for _, project_id in merged]
+
+    def get_overdue_projects(
+        self, now: Optional[date] = None, statuses=OPEN_STATUSES
+    ) -> List[Project]:
+        """Просроченные проекты, от самого давнего дедлайна"""
+        return self._projects_by_deadline(statuses, 0, _today_ordinal(now))
+
+    def get_projects_due_within(
+        self, days: int, now: Optional[date] = None, statuses=OPEN_STATUSES
+    ) -> List[Project]:
+        """Непросроченные проекты, у которых days_until_deadline() <= days"""
+        today = _today_ordinal(now)
+        return self._projects_by_deadline(statuses, today + 1, today + days + 1)
+
+    def get_next_deadlines(
+        self, k: int, now: Optional[date] = None, statuses=OPEN_STATUSES
+    ) -> List[Project]:
+        """k ближайших еще не наступивших дедлайнов"""
+        today = _today_ordinal(now)
+        slices = self._deadline_slices(statuses, today + 1, date.max.toordinal())
+        merged = islice(heapq.merge(*slices), k)
+        return [self.__projects_by_id[project_id] for _, project_id in merged]
 
     # Основные методы
     def get_all_employees(self) -> List[AbstractEmployee]:
@@ -766,15 +1444,15 @@ class Company:
 
     def find_employee_by_id(self, employee_id: int) -> Optional[AbstractEmployee]:
         """Найти сотрудника по ID во всей компании"""
-        for dept in self.__departments:
-            employee = dept.find_employee_by_id(employee_id)
-            if employee:
-                return employee
-        return None
+        return self.__employees_by_id.get(employee_id)
+
+    def get_employee_total(self) -> int:
+        """Общее количество сотрудников компании"""
+        return len(self.__employees_by_id)
 
     def calculate_total_monthly_cost(self) -> float:
         """Рассчитать общие месячные затраты на зарплаты"""
-        return sum(emp.calculate_salary() for emp in self.get_all_employees())
+        return sum(dept.calculate_total_salary() for dept in self.__departments)
 
     def get_projects_by_status(self, status: str) -> List[Project]:
         """Получить проекты по статусу"""
@@ -803,6 +1481,36 @@ class Company:
             print(f"Ошибка назначения: {e}")
             return False
 
+    def assign_employees_to_project(
+        self, employee_ids: List[int], project_id: int
+    ) -> bool:
+        """Назначить группу сотрудников на проект (все или никого)"""
+        project = self.find_project_by_id(project_id)
+        if not project:
+            raise ProjectNotFoundError(f"Проект с ID {project_id} не найден")
+        employees = []
+        for employee_id in employee_ids:
+            employee = self.find_employee_by_id(employee_id)
+            if not employee:
+                raise EmployeeNotFoundError(f"Сотрудник с ID {employee_id} не найден")
+            employees.append(employee)
+
+        try:
+            project.add_team_members(employees)
+            return True
+        except (DuplicateIdError, ValueError) as e:
+            print(f"Ошибка назначения: {e}")
+            return False
+
+    def unassign_employees_from_project(
+        self, employee_ids: List[int], project_id: int
+    ) -> None:
+        """Снять группу сотрудников с проекта"""
+        project = self.find_project_by_id(project_id)
+        if not project:
+            raise ProjectNotFoundError(f"Проект с ID {project_id} не найден")
+        project.remove_team_members(employee_ids)
+
     def check_employee_availability(self, employee_id: int) -> bool:
         """Проверить доступность сотрудника для новых проектов"""
         employee = self.find_employee_by_id(employee_id)
@@ -815,25 +1523,26 @@ class Company:
         """Получить статистику по отделам"""
         stats = {}
         for dept in self.__departments:
+            total_salary = dept.calculate_total_salary()
             stats[dept.code] = {
                 "name": dept.name,
                 "employee_count": dept.employee_count,
-                "total_salary": dept.calculate_total_salary(),
+                "total_salary": total_salary,
                 "employee_types": dept.get_employee_count(),
-                "avg_salary": dept.calculate_total_salary() / dept.employee_count
+                "avg_salary": total_salary / dept.employee_count
                 if dept.employee_count > 0
                 else 0,
             }
         return stats
 
-    def get_project_budget_analysis(self) -> Dict[str, Any]:
+    def get_project_budget_analysis(self, now: Optional[date] = None) -> Dict[str, Any]:
         """Анализ бюджетов проектов"""
         analysis = {
             "total_projects": len(self.__projects),
             "by_status": {},
             "total_budget": 0,
             "avg_team_size": 0,
-            "overdue_projects": 0,
+            "overdue_projects": len(self.get_overdue_projects(now)),
         }
 
         total_team_size = 0
@@ -849,18 +1558,25 @@ class Company:
             # Размер команды
             total_team_size += proj.get_team_size()
 
-            # Просроченные проекты
-            if proj.is_overdue() and proj.status in ["planning", "active"]:
-                analysis["overdue_projects"] += 1
-
         analysis["avg_team_size"] = (
             total_team_size / len(self.__projects) if self.__projects else 0
         )
         return analysis
 
     def find_overloaded_employees(self) -> List[AbstractEmployee]:
-        """Найти перегруженных сотрудников"""
-        return [emp for emp in self.get_all_employees() if not emp.is_available()]
+        """Найти перегруженных сотрудников в порядке отделов и их состава"""
+        overloaded = self.__overloaded
+        result: List[AbstractEmployee] = []
+        for dept in self.__departments:
+            if len(result) == len(overloaded):
+                break
+            # Состав отдела просматривается, только если в нем есть перегруженные
+            if any(
+                dept.find_employee_by_id(emp_id) is emp
+                for emp_id, emp in overloaded.items()
+            ):
+                result.extend(emp for emp in dept if overloaded.get(emp.id) is emp)
+        return result
 
     # Сериализация
     def to_dict(self) -> dict:
@@ -872,180 +1588,379 @@ class Company:
         }
 
     def save_to_json(self, filename: str) -> None:
-        """Сохранить компанию в JSON файл"""
+        """Сохранить компанию в JSON файл (потоково, по одной записи)"""
         with open(filename, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            f.writelines(iter_company_json(self))
 
     @classmethod
     def load_from_json(cls, filename: str) -> "Company":
-        """Загрузить компанию из JSON файла"""
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        company = cls(data["name"])
+        """Загрузить компанию из JSON файла (потоково, по одной записи).
 
-        # Сначала создаем отделы и сотрудников
-        for dept_data in data["departments"]:
-            department = Department.from_dict(dept_data, company)
-            company.add_department(department)
-
-        # Затем создаем проекты и восстанавливаем связи
-        for proj_data in data["projects"]:
-            project = Project.from_dict(proj_data, company)
-            company.add_project(project)
+        Порядок ключей в файле не важен (см. iter_company_json_records);
+        без названия компании выбрасывается ValueError.
+        """
+        with open(filename, "r", encoding="utf-8") as f:
+            company = None
+            department = None
+            for kind, data in iter_company_json_records(f):
+                if kind == "company":
+                    company = cls(data)
+                elif kind == "department":
+                    # Сначала создаем отделы и сотрудников
+                    department = Department(data["name"], data["code"])
+                    company.add_department(department)
+                elif kind == "employee":
+                    department.add_employee(EmployeeFactory.from_dict(data, company))
+                elif kind == "project":
+                    # Затем создаем проекты и восстанавливаем связи
+                    company.add_project(Project.from_dict(data, company))
 
         return company
 
     # Экспорт отчетов
-    def export_employees_csv(self, filename: str) -> None:
-        """Экспорт сотрудников в CSV"""
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                [
-                    "ID",
-                    "Имя",
-                    "Отдел",
-                    "Должность",
-                    "Базовая зарплата",
-                    "Итоговая зарплата",
-                    "Проектов",
-                ]
+    @staticmethod
+    def _employee_rows(employees: List[AbstractEmployee]) -> List[tuple]:
+        return [
+            (
+                emp.id,
+                emp.name,
+                emp.department,
+                emp.__class__.__name__,
+                emp.base_salary,
+                emp.calculate_salary(),
+                emp.get_project_count(),
+            )
+            for emp in employees
+        ]
+
+    def _project_rows(self, now: Optional[date] = None) -> List[tuple]:
+        today = now or date.today()  # Один снимок времени на весь отчет
+        return [
+            (
+                proj.project_id,
+                proj.name,
+                proj.status,
+                date.fromordinal(proj.deadline_ordinal).isoformat(),
+                proj.get_team_size(),
+                proj.calculate_total_salary(),
+                proj.days_until_deadline(today),
             )
+            for proj in self.__projects
+        ]
 
-            for emp in self.get_all_employees():
-                writer.writerow(
-                    [
-                        emp.id,
-                        emp.name,
-                        emp.department,
-                        emp.__class__.__name__,
-                        emp.base_salary,
-                        emp.calculate_salary(),
-                        emp.get_project_count(),
-                    ]
-                )
+    def _financial_report(self, now: Optional[date] = None) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "employee_total": self.get_employee_total(),
+            "monthly_cost": self.calculate_total_monthly_cost(),
+            "department_stats": self.get_department_stats(),
+            "project_analysis": self.get_project_budget_analysis(now),
+            "overloaded": [
+                (emp.name, emp.department, emp.get_project_count())
+                for emp in self.find_overloaded_employees()
+            ],
+        }
+
+    def export_employees_csv(self, filename: str) -> None:
+        """Экспорт сотрудников в CSV"""
+        rows = self._employee_rows(self.get_all_employees())
+        _write_csv(filename, EMPLOYEES_CSV_HEADER, rows)
 
     def export_projects_csv(self, filename: str) -> None:
         """Экспорт проектов в CSV"""
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                [
-                    "ID",
-                    "Название",
-                    "Статус",
-                    "Дедлайн",
-                    "Размер команды",
-                    "Бюджет зарплат",
-                    "Дней до дедлайна",
-                ]
-            )
-
-            for proj in self.__projects:
-                writer.writerow(
-                    [
-                        proj.project_id,
-                        proj.name,
-                        proj.status,
-                        proj.deadline.strftime("%Y-%m-%d"),
-                        proj.get_team_size(),
-                        proj.calculate_total_salary(),
-                        proj.days_until_deadline(),
-                    ]
-                )
+        _write_csv(filename, PROJECTS_CSV_HEADER, self._project_rows())
 
     def export_financial_report(self, filename: str) -> None:
         """Экспорт финансового отчета"""
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("ФИНАНСОВЫЙ ОТЧЕТ КОМПАНИИ\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(f"Компания: {self.name}\n")
-            f.write(f"Общее количество сотрудников: {len(self.get_all_employees())}\n")
-            f.write(
-                f"Общие месячные затраты: {self.calculate_total_monthly_cost():.2f}\n\n"
+        _write_financial_report(filename, self._financial_report())
+
+    def export_all(
+        self,
+        directory: str,
+        max_workers: Optional[int] = None,
+        now: Optional[date] = None,
+    ) -> Dict[str, str]:
+        """Экспорт всех отчетов и CSV по отделам параллельно.
+
+        Данные всех отчетов снимаются один раз в вызывающем потоке, поэтому
+        файлы согласованы между собой, а пул потоков только записывает их
+        (пул процессов здесь не нужен: каждую строку пришлось бы передавать
+        в процесс, который лишь пишет файл). Возвращает словарь "имя отчета"
+        -> путь к файлу: employees, projects, financial и employees_<код
+        отдела> для каждого отдела. CSV отделов лежат в подкаталоге
+        departments, имя файла - код отдела без символов пути.
+        """
+        today = now or date.today()
+        jobs = {}
+        all_rows = []
+        shard_names = set()
+        for dept in self.__departments:
+            rows = self._employee_rows(dept.get_employees())
+            all_rows.extend(rows)
+            name = _shard_name(dept.code, shard_names)
+            jobs[f"employees_{dept.code}"] = (
+                _write_csv,
+                os.path.join(DEPARTMENTS_EXPORT_DIR, f"{name}.csv"),
+                EMPLOYEES_CSV_HEADER,
+                rows,
             )
+        jobs["employees"] = (
+            _write_csv,
+            "employees_report.csv",
+            EMPLOYEES_CSV_HEADER,
+            all_rows,
+        )
+        jobs["projects"] = (
+            _write_csv,
+            "projects_report.csv",
+            PROJECTS_CSV_HEADER,
+            self._project_rows(today),
+        )
+        jobs["financial"] = (
+            _write_financial_report,
+            "financial_report.txt",
+            self._financial_report(today),
+        )
 
-            f.write("СТАТИСТИКА ПО ОТДЕЛАМ:\n")
-            stats = self.get_department_stats()
-            for dept_code, dept_stats in stats.items():
-                f.write(
-                    f"- {dept_stats['name']} ({dept_code}): {dept_stats['employee_count']} сотрудников, "
-                    f"зарплаты: {dept_stats['total_salary']:.2f}, средняя: {dept_stats['avg_salary']:.2f}\n"
-                )
+        os.makedirs(os.path.join(directory, DEPARTMENTS_EXPORT_DIR), exist_ok=True)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                key: pool.submit(func, os.path.join(directory, name), *args)
+                for key, (func, name, *args) in jobs.items()
+            }
+            return {key: future.result() for key, future in futures.items()}
 
-            f.write("\nАНАЛИЗ ПРОЕКТОВ:\n")
-            analysis = self.get_project_budget_analysis()
-            f.write(f"Всего проектов: {analysis['total_projects']}\n")
-            f.write(f"Общий бюджет: {analysis['total_budget']:.2f}\n")
-            f.write(f"Средний размер команды: {analysis['avg_team_size']:.1f}\n")
-            f.write(f"Просроченных проектов: {analysis['overdue_projects']}\n")
-
-            f.write("\nПЕРЕГРУЖЕННЫЕ СОТРУДНИКИ:\n")
-            overloaded = self.find_overloaded_employees()
-            if overloaded:
-                for emp in overloaded:
-                    f.write(
-                        f"- {emp.name} ({emp.department}): {emp.get_project_count()} проектов\n"
-                    )
-            else:
-                f.write("Нет перегруженных сотрудников\n")
+
+DEPARTMENTS_EXPORT_DIR = "departments"
+
+
+def _shard_name(code: str, taken: set) -> str:
+    """Имя файла для кода отдела: только буквы, цифры, _ и -, без повторов"""
+    base = re.sub(r"[^\w-]", "_", code) or "department"
+    name = base
+    suffix = 1
+    while name in taken:
+        suffix += 1
+        name = f"{base}_{suffix}"
+    taken.add(name)
+    return name
+
+
+@contextmanager
+def _gc_paused():
+    """Отключить сборщик циклов на время массового создания объектов.
+
+    Миллион новых объектов запускает десятки полных проходов сборщика,
+    хотя мусора среди них нет; это дольше, чем само создание.
+    Сборщик отключается для всего процесса, включая другие потоки:
+    пока идет создание, их циклические ссылки тоже не собираются.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _column(records: List[dict], indexes: List[int], key: str, convert) -> list:
+    """Значения поля key у записей indexes, приведенные функцией convert"""
+    try:
+        return [convert(records[i][key]) for i in indexes]
+    except (KeyError, TypeError, ValueError):
+        # Медленный путь только ради номера ошибочной записи
+        for i in indexes:
+            try:
+                convert(records[i][key])
+            except KeyError:
+                raise ValueError(f"Запись {i}: нет поля {key}") from None
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Запись {i}: некорректное поле {key}: {e}") from None
+        raise
+
+
+def _check_column(
+    indexes: List[int], values: list, is_valid: bool, predicate, message: str
+) -> None:
+    """Проверка столбца целиком; при ошибке ищется первая неверная запись"""
+    if not is_valid:
+        for i, value in zip(indexes, values):
+            if not predicate(value):
+                raise ValueError(f"Запись {i}: {message}")
+
+
+def _is_tech_stack(value) -> bool:
+    return value is None or isinstance(value, (list, tuple))
 
 
 class EmployeeFactory:
     """Фабрика для создания сотрудников"""
 
+    # Тип сотрудника -> (класс, дополнительные поля конструктора)
+    REGISTRY: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+        "employee": (Employee, ()),
+        "manager": (Manager, ("bonus",)),
+        "developer": (Developer, ("tech_stack", "seniority_level")),
+        "salesperson": (Salesperson, ("commission_rate", "sales_volume")),
+    }
+    SENIORITY_LEVELS = frozenset(("junior", "middle", "senior"))
+
     @staticmethod
     def create_employee(emp_type: str, **kwargs) -> AbstractEmployee:
-        if emp_type == "employee":
-            return Employee(
-                id=kwargs.get("id"),
-                name=kwargs.get("name"),
-                department=kwargs.get("department"),
-                base_salary=kwargs.get("base_salary"),
-            )
-        elif emp_type == "manager":
-            return Manager(
-                id=kwargs.get("id"),
-                name=kwargs.get("name"),
-                department=kwargs.get("department"),
-                base_salary=kwargs.get("base_salary"),
-                bonus=kwargs.get("bonus"),
-            )
-        elif emp_type == "developer":
-            return Developer(
-                id=kwargs.get("id"),
-                name=kwargs.get("name"),
-                department=kwargs.get("department"),
-                base_salary=kwargs.get("base_salary"),
-                tech_stack=kwargs.get("tech_stack", []),
-                seniority_level=kwargs.get("seniority_level"),
+        entry = EmployeeFactory.REGISTRY.get(emp_type)
+        if entry is None:
+            raise ValueError(f"Неизвестный тип сотрудника: {emp_type}")
+        cls, fields = entry
+        extra = {field: kwargs.get(field) for field in fields}
+        if "tech_stack" in extra and extra["tech_stack"] is None:
+            extra["tech_stack"] = []
+        return cls(
+            id=kwargs.get("id"),
+            name=kwargs.get("name"),
+            department=kwargs.get("department"),
+            base_salary=kwargs.get("base_salary"),
+            **extra,
+        )
+
+    @staticmethod
+    def create_many(records: Iterable[dict]) -> List[AbstractEmployee]:
+        """Массовое создание сотрудников из словарей с проверкой по столбцам.
+
+        Запись содержит поле "type" (employee, manager, ... или имя класса,
+        как в to_dict) и поля конструктора. Значения приводятся и
+        проверяются по тем же правилам, что и в сеттерах, но целыми
+        столбцами; при любой ошибке не создается ни один сотрудник.
+        На время создания сборщик циклов отключается для всего процесса
+        (см. _gc_paused).
+        """
+        with _gc_paused():
+            return EmployeeFactory._create_many(
+                records if isinstance(records, list) else list(records)
             )
-        elif emp_type == "salesperson":
-            return Salesperson(
-                id=kwargs.get("id"),
-                name=kwargs.get("name"),
-                department=kwargs.get("department"),
-                base_salary=kwargs.get("base_salary"),
-                commission_rate=kwargs.get("commission_rate"),
-                sales_volume=kwargs.get("sales_volume"),
+
+    @staticmethod
+    def _create_many(records: List[dict]) -> List[AbstractEmployee]:
+        groups: Dict[str, List[int]] = {name: [] for name in EmployeeFactory.REGISTRY}
+        for i, record in enumerate(records):
+            group = groups.get(str(record.get("type", "")).lower())
+            if group is None:
+                raise ValueError(
+                    f"Запись {i}: неизвестный тип сотрудника: {record.get('type')}"
+                )
+            group.append(i)
+
+        everyone = range(len(records))
+        ids = _column(records, everyone, "id", int)
+        names = _column(records, everyone, "name", str)
+        departments = _column(records, everyone, "department", str)
+        salaries = _column(records, everyone, "base_salary", float)
+        _check_column(
+            everyone,
+            ids,
+            not ids or min(ids) >= 1,
+            lambda value: value >= 1,
+            "ID должен быть положительным",
+        )
+        if len(set(ids)) != len(ids):
+            seen = set()
+            for i, employee_id in enumerate(ids):
+                if employee_id in seen:
+                    raise DuplicateIdError(f"Запись {i}: повторный ID {employee_id}")
+                seen.add(employee_id)
+        _check_column(
+            everyone, names, "" not in names, bool, "Имя не может быть пустым"
+        )
+        _check_column(
+            everyone,
+            departments,
+            "" not in departments,
+            bool,
+            "Название отдела не может быть пустым",
+        )
+        _check_column(
+            everyone,
+            salaries,
+            not salaries or min(salaries) >= 0,
+            lambda value: value >= 0,
+            "Зарплата не может быть отрицательной",
+        )
+
+        extra: Dict[int, tuple] = {}  # Номер записи -> поля конкретного типа
+        indexes = groups["manager"]
+        bonuses = _column(records, indexes, "bonus", float)
+        _check_column(
+            indexes,
+            bonuses,
+            not bonuses or min(bonuses) >= 0,
+            lambda value: value >= 0,
+            "Бонус не может быть отрицательным",
+        )
+        extra.update(zip(indexes, zip(bonuses)))
+
+        indexes = groups["developer"]
+        # Как в create_employee: нет стека - пустой список; строку не режем на буквы
+        stacks = [records[i].get("tech_stack") for i in indexes]
+        _check_column(
+            indexes,
+            stacks,
+            all(map(_is_tech_stack, stacks)),
+            _is_tech_stack,
+            "Стек технологий должен быть списком",
+        )
+        stacks = [[] if stack is None else list(stack) for stack in stacks]
+        levels = _column(records, indexes, "seniority_level", str)
+        allowed = EmployeeFactory.SENIORITY_LEVELS
+        _check_column(
+            indexes,
+            levels,
+            allowed.issuperset(levels),
+            allowed.__contains__,
+            f'Уровень должен быть один из: {", ".join(sorted(allowed))}',
+        )
+        extra.update(zip(indexes, zip(stacks, levels)))
+
+        indexes = groups["salesperson"]
+        rates = _column(records, indexes, "commission_rate", float)
+        volumes = _column(records, indexes, "sales_volume", float)
+        _check_column(
+            indexes,
+            rates,
+            not rates or (min(rates) >= 0 and max(rates) <= 1),
+            lambda value: 0 <= value <= 1,
+            "Ставка комиссии должна быть между 0 и 1",
+        )
+        _check_column(
+            indexes,
+            volumes,
+            not volumes or min(volumes) >= 0,
+            lambda value: value >= 0,
+            "Объем продаж не может быть отрицательным",
+        )
+        extra.update(zip(indexes, zip(rates, volumes)))
+
+        # Данные уже проверены, конструкторы присваивают поля напрямую
+        classes = [None] * len(records)
+        for name, (cls, _) in EmployeeFactory.REGISTRY.items():
+            for i in groups[name]:
+                classes[i] = cls
+        return [
+            cls(*common, *extra.get(i, ()))
+            for i, (cls, common) in enumerate(
+                zip(classes, zip(ids, names, departments, salaries))
             )
-        else:
-            raise ValueError(f"Неизвестный тип сотрудника: {emp_type}")
+        ]
+
+    # Имя класса из to_dict -> класс
+    CLASSES = {cls.__name__: cls for cls, _ in REGISTRY.values()}
 
     @staticmethod
     def from_dict(data: dict, company: "Company" = None) -> AbstractEmployee:
         employee_type = data.get("type")
-        if employee_type == "Employee":
-            return Employee.from_dict(data, company)
-        elif employee_type == "Manager":
-            return Manager.from_dict(data, company)
-        elif employee_type == "Developer":
-            return Developer.from_dict(data, company)
-        elif employee_type == "Salesperson":
-            return Salesperson.from_dict(data, company)
-        else:
+        cls = EmployeeFactory.CLASSES.get(employee_type)
+        if cls is None:
             raise ValueError(f"Неизвестный тип сотрудника в словаре: {employee_type}")
+        return cls.from_dict(data, company)
 
 
 # Функции-компараторы (из предыдущего кода)
@@ -0,0 +1,489 @@
+"""
+Компактная иерархия сотрудников part4 на __slots__.
+
+Классы повторяют Employee, Manager, Developer и Salesperson из part4
+(те же свойства, проверки и сериализация), но не имеют __dict__:
+поля хранятся в слотах, строка отдела интернируется, а словарь проектов
+и список наблюдателей создаются только при первой необходимости.
+AbstractEmployee зарегистрирован как виртуальный подкласс
+part4.AbstractEmployee, поэтому отделы и проекты part4 принимают
+такие объекты без изменений.
+
+Запуск модуля выполняет замер памяти для 10^5 и 10^6 экземпляров.
+"""
+
+import sys
+import tracemalloc
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from source_code import part4
+from source_code.part4 import _affects_salary, _cached_salary
+
+
+class AbstractEmployee(ABC):
+    """Абстрактный базовый класс компактных сотрудников"""
+
+    MAX_PROJECTS = part4.AbstractEmployee.MAX_PROJECTS
+
+    __slots__ = (
+        "__id",
+        "__name",
+        "__department",
+        "__base_salary",
+        "__assigned_projects",
+        "__salary_watchers",
+        "_salary_cache",
+    )
+
+    def __init__(self, id: int, name: str, department: str, base_salary: float):
+        self.__id = id
+        self.__name = name
+        self.__department = sys.intern(department)
+        self.__base_salary = base_salary
+        self.__assigned_projects: Optional[Dict[int, "part4.Project"]] = None  # Лениво
+        self.__salary_watchers: Optional[list] = None  # Лениво
+        self._salary_cache: Optional[float] = None
+
+    @property
+    def id(self):
+        return self.__id
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def department(self):
+        return self.__department
+
+    @property
+    def base_salary(self):
+        return self.__base_salary
+
+    @property
+    def assigned_projects(self):
+        projects = self.__assigned_projects
+        return list(projects.values()) if projects else []
+
+    @id.setter
+    def id(self, value):
+        value = int(value)
+        if value < 1:
+            raise ValueError("ID должен быть положительным")
+        # Отделы, проекты и компания хранят сотрудников по ID
+        if value != self.__id and self.__salary_watchers:
+            raise ValueError(
+                "Нельзя менять ID сотрудника, пока он состоит в отделе или проекте"
+            )
+        self.__id = value
+
+    @name.setter
+    def name(self, value):
+        value = str(value)
+        if value == "":
+            raise ValueError("Имя не может быть пустым")
+        self.__name = value
+
+    @department.setter
+    def department(self, value):
+        value = str(value)
+        if value == "":
+            raise ValueError("Название отдела не может быть пустым")
+        self.__department = sys.intern(value)
+
+    @base_salary.setter
+    @_affects_salary
+    def base_salary(self, value):
+        value = float(value)
+        if value < 0:
+            raise ValueError("Зарплата не может быть отрицательной")
+        self.__base_salary = value
+
+    def _add_salary_watcher(self, watcher) -> None:
+        if self.__salary_watchers is None:
+            self.__salary_watchers = []
+        self.__salary_watchers.append(watcher)
+
+    def _remove_salary_watcher(self, watcher) -> None:
+        watchers = self.__salary_watchers or []
+        for i, current in enumerate(watchers):
+            if current is watcher:
+                del watchers[i]
+                break
+        if not watchers:
+            self.__salary_watchers = None
+
+    def _has_salary_watchers(self) -> bool:
+        return bool(self.__salary_watchers)
+
+    def _notify_salary_change(self, old_salary: float) -> None:
+        delta = self.calculate_salary() - old_salary
+        if delta:
+            for watcher in self.__salary_watchers:
+                watcher._on_salary_changed(self, delta)
+
+    def _notify_load_change(self) -> None:
+        if self.__salary_watchers:
+            for watcher in self.__salary_watchers:
+                watcher._on_load_changed(self)
+
+    def assign_to_project(self, project: "part4.Project") -> None:
+        """Назначить сотрудника на проект"""
+        if self.__assigned_projects is None:
+            self.__assigned_projects = {}
+        if id(project) not in self.__assigned_projects:
+            self.__assigned_projects[id(project)] = project
+            self._notify_load_change()
+
+    def remove_from_project(self, project: "part4.Project") -> None:
+        """Убрать сотрудника с проекта"""
+        projects = self.__assigned_projects
+        if projects and projects.pop(id(project), None) is not None:
+            if not projects:
+                self.__assigned_projects = None
+            self._notify_load_change()
+
+    def get_project_count(self) -> int:
+        """Получить количество проектов сотрудника"""
+        return len(self.__assigned_projects) if self.__assigned_projects else 0
+
+    def is_available(self) -> bool:
+        """Проверить доступность сотрудника для новых проектов"""
+        return self.get_project_count() < self.MAX_PROJECTS
+
+    @abstractmethod
+    def calculate_salary(self) -> float:
+        pass
+
+    @abstractmethod
+    def get_info(self) -> str:
+        pass
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, part4.AbstractEmployee):
+            return NotImplemented
+        return self.id == other.id
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, part4.AbstractEmployee):
+            return NotImplemented
+        return self.calculate_salary() < other.calculate_salary()
+
+    def __add__(self, other) -> float:
+        if not isinstance(other, part4.AbstractEmployee):
+            return NotImplemented
+        return self.calculate_salary() + other.calculate_salary()
+
+    def __radd__(self, other) -> float:
+        if other == 0:
+            return self.calculate_salary()
+        else:
+            return other + self.calculate_salary()
+
+    def to_dict(self) -> dict:
+        """Сериализация сотрудника в словарь (формат part4)"""
+        return {
+            "type": self.__class__.__name__,
+            "id": self.id,
+            "name": self.name,
+            "department": self.department,
+            "base_salary": self.base_salary,
+            "assigned_project_ids": [p.project_id for p in self.assigned_projects],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, company: "part4.Company" = None):
+        raise NotImplementedError("Должен быть реализован в подклассах")
+
+    def _restore_projects(self, data: dict, company: "part4.Company") -> None:
+        """Восстановление связей с проектами"""
+        if company:
+            for project_id in data.get("assigned_project_ids", []):
+                project = company.find_project_by_id(project_id)
+                if project:
+                    self.assign_to_project(project)
+
+
+# Компактные объекты принимаются везде, где ожидается part4.AbstractEmployee
+part4.AbstractEmployee.register(AbstractEmployee)
+
+
+class Employee(AbstractEmployee):
+    __slots__ = ()
+
+    @_cached_salary
+    def calculate_salary(self) -> float:
+        return self.base_salary
+
+    def get_info(self) -> str:
+        return (
+            f"Сотрудник id: {self.id}, имя: {self.name}, отдел: {self.department}, "
+            f"базовая зарплата: {self.base_salary}, итоговая зарплата: {self.calculate_salary()}, "
+            f"проектов: {self.get_project_count()}"
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict, company: "part4.Company" = None) -> "Employee":
+        employee = cls(
+            id=data["id"],
+            name=data["name"],
+            department=data["department"],
+            base_salary=data["base_salary"],
+        )
+        employee._restore_projects(data, company)
+        return employee
+
+
+class Manager(Employee):
+    __slots__ = ("__bonus",)
+
+    def __init__(
+        self, id: int, name: str, department: str, base_salary: float, bonus: float
+    ):
+        super().__init__(id, name, department, base_salary)
+        self.__bonus = bonus
+
+    @property
+    def bonus(self):
+        return self.__bonus
+
+    @bonus.setter
+    @_affects_salary
+    def bonus(self, value):
+        value = float(value)
+        if value < 0:
+            raise ValueError("Бонус не может быть отрицательным")
+        self.__bonus = value
+
+    @_cached_salary
+    def calculate_salary(self) -> float:
+        return self.base_salary + self.bonus
+
+    def get_info(self) -> str:
+        return (
+            f"Менеджер id: {self.id}, имя: {self.name}, отдел: {self.department}, "
+            f"базовая зарплата: {self.base_salary}, бонус: {self.bonus}, "
+            f"итоговая зарплата: {self.calculate_salary()}, проектов: {self.get_project_count()}"
+        )
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["bonus"] = self.bonus
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, company: "part4.Company" = None) -> "Manager":
+        manager = cls(
+            id=data["id"],
+            name=data["name"],
+            department=data["department"],
+            base_salary=data["base_salary"],
+            bonus=data["bonus"],
+        )
+        manager._restore_projects(data, company)
+        return manager
+
+
+class Developer(Employee):
+    __slots__ = ("__tech_stack", "__seniority_level")
+
+    SENIORITY_MULTIPLIERS = part4.Developer.SENIORITY_MULTIPLIERS
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        department: str,
+        base_salary: float,
+        tech_stack: list[str],
+        seniority_level: str,
+    ):
+        super().__init__(id, name, department, base_salary)
+        self.__tech_stack = tech_stack
+        self.__seniority_level = seniority_level
+
+    @property
+    def tech_stack(self):
+        return self.__tech_stack.copy()
+
+    @property
+    def seniority_level(self):
+        return self.__seniority_level
+
+    @seniority_level.setter
+    @_affects_salary
+    def seniority_level(self, value):
+        allowed_levels = ["junior", "middle", "senior"]
+        if value not in allowed_levels:
+            raise ValueError(
+                f'Уровень должен быть один из: {", ".join(allowed_levels)}'
+            )
+        self.__seniority_level = value
+
+    def add_skill(self, new_skill: str) -> None:
+        self.__tech_stack.append(new_skill)
+
+    @_cached_salary
+    def calculate_salary(self) -> float:
+        return self.base_salary * self.SENIORITY_MULTIPLIERS[self.seniority_level]
+
+    def get_info(self) -> str:
+        return (
+            f"Разработчик id: {self.id}, имя: {self.name}, отдел: {self.department}, "
+            f"базовая зарплата: {self.base_salary}, уровень: {self.seniority_level}, "
+            f'стек технологий: {", ".join(self.tech_stack)}, '
+            f"итоговая зарплата: {self.calculate_salary()}, проектов: {self.get_project_count()}"
+        )
+
+    def __iter__(self):
+        return iter(self.__tech_stack)
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["tech_stack"] = self.tech_stack
+        data["seniority_level"] = self.seniority_level
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, company: "part4.Company" = None) -> "Developer":
+        developer = cls(
+            id=data["id"],
+            name=data["name"],
+            department=data["department"],
+            base_salary=data["base_salary"],
+            tech_stack=data["tech_stack"],
+            seniority_level=data["seniority_level"],
+        )
+        developer._restore_projects(data, company)
+        return developer
+
+
+class Salesperson(Employee):
+    __slots__ = ("__commission_rate", "__sales_volume")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        department: str,
+        base_salary: float,
+        commission_rate: float,
+        sales_volume: float,
+    ):
+        super().__init__(id, name, department, base_salary)
+        self.__commission_rate = commission_rate
+        self.__sales_volume = sales_volume
+
+    @property
+    def commission_rate(self):
+        return self.__commission_rate
+
+    @property
+    def sales_volume(self):
+        return self.__sales_volume
+
+    @commission_rate.setter
+    @_affects_salary
+    def commission_rate(self, value):
+        value = float(value)
+        if not 0 <= value <= 1:
+            raise ValueError("Ставка комиссии должна быть между 0 и 1")
+        self.__commission_rate = value
+
+    @sales_volume.setter
+    @_affects_salary
+    def sales_volume(self, value):
+        value = float(value)
+        if value < 0:
+            raise ValueError("Объем продаж не может быть отрицательным")
+        self.__sales_volume = value
+
+    @_affects_salary
+    def update_sales(self, new_sales: float) -> None:
+        if new_sales < 0:
+            raise ValueError("Нельзя добавить отрицательный объем продаж")
+        self.__sales_volume += new_sales
+
+    @_cached_salary
+    def calculate_salary(self) -> float:
+        return self.base_salary + (self.commission_rate * self.sales_volume)
+
+    def get_info(self) -> str:
+        return (
+            f"Продавец id: {self.id}, имя: {self.name}, отдел: {self.department}, "
+            f"базовая зарплата: {self.base_salary}, ставка комиссии: {self.commission_rate}, "
+            f"объем продаж: {self.sales_volume}, итоговая зарплата: {self.calculate_salary()}, "
+            f"проектов: {self.get_project_count()}"
+        )
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["commission_rate"] = self.commission_rate
+        data["sales_volume"] = self.sales_volume
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, company: "part4.Company" = None) -> "Salesperson":
+        salesperson = cls(
+            id=data["id"],
+            name=data["name"],
+            department=data["department"],
+            base_salary=data["base_salary"],
+            commission_rate=data["commission_rate"],
+            sales_volume=data["sales_volume"],
+        )
+        salesperson._restore_projects(data, company)
+        return salesperson
+
+
+# Замер памяти
+def _build_roster(module, count: int) -> list:
+    """Смешанный состав сотрудников, как в типичной компании"""
+    departments = ["DEV", "SALES", "MGMT", "HR"]
+    roster = []
+    for i in range(1, count + 1):
+        # Код отдела собирается заново, как при чтении из файла
+        department = "".join(departments[i % 4])
+        kind = i % 4
+        if kind == 0:
+            roster.append(module.Employee(i, f"Employee{i}", department, 4000.0))
+        elif kind == 1:
+            roster.append(module.Manager(i, f"Manager{i}", department, 6000.0, 1000.0))
+        elif kind == 2:
+            roster.append(
+                module.Developer(i, f"Dev{i}", department, 5000.0, ["Python"], "middle")
+            )
+        else:
+            roster.append(
+                module.Salesperson(i, f"Sales{i}", department, 3000.0, 0.1, 50000.0)
+            )
+    return roster
+
+
+def measure_memory(module, count: int) -> int:
+    """Объем памяти (в байтах), занимаемый count сотрудниками модуля"""
+    tracemalloc.start()
+    try:
+        roster = _build_roster(module, count)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del roster
+    return current
+
+
+def main():
+    """Сравнение памяти part4 и компактной иерархии"""
+    print(f"{'Сотрудников':>12} {'part4, МБ':>12} {'slotted, МБ':>12} {'Байт/объект':>16}")
+    for count in (10**5, 10**6):
+        regular = measure_memory(part4, count)
+        compact = measure_memory(sys.modules[__name__], count)
+        print(
+            f"{count:>12} {regular / 2**20:>12.1f} {compact / 2**20:>12.1f} "
+            f"{regular // count:>7} -> {compact // count:<7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Сортировка и ранжирование сотрудников по ключам.
+
+Вместо компараторов compare_by_* (через functools.cmp_to_key каждое
+сравнение заново вызывает calculate_salary()) ключ каждого сотрудника
+вычисляется один раз: список декорируется кортежами ключей, сортируется
+по ним и раздекорируется (преобразование Шварца).
+
+Ключ задается именем из KEYS, вызываемым объектом или парой
+(ключ, descending). Имя с префиксом "-" означает сортировку по убыванию:
+
+    sort_employees(staff, "department", "-salary", "name")
+    top_k(staff, 100, "salary")          # 100 самых высоких зарплат
+
+Функции работают с сотрудниками любой части (part3, part4, sourcecode).
+"""
+
+import heapq
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable, List, Tuple, Union
+
+KEYS = {
+    "id": attrgetter("id"),
+    "name": attrgetter("name"),
+    "department": attrgetter("department"),
+    "base_salary": attrgetter("base_salary"),
+    "salary": lambda employee: employee.calculate_salary(),
+    "type": lambda employee: type(employee).__name__,
+}
+
+KeySpec = Union[str, Callable[[Any], Any], Tuple[Any, bool]]
+
+
+class _Descending:
+    """Обертка, обращающая порядок значения внутри составного ключа"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def _parse_key(spec: KeySpec) -> Tuple[Callable[[Any], Any], bool]:
+    if isinstance(spec, tuple):
+        key, descending = spec
+        return _parse_key(key)[0], descending
+    if isinstance(spec, str):
+        descending = spec.startswith("-")
+        name = spec[1:] if descending else spec
+        if name not in KEYS:
+            raise ValueError(f"Неизвестный ключ сортировки: {name}")
+        return KEYS[name], descending
+    if callable(spec):
+        return spec, False
+    raise TypeError(f"Ключ сортировки должен быть строкой или функцией: {spec!r}")
+
+
+def _decorate(
+    employees: Iterable, keys: Tuple[KeySpec, ...]
+) -> Tuple[List[tuple], bool]:
+    """Вычисляет кортеж ключей для каждого сотрудника ровно один раз.
+
+    Возвращает пары (ключ, сотрудник) и флаг reverse. Если все ключи
+    в одном направлении, порядок задается флагом; при смешанных
+    направлениях убывающие ключи инвертируются: числа — сменой знака,
+    остальные — оберткой _Descending.
+    """
+    if not keys:
+        keys = ("name",)
+    parsed = [_parse_key(spec) for spec in keys]
+    directions = {descending for _, descending in parsed}
+    if len(directions) == 1:
+        reverse = directions.pop()
+        if len(parsed) == 1:
+            key = parsed[0][0]
+            return [((key(emp),), emp) for emp in employees], reverse
+        funcs = [key for key, _ in parsed]
+        return [(tuple(key(emp) for key in funcs), emp) for emp in employees], reverse
+
+    def mixed_key(employee):
+        values = []
+        for key, descending in parsed:
+            value = key(employee)
+            if descending:
+                if isinstance(value, (int, float)):
+                    value = -value
+                else:
+                    value = _Descending(value)
+            values.append(value)
+        return tuple(values)
+
+    return [(mixed_key(emp), emp) for emp in employees], False
+
+
+def sort_employees(employees: Iterable, *keys: KeySpec) -> List:
+    """Устойчивая сортировка по одному или нескольким ключам"""
+    decorated, reverse = _decorate(employees, keys)
+    decorated.sort(key=itemgetter(0), reverse=reverse)
+    return [emp for _, emp in decorated]
+
+
+def top_k(employees: Iterable, k: int, *keys: KeySpec) -> List:
+    """Первые k сотрудников в порядке убывания ключей без полной сортировки.
+
+    Работает за O(n log k) через heapq. По умолчанию ранжирует по
+    зарплате: top_k(staff, 10) — десять самых высоких зарплат.
+    """
+    decorated, reverse = _decorate(employees, keys or ("salary",))
+    select = heapq.nsmallest if reverse else heapq.nlargest
+    return [emp for _, emp in select(k, decorated, key=itemgetter(0))]
+
+
+def bottom_k(employees: Iterable, k: int, *keys: KeySpec) -> List:
+    """Первые k сотрудников в порядке возрастания ключей"""
+    decorated, reverse = _decorate(employees, keys or ("salary",))
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return [emp for _, emp in select(k, decorated, key=itemgetter(0))]
@@ -1,9 +1,59 @@
+import functools
+import json
+import os
+import pickle
+import queue
+import random
 import sqlite3
+import tempfile
+import threading
+import time
+import warnings
+import weakref
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Iterable, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен
+    np = None
+
+# Счетчики кэша зарплат: сколько вызовов calculate_salary обслужено из кэша
+_salary_cache_stats = {"hits": 0, "misses": 0}
+
+
+def salary_cache_stats() -> Dict[str, int]:
+    return dict(_salary_cache_stats)
+
+
+def reset_salary_cache_stats():
+    _salary_cache_stats["hits"] = 0
+    _salary_cache_stats["misses"] = 0
+
+
+def _cached_salary(method):
+    """Хранит результат calculate_salary до вызова _invalidate_salary()"""
+
+    @functools.wraps(method)
+    def wrapper(self):
+        salary = self._salary_cache
+        if salary is not None:
+            _salary_cache_stats["hits"] += 1
+            return salary
+        _salary_cache_stats["misses"] += 1
+        salary = self._salary_cache = method(self)
+        return salary
+
+    return wrapper
+
 
 class AbstractEmployee(ABC):
+    _salary_cache = None
+
     def __init__(self, id: int, name: str, department: str, base_salary: float):
         self.__id = id
         self.__name = name
@@ -11,6 +61,8 @@ class AbstractEmployee(ABC):
         self.__base_salary = base_salary
         self.__observers = []
         self.__bonus_strategy = None
+        # Декораторы, чья зарплата зависит от этого сотрудника (создается лениво)
+        self.__salary_dependents = None
 
     @property
     def id(self):
@@ -55,6 +107,19 @@ class AbstractEmployee(ABC):
         if value < 0:
             raise ValueError("Зарплата не может быть отрицательной")
         self.__base_salary = value
+        self._invalidate_salary()
+
+    def _add_salary_dependent(self, dependent):
+        if self.__salary_dependents is None:
+            self.__salary_dependents = weakref.WeakSet()
+        self.__salary_dependents.add(dependent)
+
+    def _invalidate_salary(self):
+        """Сбрасывает кэш зарплаты у сотрудника и у оборачивающих его декораторов"""
+        self._salary_cache = None
+        if self.__salary_dependents:
+            for dependent in self.__salary_dependents:
+                dependent._invalidate_salary()
 
     def add_observer(self, observer):
         if observer not in self.__observers:
@@ -70,6 +135,7 @@ class AbstractEmployee(ABC):
 
     def set_bonus_strategy(self, strategy):
         self.__bonus_strategy = strategy
+        self._invalidate_salary()
 
     def calculate_bonus(self):
         if self.__bonus_strategy:
@@ -95,6 +161,7 @@ class AbstractEmployee(ABC):
 
 
 class Employee(AbstractEmployee):
+    @_cached_salary
     def calculate_salary(self) -> float:
         return self.base_salary + self.calculate_bonus()
 
@@ -117,7 +184,9 @@ class Manager(Employee):
         if value < 0:
             raise ValueError("Бонус не может быть отрицательным")
         self.__bonus = value
+        self._invalidate_salary()
 
+    @_cached_salary
     def calculate_salary(self) -> float:
         return self.base_salary + self.bonus + self.calculate_bonus()
 
@@ -144,6 +213,7 @@ class Developer(Employee):
     def seniority(self):
         return self.__seniority
 
+    @_cached_salary
     def calculate_salary(self) -> float:
         multiplier = {"junior": 1.0, "middle": 1.5, "senior": 2.0}
         return (
@@ -165,12 +235,22 @@ class Salesperson(Employee):
         self.__commission_rate = commission_rate
         self.__sales = 0
 
+    @property
+    def commission_rate(self):
+        return self.__commission_rate
+
+    @property
+    def sales(self):
+        return self.__sales
+
     def update_sales(self, amount: float):
         if amount < 0:
             raise ValueError("Сумма продаж не может быть отрицательной")
         self.__sales += amount
+        self._invalidate_salary()
         self.notify_observers(f"Sales updated: {amount}")
 
+    @_cached_salary
     def calculate_salary(self) -> float:
         return (
             self.base_salary
@@ -231,7 +311,8 @@ class Company:
         self.__name = name
         self.__departments = []
         self.__projects = []
-        self.__employees = []
+        # id -> сотрудник; dict сохраняет порядок найма
+        self.__employees = {}
         self.__next_employee_id = 1
 
     @property
@@ -250,14 +331,43 @@ class Company:
         return id
 
     def hire_employee(self, employee: AbstractEmployee):
-        if employee.id == 0:  # Если ID не задан
-            employee.id = self._get_next_employee_id()
-        elif employee.id >= self.__next_employee_id:
-            self.__next_employee_id = employee.id + 1
-        self.__employees.append(employee)
+        self.hire_many([employee])
 
-    def fire_employee(self, employee_id):
-        self.__employees = [e for e in self.__employees if e.id != employee_id]
+    def hire_many(self, employees: Iterable[AbstractEmployee]):
+        """Массовый найм за O(k).
+
+        Сначала проверяются все id, поэтому при ошибке никто не нанят.
+        """
+        employees = list(employees)
+        batch_ids = set()
+        for employee in employees:
+            if employee.id == 0:
+                continue
+            if employee.id in self.__employees or employee.id in batch_ids:
+                raise ValueError(f"Сотрудник с ID {employee.id} уже работает")
+            batch_ids.add(employee.id)
+        if batch_ids:
+            self.__next_employee_id = max(self.__next_employee_id, max(batch_ids) + 1)
+        for employee in employees:
+            if employee.id == 0:  # Если ID не задан
+                employee.id = self._get_next_employee_id()
+            self.__employees[employee.id] = employee
+
+    def fire_employee(self, employee_id) -> Optional[AbstractEmployee]:
+        """Увольняет сотрудника за O(1) и возвращает его (или None)"""
+        return self.__employees.pop(employee_id, None)
+
+    def fire_many(self, employee_ids: Iterable[int]) -> List[AbstractEmployee]:
+        """Массовое увольнение; отсутствующие id пропускаются"""
+        fired = []
+        for employee_id in employee_ids:
+            employee = self.__employees.pop(employee_id, None)
+            if employee is not None:
+                fired.append(employee)
+        return fired
+
+    def get_employee(self, employee_id) -> Optional[AbstractEmployee]:
+        return self.__employees.get(employee_id)
 
     def add_department(self, department):
         if not isinstance(department, Department):
@@ -270,13 +380,13 @@ class Company:
         self.__projects.append(project)
 
     def calculate_total_salary(self):
-        return sum(e.calculate_salary() for e in self.__employees)
+        return sum(e.calculate_salary() for e in self.__employees.values())
 
     def get_employee_count(self):
         return len(self.__employees)
 
     def get_all_employees(self):
-        return self.__employees.copy()
+        return list(self.__employees.values())
 
 
 # ==================== ЧАСТЬ 1: ПОРОЖДАЮЩИЕ ПАТТЕРНЫ ====================
@@ -284,40 +394,44 @@ class Company:
 
 # 1.1. Singleton для подключения к БД
 class DatabaseConnection:
+    """Единственная на процесс база сотрудников.
+
+    Первый open(path) открывает SqliteEmployeeRepository на файле path,
+    остальные части программы получают тот же репозиторий через
+    repository или его соединение через get_connection().
+    """
+
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._connection = None
+            cls._instance._repository = None
+            cls._instance._path = None
         return cls._instance
 
-    def get_connection(self):
-        if self._connection is None:
-            self._connection = sqlite3.connect(":memory:", check_same_thread=False)
-            self._init_db()
-        return self._connection
+    def open(self, path: str) -> "SqliteEmployeeRepository":
+        if self._repository is None:
+            self._repository = SqliteEmployeeRepository(path)
+            self._path = path
+        elif path != self._path:
+            raise ValueError(f"База уже открыта на файле {self._path}")
+        return self._repository
 
-    def _init_db(self):
-        cursor = self._connection.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS employees (
-                id INTEGER PRIMARY KEY,
-                name TEXT,
-                department TEXT,
-                base_salary REAL,
-                type TEXT,
-                data TEXT
-            )
-        """
-        )
-        self._connection.commit()
+    @property
+    def repository(self) -> "SqliteEmployeeRepository":
+        if self._repository is None:
+            raise RuntimeError("База не открыта: сначала вызовите open(path)")
+        return self._repository
+
+    def get_connection(self) -> sqlite3.Connection:
+        return self.repository.connection
 
     def close_connection(self):
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        if self._repository is not None:
+            self._repository.close()
+            self._repository = None
+            self._path = None
 
 
 # 1.2. Factory Method (рефакторинг существующей фабрики)
@@ -364,6 +478,15 @@ class SalespersonConcreteFactory(EmployeeFactory):
         return sp
 
 
+# Реестр фабрик по типу сотрудника; фабрики без состояния, поэтому общие
+EMPLOYEE_FACTORIES: Dict[str, EmployeeFactory] = {
+    "employee": EmployeeConcreteFactory(),
+    "manager": ManagerConcreteFactory(),
+    "developer": DeveloperConcreteFactory(),
+    "salesperson": SalespersonConcreteFactory(),
+}
+
+
 # 1.3. Abstract Factory для разных типов компаний
 class CompanyFactory(ABC):
     @abstractmethod
@@ -393,12 +516,9 @@ class TechCompanyFactory(CompanyFactory):
 
     def create_employee(self, **kwargs) -> AbstractEmployee:
         emp_type = kwargs.get("type", "developer")
-        if emp_type == "developer":
-            factory = DeveloperConcreteFactory()
-        elif emp_type == "manager":
-            factory = ManagerConcreteFactory()
-        else:
-            factory = EmployeeConcreteFactory()
+        if emp_type not in ("developer", "manager"):
+            emp_type = "employee"
+        factory = EMPLOYEE_FACTORIES[emp_type]
 
         return factory.create_employee(
             kwargs.get("id", 0),  # 0 означает "авто-ID"
@@ -423,12 +543,9 @@ class SalesCompanyFactory(CompanyFactory):
 
     def create_employee(self, **kwargs) -> AbstractEmployee:
         emp_type = kwargs.get("type", "salesperson")
-        if emp_type == "salesperson":
-            factory = SalespersonConcreteFactory()
-        elif emp_type == "manager":
-            factory = ManagerConcreteFactory()
-        else:
-            factory = EmployeeConcreteFactory()
+        if emp_type not in ("salesperson", "manager"):
+            emp_type = "employee"
+        factory = EMPLOYEE_FACTORIES[emp_type]
 
         return factory.create_employee(
             kwargs.get("id", 0),  # 0 означает "авто-ID"
@@ -509,14 +626,7 @@ class EmployeeBuilder:
                 missing.append("base_salary")
             raise ValueError(f"Missing required fields: {', '.join(missing)}")
 
-        factories = {
-            "employee": EmployeeConcreteFactory(),
-            "manager": ManagerConcreteFactory(),
-            "developer": DeveloperConcreteFactory(),
-            "salesperson": SalespersonConcreteFactory(),
-        }
-
-        factory = factories.get(self._type, EmployeeConcreteFactory())
+        factory = EMPLOYEE_FACTORIES.get(self._type, EMPLOYEE_FACTORIES["employee"])
         employee = factory.create_employee(
             self._id,
             self._name,
@@ -548,21 +658,160 @@ class ExternalSalarySystem:
         bonus = employee_data.get("bonus", 0)
         return base + bonus
 
+    def compute_compensations(self, batch: List[Dict]) -> List[float]:
+        """Пакетный вызов: один запрос на группу сотрудников"""
+        return [self.compute_compensation(employee_data) for employee_data in batch]
+
+
+class SimulatedSalarySystem(ExternalSalarySystem):
+    """Локальная замена удаленной системы: задержка сети и случайные сбои.
+
+    Каждый вызов стоит latency секунд на запрос плюс per_item на каждого
+    сотрудника в пакете; с вероятностью failure_rate вызов падает с
+    ConnectionError.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.01,
+        per_item: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self._latency = latency
+        self._per_item = per_item
+        self._failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _round_trip(self, items: int):
+        with self._lock:
+            self.calls += 1
+            failed = self._random.random() < self._failure_rate
+        time.sleep(self._latency + self._per_item * items)
+        if failed:
+            raise ConnectionError("Внешняя система расчета зарплат недоступна")
+
+    def compute_compensation(self, employee_data: Dict) -> float:
+        self._round_trip(1)
+        return super().compute_compensation(employee_data)
+
+    def compute_compensations(self, batch: List[Dict]) -> List[float]:
+        self._round_trip(len(batch))
+        return [
+            ExternalSalarySystem.compute_compensation(self, employee_data)
+            for employee_data in batch
+        ]
+
 
 class SalaryAdapter:
-    """Адаптер для интеграции внешней системы"""
+    """Адаптер для интеграции внешней системы.
 
-    def __init__(self, external_system: ExternalSalarySystem):
-        self._external_system = external_system
+    calculate_salaries отправляет сотрудников пакетами по batch_size,
+    до max_workers пакетов одновременно. Упавший пакет повторяется до
+    retries раз с растущей паузой; если весь расчет не уложился в timeout
+    секунд, выбрасывается TimeoutError. Пул потоков создается при первом
+    пакетном расчете и живет до close().
+    """
 
-    def calculate_salary(self, employee: AbstractEmployee) -> float:
+    RETRY_ERRORS = (ConnectionError, TimeoutError)
+
+    def __init__(
+        self,
+        external_system: ExternalSalarySystem,
+        batch_size: int = 100,
+        max_workers: int = 4,
+        retries: int = 2,
+        timeout: Optional[float] = None,
+        backoff: float = 0.05,
+    ):
+        if batch_size < 1 or max_workers < 1 or retries < 0:
+            raise ValueError("Некорректные параметры пакетного расчета")
+        self._external_system = external_system
+        self._batch_size = batch_size
+        self._max_workers = max_workers
+        self._retries = retries
+        self._timeout = timeout
+        self._backoff = backoff
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _employee_data(employee: AbstractEmployee) -> Dict:
         # Преобразуем наш объект в формат внешней системы
-        employee_data = {
+        return {
             "base": employee.base_salary,
             "bonus": employee.calculate_bonus(),
         }
+
+    def calculate_salary(self, employee: AbstractEmployee) -> float:
+        employee_data = self._employee_data(employee)
         return self._external_system.compute_compensation(employee_data)
 
+    def _compute_batch(self, batch: List[Dict]) -> List[float]:
+        compute = getattr(self._external_system, "compute_compensations", None)
+        for attempt in range(self._retries + 1):
+            try:
+                if compute is not None:
+                    return compute(batch)
+                return [
+                    self._external_system.compute_compensation(employee_data)
+                    for employee_data in batch
+                ]
+            except self.RETRY_ERRORS:
+                if attempt == self._retries:
+                    raise
+                time.sleep(self._backoff * 2**attempt)
+
+    def calculate_salaries(self, employees: Iterable[AbstractEmployee]) -> List[float]:
+        """Зарплаты сотрудников в исходном порядке"""
+        payload = [self._employee_data(employee) for employee in employees]
+        size = self._batch_size
+        batches = [payload[i : i + size] for i in range(0, len(payload), size)]
+        if not batches:
+            return []
+        if len(batches) == 1 and self._timeout is None:
+            # Без срока единственный пакет считаем в вызывающем потоке
+            return self._compute_batch(batches[0])
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="salary-adapter"
+            )
+        futures = [
+            self._executor.submit(self._compute_batch, batch) for batch in batches
+        ]
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout
+        salaries = []
+        try:
+            for future in futures:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(0.0, deadline - time.monotonic())
+                salaries.extend(future.result(timeout=remaining))
+        except FuturesTimeoutError:
+            if future.done():  # Таймаут внутри самого пакета
+                raise
+            raise TimeoutError(
+                f"Внешняя система не ответила за {self._timeout} с"
+            ) from None
+        finally:
+            # При ошибке не ждем и не отправляем оставшиеся пакеты
+            for future in futures:
+                future.cancel()
+        return salaries
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 
 # 2.2. Decorator для добавления функциональности
 class EmployeeDecorator(AbstractEmployee):
@@ -574,7 +823,10 @@ class EmployeeDecorator(AbstractEmployee):
         super().__init__(
             employee.id, employee.name, employee.department, employee.base_salary
         )
+        # Изменения обернутого сотрудника сбрасывают кэш декоратора
+        employee._add_salary_dependent(self)
 
+    @_cached_salary
     def calculate_salary(self) -> float:
         return self._employee.calculate_salary()
 
@@ -605,6 +857,7 @@ class BonusDecorator(EmployeeDecorator):
         super().__init__(employee)
         self._bonus_amount = bonus_amount
 
+    @_cached_salary
     def calculate_salary(self) -> float:
         return self._employee.calculate_salary() + self._bonus_amount
 
@@ -623,13 +876,69 @@ class TrainingDecorator(EmployeeDecorator):
         return f"{self._employee.get_info()} | Training: {self._training}"
 
 
+class DecoratorStack(EmployeeDecorator):
+    """Стек бонусов и обучений в одном объекте вместо цепочки декораторов.
+
+    Хранит сумму бонусов и готовый хвост описания, поэтому зарплата и
+    get_info не проходят по всем уровням. Результат совпадает с
+    вложенными BonusDecorator/TrainingDecorator в том же порядке.
+    """
+
+    def __init__(self, employee: AbstractEmployee):
+        super().__init__(employee)
+        self._bonus_total = 0
+        self._info_suffixes: List[str] = []
+        self._info_suffix = ""
+
+    @classmethod
+    def flatten(cls, employee: AbstractEmployee) -> "DecoratorStack":
+        """Свернуть цепочку декораторов; чужие декораторы остаются внутри"""
+        layers = []
+        while type(employee) in (BonusDecorator, TrainingDecorator, DecoratorStack):
+            layers.append(employee)
+            employee = employee._employee
+        stack = cls(employee)
+        for layer in reversed(layers):
+            if type(layer) is BonusDecorator:
+                stack.add_bonus(layer._bonus_amount)
+            elif type(layer) is TrainingDecorator:
+                stack.add_training(layer._training)
+            else:
+                stack._extend(layer._bonus_total, layer._info_suffixes)
+        return stack
+
+    def _extend(self, bonus: float, suffixes: List[str]) -> "DecoratorStack":
+        self._bonus_total += bonus
+        self._info_suffixes.extend(suffixes)
+        self._info_suffix += "".join(suffixes)
+        self._invalidate_salary()
+        return self
+
+    def add_bonus(self, bonus_amount: float) -> "DecoratorStack":
+        return self._extend(bonus_amount, [f" [+Bonus: {bonus_amount}]"])
+
+    def add_training(self, training: str) -> "DecoratorStack":
+        return self._extend(0, [f" | Training: {training}"])
+
+    @_cached_salary
+    def calculate_salary(self) -> float:
+        return self._employee.calculate_salary() + self._bonus_total
+
+    def get_info(self) -> str:
+        return self._employee.get_info() + self._info_suffix
+
+
 # 2.3. Facade для упрощенного управления компанией
 class CompanyFacade:
     """Фасад для упрощения работы со сложной системой компании"""
 
-    def __init__(self, company: Company):
+    def __init__(
+        self, company: Company, notification_system: Optional["Observer"] = None
+    ):
         self._company = company
-        self._notification_system = NotificationSystem()
+        if notification_system is None:
+            notification_system = NotificationSystem()
+        self._notification_system = notification_system
 
     def hire(self, employee_data: Dict) -> bool:
         """Упрощенный найм сотрудника"""
@@ -674,11 +983,8 @@ class CompanyFacade:
 
     def fire(self, employee_id: int) -> bool:
         """Упрощенное увольнение сотрудника"""
-        employee = next(
-            (e for e in self._company.get_all_employees() if e.id == employee_id), None
-        )
+        employee = self._company.fire_employee(employee_id)
         if employee:
-            self._company.fire_employee(employee_id)
             self._notification_system.notify(f"Fired: {employee.name}")
             return True
         return False
@@ -724,6 +1030,121 @@ class NotificationSystem(Observer):
         return self._notifications.copy()
 
 
+def print_sink(batch: List[str]):
+    """Синк, печатающий пакет уведомлений одним вызовом print"""
+    print("\n".join(f"NOTIFICATION: {notification}" for notification in batch))
+
+
+class NotificationBus(Observer):
+    """Асинхронная шина уведомлений.
+
+    update() только кладет событие в ограниченную очередь и возвращает
+    управление; форматирование и доставка в синки идут пакетами в
+    фоновом потоке. Если очередь заполнена, update() ждет, пока поток
+    ее разгрузит. История хранит последние history_size уведомлений.
+    Синк — любой вызываемый объект, принимающий список строк.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        sinks: Optional[Iterable[Callable[[List[str]], None]]] = None,
+        maxsize: int = 1024,
+        batch_size: int = 64,
+        history_size: int = 1000,
+    ):
+        self._sinks = list(sinks) if sinks is not None else []
+        self._queue = queue.Queue(maxsize)
+        self._batch_size = batch_size
+        self._history = deque(maxlen=history_size)
+        self._history_lock = threading.Lock()
+        # Проверка _closed и постановка в очередь идут под одной блокировкой
+        # с close(): событие после _STOP никто бы не обработал
+        self._close_lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def add_sink(self, sink: Callable[[List[str]], None]):
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[List[str]], None]):
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def update(self, subject, message: str):
+        name = subject.name if hasattr(subject, "name") else "System"
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("Шина уведомлений закрыта")
+            self._queue.put((time.time(), name, message))
+
+    def notify(self, message: str):
+        # Для прямых уведомлений (без субъекта)
+        self.update(None, message)
+
+    def get_notifications(self):
+        with self._history_lock:
+            return list(self._history)
+
+    def flush(self):
+        """Ждет доставки всех поставленных в очередь уведомлений"""
+        self._queue.join()
+
+    def close(self):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        stamp_second, stamp = None, ""
+        while True:
+            events = [self._queue.get()]
+            while len(events) < self._batch_size:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            batch = []
+            for event in events:
+                if event is self._STOP:
+                    stop = True
+                    continue
+                created, name, message = event
+                # Метка времени форматируется один раз в секунду
+                second = int(created)
+                if second != stamp_second:
+                    stamp_second = second
+                    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+                batch.append(f"[{stamp}] {name}: {message}")
+            if batch:
+                self._deliver(batch)
+            for _ in events:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _deliver(self, batch: List[str]):
+        with self._history_lock:
+            self._history.extend(batch)
+        for sink in list(self._sinks):
+            try:
+                sink(batch)
+            except Exception as e:
+                print(f"Notification sink failed: {e}")
+
+
 # 3.2. Strategy для различных стратегий расчета бонусов
 class BonusStrategy(ABC):
     @abstractmethod
@@ -755,6 +1176,8 @@ class ProjectBonusStrategy(BonusStrategy):
 
 # 3.3. Command для операций с сотрудниками
 class Command(ABC):
+    quiet = False  # Не печатать сообщения о выполнении и отмене
+
     @abstractmethod
     def execute(self):
         pass
@@ -763,6 +1186,10 @@ class Command(ABC):
     def undo(self):
         pass
 
+    def _report(self, message: str):
+        if not self.quiet:
+            print(message)
+
 
 class HireEmployeeCommand(Command):
     def __init__(self, company: Company, employee: AbstractEmployee):
@@ -773,12 +1200,12 @@ class HireEmployeeCommand(Command):
     def execute(self):
         self._company.hire_employee(self._employee)
         self._executed = True
-        print(f"Executed: Hire {self._employee.name}")
+        self._report(f"Executed: Hire {self._employee.name}")
 
     def undo(self):
         if self._executed:
             self._company.fire_employee(self._employee.id)
-            print(f"Undone: Hire {self._employee.name}")
+            self._report(f"Undone: Hire {self._employee.name}")
 
 
 class FireEmployeeCommand(Command):
@@ -789,57 +1216,304 @@ class FireEmployeeCommand(Command):
         self._executed = False
 
     def execute(self):
-        # Находим сотрудника перед удалением для возможности отмены
-        employees = self._company.get_all_employees()
-        for emp in employees:
-            if emp.id == self._employee_id:
-                self._employee = emp
-                break
-
-        self._company.fire_employee(self._employee_id)
+        # Сохраняем уволенного сотрудника для возможности отмены
+        self._employee = self._company.fire_employee(self._employee_id)
         self._executed = True
-        print(f"Executed: Fire employee {self._employee_id}")
+        self._report(f"Executed: Fire employee {self._employee_id}")
 
     def undo(self):
         if self._executed and self._employee:
             self._company.hire_employee(self._employee)
-            print(f"Undone: Fire employee {self._employee_id}")
+            self._report(f"Undone: Fire employee {self._employee_id}")
+
+
+class HireManyCommand(Command):
+    def __init__(self, company: Company, employees: Iterable[AbstractEmployee]):
+        self._company = company
+        self._employees = list(employees)
+        self._executed = False
+
+    def execute(self):
+        self._company.hire_many(self._employees)
+        self._executed = True
+        self._report(f"Executed: Hire {len(self._employees)} employees")
+
+    def undo(self):
+        if self._executed:
+            self._company.fire_many(emp.id for emp in self._employees)
+            self._executed = False
+            self._report(f"Undone: Hire {len(self._employees)} employees")
+
+
+class FireManyCommand(Command):
+    def __init__(self, company: Company, employee_ids: Iterable[int]):
+        self._company = company
+        self._employee_ids = list(employee_ids)
+        self._employees = []
+        self._executed = False
+
+    def execute(self):
+        self._employees = self._company.fire_many(self._employee_ids)
+        self._executed = True
+        self._report(f"Executed: Fire {len(self._employees)} employees")
+
+    def undo(self):
+        if self._executed:
+            self._company.hire_many(self._employees)
+            self._executed = False
+            self._report(f"Undone: Fire {len(self._employees)} employees")
 
 
 class UpdateSalaryCommand(Command):
     def __init__(self, employee: AbstractEmployee, new_salary: float):
         self._employee = employee
         self._new_salary = new_salary
-        self._old_salary = employee.base_salary
+        self._old_salary = None
         self._executed = False
 
     def execute(self):
+        # Старая зарплата берется в момент выполнения, а не создания команды
+        self._old_salary = self._employee.base_salary
         self._employee.base_salary = self._new_salary
         self._executed = True
-        print(
+        self._report(
             f"Executed: Update salary for {self._employee.name} to {self._new_salary}"
         )
 
     def undo(self):
         if self._executed:
             self._employee.base_salary = self._old_salary
-            print(f"Undone: Salary update for {self._employee.name}")
+            self._executed = False
+            self._report(f"Undone: Salary update for {self._employee.name}")
+
+
+class MacroCommand(Command):
+    """Группа команд, которая выполняется и отменяется как одна операция.
+
+    Если одна из команд падает, уже выполненные отменяются в обратном
+    порядке и исключение передается дальше. Вложенные команды молчат,
+    макрокоманда печатает одну итоговую строку.
+    """
+
+    def __init__(self, commands: Iterable[Command] = (), name: str = "Batch"):
+        self._commands = list(commands)
+        self._name = name
+        self._executed = False
+
+    def add(self, command: Command) -> "MacroCommand":
+        if self._executed:
+            raise RuntimeError("Нельзя добавлять команды в выполненную группу")
+        self._commands.append(command)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def execute(self):
+        done = []
+        # Вложенные команды молчат только внутри группы
+        previous = [command.quiet for command in self._commands]
+        try:
+            for command in self._commands:
+                command.quiet = True
+            for command in self._commands:
+                command.execute()
+                done.append(command)
+        except Exception:
+            for command in reversed(done):
+                command.undo()
+            raise
+        finally:
+            for command, quiet in zip(self._commands, previous):
+                command.quiet = quiet
+        self._executed = True
+        self._report(f"Executed: {self._name} ({len(self._commands)} commands)")
+
+    def undo(self):
+        if self._executed:
+            previous = [command.quiet for command in self._commands]
+            try:
+                for command in reversed(self._commands):
+                    command.quiet = True
+                    command.undo()
+            finally:
+                for command, quiet in zip(self._commands, previous):
+                    command.quiet = quiet
+            self._executed = False
+            self._report(f"Undone: {self._name} ({len(self._commands)} commands)")
+
+
+# Значения, которые копируются в файл выгрузки как есть
+_SPILL_VALUE_TYPES = frozenset(
+    {type(None), bool, int, float, complex, str, bytes, tuple, list, dict, set,
+     frozenset, datetime}
+)
+
+
+class _SpillPickler(pickle.Pickler):
+    """В файл пишутся команды и простые значения, прочие объекты - ссылками"""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.objects: Dict[int, Any] = {}  # Объекты, на которые сослалась запись
+
+    def persistent_id(self, obj):
+        # Сотрудники, репозитории, блокировки и т.п. не копируются:
+        # отмена после подъема из файла должна менять живые объекты
+        if type(obj) in _SPILL_VALUE_TYPES or isinstance(obj, (Command, type)):
+            return None
+        self.objects[id(obj)] = obj
+        return id(obj)
+
+
+class _SpillUnpickler(pickle.Unpickler):
+    def __init__(self, file, live_objects: Dict[int, Any]):
+        super().__init__(file)
+        self._live_objects = live_objects
+
+    def persistent_load(self, pid):
+        return self._live_objects[pid]
 
 
 class CommandInvoker:
-    """Invoker для управления командами"""
+    """Invoker для управления командами с отменой и повтором.
+
+    В памяти хранится не больше max_history последних команд. Без
+    spill_path более старые команды забываются, со spill_path они
+    дописываются в файл и поднимаются оттуда, когда очередь доходит
+    до них при отмене. В файл копируются только сами команды и простые
+    значения (числа, строки, даты, контейнеры); вместо остальных объектов
+    пишутся ссылки на живые объекты, которые удерживаются, пока на них
+    ссылается хоть одна выгруженная команда. Команда выгружается до
+    выполнения новой. Если ее все же не удается записать, она и все более
+    старые команды забываются с предупреждением RuntimeWarning: отменять
+    их вразнобой нельзя. quiet=True отключает печать сообщений
+    выполняемых команд.
+    """
 
-    def __init__(self):
-        self._history = []
+    def __init__(
+        self,
+        max_history: int = 1000,
+        spill_path: Optional[str] = None,
+        quiet: bool = False,
+    ):
+        if max_history < 1:
+            raise ValueError("max_history должен быть положительным")
+        self._history = deque()
+        self._redo = []
+        self._max_history = max_history
+        self._quiet = quiet
+        self._spill_file = open(spill_path, "w+b") if spill_path else None
+        self._spill_offsets: List[int] = []  # Начала записей в файле, по порядку
+        self._spill_refs: List[List[int]] = []  # Ссылки каждой записи
+        self._live_objects: Dict[int, Any] = {}
+        self._live_counts: Dict[int, int] = {}  # Сколько записей ссылается на объект
+
+    @property
+    def history_size(self) -> int:
+        """Сколько команд можно отменить, включая выгруженные на диск"""
+        return len(self._history) + len(self._spill_offsets)
+
+    @property
+    def redo_size(self) -> int:
+        return len(self._redo)
+
+    def _make_room(self):
+        """Освободить место под новую команду до ее выполнения"""
+        if len(self._history) < self._max_history:
+            return
+        if self._spill_file is None:
+            self._history.popleft()
+            return
+        self._spill_file.seek(0, 2)
+        offset = self._spill_file.tell()
+        pickler = _SpillPickler(self._spill_file)
+        try:
+            pickler.dump(self._history[0])
+        except Exception as error:
+            # Иначе каждая следующая команда снова упиралась бы в эту
+            self._history.popleft()
+            self._drop_spilled()
+            warnings.warn(
+                f"Команда не выгружена ({error!r}); более старые команды "
+                f"больше не отменить",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+            return
+        self._history.popleft()
+        self._spill_offsets.append(offset)
+        self._spill_refs.append(list(pickler.objects))
+        for key, obj in pickler.objects.items():
+            self._live_objects[key] = obj
+            self._live_counts[key] = self._live_counts.get(key, 0) + 1
+
+    def _pop(self) -> Optional[Command]:
+        if self._history:
+            return self._history.pop()
+        if not self._spill_offsets:
+            return None
+        offset = self._spill_offsets.pop()
+        self._spill_file.seek(offset)
+        command = _SpillUnpickler(self._spill_file, self._live_objects).load()
+        self._spill_file.truncate(offset)
+        # Поднятая команда сама держит свои объекты
+        for key in self._spill_refs.pop():
+            self._live_counts[key] -= 1
+            if not self._live_counts[key]:
+                del self._live_counts[key]
+                del self._live_objects[key]
+        return command
 
     def execute_command(self, command: Command):
+        if self._quiet:
+            command.quiet = True
+        self._make_room()
         command.execute()
         self._history.append(command)
+        self._redo.clear()
 
-    def undo_last(self):
-        if self._history:
-            command = self._history.pop()
-            command.undo()
+    def undo_last(self) -> bool:
+        command = self._pop()
+        if command is None:
+            return False
+        command.undo()
+        self._redo.append(command)
+        return True
+
+    def redo_last(self) -> bool:
+        if not self._redo:
+            return False
+        self._make_room()
+        command = self._redo.pop()
+        try:
+            command.execute()
+        except Exception:
+            self._redo.append(command)
+            raise
+        self._history.append(command)
+        return True
+
+    def _drop_spilled(self):
+        """Забыть все выгруженные команды"""
+        self._spill_file.truncate(0)
+        self._spill_offsets.clear()
+        self._spill_refs.clear()
+        self._live_objects.clear()
+        self._live_counts.clear()
+
+    def close(self):
+        """Закрыть файл выгрузки; выгруженные команды больше не отменить"""
+        if self._spill_file is not None:
+            self._drop_spilled()
+            self._spill_file.close()
+            self._spill_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
 # ==================== ЧАСТЬ 4: КОМБИНИРОВАННЫЕ ПАТТЕРНЫ ====================
@@ -883,7 +1557,241 @@ class EmployeeRepository:
         return False
 
     def find_by_specification(self, specification) -> List[AbstractEmployee]:
-        return [emp for emp in self._employees if specification.is_satisfied_by(emp)]
+        predicate = compile_predicate(specification)
+        return [emp for emp in self._employees if predicate(emp)]
+
+    def apply_changes(
+        self,
+        new: Iterable[AbstractEmployee] = (),
+        dirty: Iterable[AbstractEmployee] = (),
+        removed: Iterable[AbstractEmployee] = (),
+    ):
+        """Применяет пакет изменений за один проход по списку"""
+        removed_ids = {emp.id for emp in removed}
+        dirty_by_id = {emp.id: emp for emp in dirty}
+        if removed_ids or dirty_by_id:
+            self._employees = [
+                dirty_by_id.get(emp.id, emp)
+                for emp in self._employees
+                if emp.id not in removed_ids
+            ]
+        for employee in new:
+            self.add(employee)
+
+
+class SqliteEmployeeRepository:
+    """Репозиторий сотрудников поверх файловой базы SQLite.
+
+    Повторяет API EmployeeRepository, но данные переживают перезапуск,
+    а поиск по id, отделу и типу идет по B-tree индексам. Объекты
+    сохраняются снимком: после изменения сотрудника нужно вызвать update().
+    Хранятся только четыре типа сотрудников без подклассов. Стратегии
+    бонусов и наблюдатели не сохраняются, поэтому столбец salary - это
+    зарплата по сохраненным данным, как у загруженного объекта.
+    """
+
+    # SQL-тексты постоянны, поэтому sqlite3 переиспользует
+    # подготовленные выражения из кэша соединения
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS employees (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            department TEXT NOT NULL,
+            base_salary REAL NOT NULL,
+            salary REAL NOT NULL,
+            type TEXT NOT NULL,
+            data TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_employees_department ON employees(department)",
+        "CREATE INDEX IF NOT EXISTS idx_employees_type ON employees(type)",
+    )
+    _COLUMNS = "id, name, department, base_salary, salary, type, data"
+    _INSERT = f"INSERT INTO employees ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+    _UPDATE = (
+        "UPDATE employees SET name = ?, department = ?, base_salary = ?, "
+        "salary = ?, type = ?, data = ? WHERE id = ?"
+    )
+    _DELETE = "DELETE FROM employees WHERE id = ?"
+    _SELECT = f"SELECT {_COLUMNS} FROM employees"
+    _SELECT_ONE = f"{_SELECT} WHERE id = ?"
+    _NEXT_ID = "SELECT COALESCE(MAX(id), 0) + 1 FROM employees"
+
+    def __init__(self, path: str):
+        # Соединение общее для потоков, поэтому каждое обращение к нему
+        # (вместе с чтением результата) идет под блокировкой
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in self._SCHEMA:
+                self._connection.execute(statement)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._connection
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Преобразование объектов в строки таблицы и обратно
+    @classmethod
+    def _to_row(cls, employee: AbstractEmployee) -> tuple:
+        # Точный тип: подкласс не восстановить, он стал бы своим родителем
+        kind = type(employee)
+        if kind is Developer:
+            data = {"skills": employee.skills, "seniority": employee.seniority}
+        elif kind is Manager:
+            data = {"bonus": employee.bonus}
+        elif kind is Salesperson:
+            data = {
+                "commission_rate": employee.commission_rate,
+                "sales": employee.sales,
+            }
+        elif kind is Employee:
+            data = {}
+        else:
+            raise TypeError(f"Тип {kind.__name__} не поддерживается репозиторием")
+        row = (
+            employee.id,
+            employee.name,
+            employee.department,
+            employee.base_salary,
+            None,
+            kind.__name__,
+            json.dumps(data, ensure_ascii=False),
+        )
+        # Зарплата считается по тому, что будет загружено, без стратегии
+        # бонуса: иначе SQL и построчная проверка SalarySpecification
+        # расходились бы
+        salary = cls._from_row(row).calculate_salary()
+        return row[:4] + (salary,) + row[5:]
+
+    @staticmethod
+    def _from_row(row: tuple) -> AbstractEmployee:
+        id, name, department, base_salary, _, emp_type, raw = row
+        data = json.loads(raw)
+        if emp_type == "Developer":
+            return Developer(
+                id, name, department, base_salary, data["skills"], data["seniority"]
+            )
+        if emp_type == "Manager":
+            manager = Manager(id, name, department, base_salary)
+            manager.bonus = data["bonus"]
+            return manager
+        if emp_type == "Salesperson":
+            salesperson = Salesperson(
+                id, name, department, base_salary, data["commission_rate"]
+            )
+            if data["sales"] > 0:
+                salesperson.update_sales(data["sales"])
+            return salesperson
+        if emp_type == "Employee":
+            return Employee(id, name, department, base_salary)
+        raise ValueError(f"Неизвестный тип сотрудника в базе: {emp_type}")
+
+    # API репозитория
+    def add(self, employee: AbstractEmployee):
+        self.add_many([employee])
+
+    def add_many(self, employees: Iterable[AbstractEmployee]):
+        """Массовая вставка одной транзакцией через executemany"""
+        self.apply_changes(new=employees)
+
+    def apply_changes(
+        self,
+        new: Iterable[AbstractEmployee] = (),
+        dirty: Iterable[AbstractEmployee] = (),
+        removed: Iterable[AbstractEmployee] = (),
+    ):
+        """Удаление, обновление и вставка пакетами в одной транзакции.
+
+        При ошибке транзакция откатывается целиком.
+        """
+        new = list(new)
+        updates = []
+        for employee in dirty:
+            row = self._to_row(employee)
+            updates.append(row[1:] + row[:1])
+        deletes = [(employee.id,) for employee in removed]
+        with self._lock:
+            # Выдача ID и вставка под одной блокировкой и в одной транзакции:
+            # потоки не получат одинаковые номера, а при откате объекты
+            # не останутся с ID, которых нет в базе
+            assigned = []
+            try:
+                with self._connection:
+                    self._connection.executemany(self._DELETE, deletes)
+                    self._connection.executemany(self._UPDATE, updates)
+                    next_id = None
+                    inserts = []
+                    for employee in new:
+                        if employee.id == 0:
+                            if next_id is None:
+                                next_id = self._connection.execute(
+                                    self._NEXT_ID
+                                ).fetchone()[0]
+                            employee.id = next_id
+                            assigned.append(employee)
+                            next_id += 1
+                        inserts.append(self._to_row(employee))
+                    self._connection.executemany(self._INSERT, inserts)
+            except Exception:
+                for employee in assigned:
+                    employee.id = 0
+                raise
+
+    def _fetch(self, query: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    def get(self, employee_id: int) -> Optional[AbstractEmployee]:
+        rows = self._fetch(self._SELECT_ONE, (employee_id,))
+        return self._from_row(rows[0]) if rows else None
+
+    def get_all(self) -> List[AbstractEmployee]:
+        rows = self._fetch(f"{self._SELECT} ORDER BY id")
+        return [self._from_row(row) for row in rows]
+
+    def _write(self, query: str, params) -> int:
+        with self._lock, self._connection:
+            return self._connection.execute(query, params).rowcount
+
+    def update(self, employee: AbstractEmployee) -> bool:
+        row = self._to_row(employee)
+        return self._write(self._UPDATE, row[1:] + row[:1]) > 0
+
+    def delete(self, employee_id: int) -> bool:
+        return self._write(self._DELETE, (employee_id,)) > 0
+
+    def count(self) -> int:
+        return self._fetch("SELECT COUNT(*) FROM employees")[0][0]
+
+    def find_by_specification(self, specification) -> List[AbstractEmployee]:
+        """Фильтрация в SQL; неподдерживаемые условия проверяются построчно.
+
+        SalarySpecification сравнивается с зарплатой по сохраненным
+        данным, и в SQL, и при построчной проверке.
+        """
+        compiled = compile_to_sql(specification)
+        query = self._SELECT
+        if compiled.where:
+            query += f" WHERE {compiled.where}"
+        rows = self._fetch(f"{query} ORDER BY id", compiled.params)
+        employees = map(self._from_row, rows)
+        if compiled.residual is None:
+            return list(employees)
+        predicate = compile_predicate(compiled.residual)
+        return [emp for emp in employees if predicate(emp)]
 
 
 class DepartmentRepository:
@@ -901,39 +1809,105 @@ class DepartmentRepository:
 
 # 4.2. Unit of Work для управления транзакциями
 class UnitOfWork:
-    """Unit of Work для управления транзакциями"""
+    """Unit of Work для управления транзакциями.
+
+    Объекты отслеживаются по идентичности (id(obj)), поэтому регистрация
+    стоит O(1) и не зависит от __eq__. rollback() возвращает объекты
+    к снимку, снятому при первой регистрации: register_clean() до
+    изменения объекта либо register_dirty()/register_removed(), если
+    объект до этого не регистрировался. Поэтому объект, который может
+    понадобиться откатить, регистрируется до изменения:
+
+        uow.register_clean(employee)
+        employee.base_salary = 5500
+        uow.register_dirty(employee)
+
+    Объект, измененный до первой регистрации, откатить нельзя: его
+    снимок уже содержит изменения. commit() передает все изменения
+    репозиторию одним вызовом apply_changes().
+    """
+
+    def __init__(self, repository=None):
+        self._repository = repository
+        self._new_objects = {}
+        self._dirty_objects = {}
+        self._removed_objects = {}
+        self._snapshots = {}
+
+    @staticmethod
+    def _snapshot(obj) -> dict:
+        # Списки (навыки, наблюдатели) копируются, чтобы откат
+        # не зависел от изменений на месте
+        return {
+            key: value.copy() if isinstance(value, list) else value
+            for key, value in vars(obj).items()
+        }
 
-    def __init__(self):
-        self._new_objects = []
-        self._dirty_objects = []
-        self._removed_objects = []
+    def _remember(self, obj):
+        key = id(obj)
+        if key not in self._snapshots:
+            self._snapshots[key] = (obj, self._snapshot(obj))
 
     def register_new(self, obj):
-        self._new_objects.append(obj)
+        self._new_objects[id(obj)] = obj
+
+    def register_clean(self, obj):
+        """Запомнить состояние объекта до изменений; в commit() не попадает"""
+        self._remember(obj)
 
     def register_dirty(self, obj):
-        if obj not in self._dirty_objects:
-            self._dirty_objects.append(obj)
+        key = id(obj)
+        if key in self._new_objects or key in self._removed_objects:
+            return
+        self._remember(obj)
+        self._dirty_objects[key] = obj
 
     def register_removed(self, obj):
-        self._removed_objects.append(obj)
+        key = id(obj)
+        if self._new_objects.pop(key, None) is not None:
+            return
+        self._remember(obj)
+        self._dirty_objects.pop(key, None)
+        self._removed_objects[key] = obj
+
+    def _clear(self):
+        self._new_objects.clear()
+        self._dirty_objects.clear()
+        self._removed_objects.clear()
+        self._snapshots.clear()
 
     def commit(self):
-        # Здесь обычно происходит сохранение в БД
         print(
             f"Committing: {len(self._new_objects)} new, {len(self._dirty_objects)} dirty, {len(self._removed_objects)} removed"
         )
-
-        # В реальной системе здесь был бы код для сохранения
-        self._new_objects.clear()
-        self._dirty_objects.clear()
-        self._removed_objects.clear()
+        if self._repository is not None:
+            # Если репозиторий выбросит исключение, регистрации
+            # сохраняются и можно вызвать rollback()
+            self._repository.apply_changes(
+                new=list(self._new_objects.values()),
+                dirty=list(self._dirty_objects.values()),
+                removed=list(self._removed_objects.values()),
+            )
+        self._clear()
 
     def rollback(self):
         print("Rolling back all changes")
-        self._new_objects.clear()
-        self._dirty_objects.clear()
-        self._removed_objects.clear()
+        for obj, state in self._snapshots.values():
+            vars(obj).update(state)
+            # Состояние заменено в обход сеттеров: кэш зарплаты устарел
+            # и у самого объекта, и у декораторов вокруг него
+            if isinstance(obj, AbstractEmployee):
+                obj._invalidate_salary()
+        self._clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
 
 
 # 4.3. Specification Pattern для фильтрации
@@ -997,9 +1971,159 @@ class OrSpecification(Specification):
         )
 
 
+# 4.4. Компиляция спецификаций
+class CompiledSql(NamedTuple):
+    """Результат компиляции спецификации в SQL"""
+
+    where: Optional[str]  # Условие WHERE или None, если в SQL нечего перенести
+    params: List[Any]
+    residual: Optional[Specification]  # Часть, проверяемая построчно в Python
+
+
+def compile_to_sql(specification: Specification) -> CompiledSql:
+    """Перевести дерево спецификаций в параметризованное условие WHERE.
+
+    Подклассы встроенных спецификаций остаются для построчной проверки.
+    """
+    kind = type(specification)
+    if kind is SalarySpecification:
+        return CompiledSql("salary >= ?", [specification._min_salary], None)
+    if kind is DepartmentSpecification:
+        return CompiledSql("department = ?", [specification._department], None)
+    if kind is SkillSpecification:
+        return CompiledSql(
+            "(type = 'Developer' AND EXISTS "
+            "(SELECT 1 FROM json_each(data, '$.skills') WHERE value = ?))",
+            [specification._required_skill],
+            None,
+        )
+    if kind is AndSpecification:
+        left = compile_to_sql(specification._spec1)
+        right = compile_to_sql(specification._spec2)
+        parts = [part.where for part in (left, right) if part.where]
+        residuals = [part.residual for part in (left, right) if part.residual]
+        if len(residuals) == 2:
+            residual = AndSpecification(*residuals)
+        else:
+            residual = residuals[0] if residuals else None
+        return CompiledSql(
+            " AND ".join(parts) or None, left.params + right.params, residual
+        )
+    if kind is OrSpecification:
+        left = compile_to_sql(specification._spec1)
+        right = compile_to_sql(specification._spec2)
+        if left.residual is None and right.residual is None:
+            return CompiledSql(
+                f"({left.where} OR {right.where})", left.params + right.params, None
+            )
+    # Неизвестное условие целиком остается для построчной проверки
+    return CompiledSql(None, [], specification)
+
+
+def compile_predicate(
+    specification: Specification,
+) -> Callable[[AbstractEmployee], bool]:
+    """Собрать дерево спецификаций в одну функцию-предикат из замыканий.
+
+    Встроенные условия и связки разворачиваются в замыкания без вызовов
+    is_satisfied_by. Подклассы (они могли переопределить is_satisfied_by)
+    и прочие спецификации проверяются своим методом.
+    """
+    kind = type(specification)
+    if kind is SalarySpecification:
+        min_salary = specification._min_salary
+        return lambda e: e.calculate_salary() >= min_salary
+    if kind is DepartmentSpecification:
+        department = specification._department
+        return lambda e: e.department == department
+    if kind is SkillSpecification:
+        skill = specification._required_skill
+        return lambda e: isinstance(e, Developer) and skill in e.skills
+    if kind is AndSpecification:
+        left = compile_predicate(specification._spec1)
+        right = compile_predicate(specification._spec2)
+        return lambda e: left(e) and right(e)
+    if kind is OrSpecification:
+        left = compile_predicate(specification._spec1)
+        right = compile_predicate(specification._spec2)
+        return lambda e: left(e) or right(e)
+    return specification.is_satisfied_by
+
+
+def employee_columns(employees: List[AbstractEmployee]) -> Dict[str, Any]:
+    """Колонки для векторной фильтрации (требуется NumPy)"""
+    return {
+        "salary": np.fromiter(
+            (emp.calculate_salary() for emp in employees), float, len(employees)
+        ),
+        "department": np.array([emp.department for emp in employees], dtype=object),
+    }
+
+
+def _mask(specification: Specification, columns: Dict[str, Any], employees):
+    kind = type(specification)
+    if kind is SalarySpecification:
+        return columns["salary"] >= specification._min_salary
+    if kind is DepartmentSpecification:
+        return columns["department"] == specification._department
+    if kind is AndSpecification:
+        return _mask(specification._spec1, columns, employees) & _mask(
+            specification._spec2, columns, employees
+        )
+    if kind is OrSpecification:
+        return _mask(specification._spec1, columns, employees) | _mask(
+            specification._spec2, columns, employees
+        )
+    predicate = compile_predicate(specification)
+    return np.fromiter(map(predicate, employees), bool, len(employees))
+
+
+def specification_mask(
+    specification: Specification,
+    employees: List[AbstractEmployee],
+    columns: Optional[Dict[str, Any]] = None,
+):
+    """Маска соответствия спецификации для списка сотрудников.
+
+    С NumPy листья по зарплате и отделу считаются над колонками целиком,
+    остальные условия — построчно. Без NumPy возвращается список bool,
+    вычисленный одним скомпилированным предикатом.
+    """
+    if np is None:
+        predicate = compile_predicate(specification)
+        return [predicate(emp) for emp in employees]
+    if columns is None:
+        columns = employee_columns(employees)
+    return _mask(specification, columns, employees)
+
+
 # ==================== ЧАСТЬ 5: ТЕСТИРОВАНИЕ И ДЕМОНСТРАЦИЯ ====================
 
 
+def benchmark_salary_adapter(
+    count: int = 1000, latency: float = 0.005, batch_size: int = 100
+) -> Dict[str, float]:
+    """Время расчета count зарплат: по одному запросу против пакетов"""
+    employees = [
+        Employee(i, f"Emp{i}", "DEV", 1000 + i) for i in range(1, count + 1)
+    ]
+    system = SimulatedSalarySystem(latency=latency, per_item=latency / 100)
+    with SalaryAdapter(system, batch_size=batch_size) as adapter:
+        start = time.perf_counter()
+        sequential = [adapter.calculate_salary(emp) for emp in employees]
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = adapter.calculate_salaries(employees)
+        batched_time = time.perf_counter() - start
+    assert sequential == batched
+    return {
+        "sequential": sequential_time,
+        "batched": batched_time,
+        "speedup": sequential_time / batched_time,
+    }
+
+
 def demonstrate_patterns():
     print("=" * 70)
     print("ДЕМОНСТРАЦИЯ ПАТТЕРНОВ ПРОЕКТИРОВАНИЯ")
@@ -1007,10 +2131,13 @@ def demonstrate_patterns():
 
     # 1. Singleton
     print("\n1. SINGLETON (DatabaseConnection):")
+    storage = tempfile.TemporaryDirectory()
     db1 = DatabaseConnection()
     db2 = DatabaseConnection()
+    db1.open(os.path.join(storage.name, "employees.db"))
     print(f"   db1 is db2: {db1 is db2}")
     print(f"   Один и тот же экземпляр: {id(db1) == id(db2)}")
+    print(f"   Общий репозиторий: {db1.repository is db2.repository}")
 
     # 2. Abstract Factory
     print("\n2. ABSTRACT FACTORY (Создание разных компаний):")
@@ -1081,6 +2208,12 @@ def demonstrate_patterns():
     print(f"   Зарплата через адаптер: {salary_via_adapter}")
     print(f"   Зарплата обычным способом: {salary_normal}")
 
+    timing = benchmark_salary_adapter(count=200, latency=0.001)
+    print(
+        f"   200 зарплат: по одной {timing['sequential']:.3f} с, "
+        f"пакетами {timing['batched']:.3f} с ({timing['speedup']:.0f}x)"
+    )
+
     # 6. Decorator
     print("\n6. DECORATOR (Добавление функциональности):")
 
@@ -1127,6 +2260,14 @@ def demonstrate_patterns():
 
     print(f"   Уведомлений отправлено: {len(notification_system.get_notifications())}")
 
+    # Асинхронная доставка: изменение не ждет вывода уведомлений
+    with NotificationBus(sinks=[print_sink]) as bus:
+        developer.add_observer(bus)
+        developer.notify_observers("Salary review scheduled")
+        bus.flush()
+        developer.remove_observer(bus)
+    print(f"   Доставлено через шину: {len(bus.get_notifications())}")
+
     # 9. Strategy
     print("\n9. STRATEGY (Разные стратегии бонусов):")
 
@@ -1149,10 +2290,22 @@ def demonstrate_patterns():
     # Отмена найма
     invoker.undo_last()
 
+    # Индексация всех зарплат одной отменяемой операцией
+    raise_all = MacroCommand(
+        (
+            UpdateSalaryCommand(emp, emp.base_salary * 1.1)
+            for emp in tech_company.get_all_employees()
+        ),
+        name="Salary indexation",
+    )
+    invoker.execute_command(raise_all)
+    invoker.undo_last()
+
     # 11. Repository
     print("\n11. REPOSITORY (Работа с данными):")
 
-    employee_repo = EmployeeRepository()
+    # Файловая база SQLite, открытая в разделе Singleton
+    employee_repo = DatabaseConnection().repository
     employee_repo.add(developer)
     employee_repo.add(salesperson)
 
@@ -1163,8 +2316,9 @@ def demonstrate_patterns():
     # 12. Unit of Work
     print("\n12. UNIT OF WORK (Транзакции):")
 
-    uow = UnitOfWork()
-    uow.register_new(developer)
+    uow = UnitOfWork(employee_repo)
+    uow.register_new(developer2)
+    uow.register_clean(salesperson)
     uow.register_dirty(salesperson)
 
     print("   Перед коммитом: изменения зарегистрированы")
@@ -1187,6 +2341,8 @@ def demonstrate_patterns():
 
     for emp in matching_employees:
         print(f"     - {emp.name}: {emp.calculate_salary():.2f}")
+    DatabaseConnection().close_connection()
+    storage.cleanup()
 
     # 14. Итоговая демонстрация взаимодействия
     print("\n" + "=" * 70)
@@ -0,0 +1,146 @@
+import pytest
+from source_code import part3, binary_snapshot
+from source_code.binary_snapshot import (
+    dumps_company,
+    loads_company,
+    dumps_department,
+    loads_department,
+    save_company,
+    load_company,
+)
+from source_code.part4 import (
+    Employee,
+    Manager,
+    Developer,
+    Salesperson,
+    Department,
+    Project,
+    Company,
+    DuplicateIdError,
+)
+
+
+@pytest.fixture
+def company():
+    company = Company("ТехКорп")
+    dev = Department("Разработка", "DEV")
+    sales = Department("Продажи", "SALES")
+    company.add_department(dev)
+    company.add_department(sales)
+    dev.add_employee(Developer(1, "Алиса", "DEV", 5000, ["Python", "SQL"], "senior"))
+    dev.add_employee(Employee(2, "Bob", "DEV", 4000))
+    sales.add_employee(Manager(3, "Carol", "SALES", 6000, 1000))
+    sales.add_employee(Salesperson(4, "Dan", "SALES", 3000, 0.1, 25000))
+    company.add_project(Project(101, "AI", "Платформа", "2030-12-31", "active"))
+    company.add_project(Project(102, "CRM", "", "2029-06-01", "completed"))
+    company.assign_employees_to_project([1, 2], 101)
+    company.assign_employee_to_project(4, 102)
+    return company
+
+
+class TestCompanySnapshot:
+
+    def test_roundtrip(self, company):
+        restored = loads_company(dumps_company(company))
+        assert restored.to_dict() == company.to_dict()
+        assert restored.find_employee_by_id(4).calculate_salary() == 5500
+        assert [emp.id for emp in restored.find_project_by_id(101).get_team()] == [
+            1,
+            2,
+        ]
+
+    def test_indexes_are_rebuilt(self, company):
+        restored = loads_company(dumps_company(company))
+        dev = restored.find_department_by_code("DEV")
+        assert dev.calculate_total_salary() == 14000
+        assert dev.get_employee_count() == {"Developer": 1, "Employee": 1}
+        assert restored.find_employee_by_id(3).name == "Carol"
+        assert [p.project_id for p in restored.get_next_deadlines(5)] == [101]
+
+    def test_smaller_than_json(self, company, tmp_path):
+        company.save_to_json(str(tmp_path / "company.json"))
+        save_company(company, str(tmp_path / "company.emps"))
+        assert (tmp_path / "company.emps").stat().st_size < (
+            tmp_path / "company.json"
+        ).stat().st_size
+        restored = load_company(str(tmp_path / "company.emps"))
+        assert restored.to_dict() == company.to_dict()
+
+    def test_number_types_roundtrip(self, company):
+        restored = loads_company(dumps_company(company))
+        for original in company.get_all_employees():
+            restored_dict = restored.find_employee_by_id(original.id).to_dict()
+            for key, value in original.to_dict().items():
+                assert type(restored_dict[key]) is type(value), key
+
+    def test_rejects_subclasses(self, company):
+        class LeadDeveloper(Developer):
+            pass
+
+        company.find_department_by_code("DEV").add_employee(
+            LeadDeveloper(5, "Eve", "DEV", 7000, [], "senior")
+        )
+        with pytest.raises(TypeError, match="LeadDeveloper"):
+            dumps_company(company)
+
+    def test_empty_company(self):
+        restored = loads_company(dumps_company(Company("Пусто")))
+        assert restored.name == "Пусто"
+        assert restored.get_departments() == []
+
+    def test_rejects_foreign_data(self, company):
+        data = dumps_company(company)
+        with pytest.raises(ValueError):
+            loads_company(b"JSON" + data[4:])
+        with pytest.raises(ValueError):
+            loads_company(data[:-3])
+        with pytest.raises(ValueError):
+            loads_department(data)
+
+
+class TestDepartmentSnapshot:
+
+    def test_part3_roundtrip(self):
+        department = part3.Department("R&D")
+        department.add_employee(
+            part3.Developer(1, "Alice", "DEV", 5000, ["Go"], "junior")
+        )
+        department.add_employee(part3.Manager(2, "Bob", "MGMT", 6000, 500))
+        restored = loads_department(dumps_department(department))
+        assert restored.to_dict() == department.to_dict()
+
+    def test_long_tech_stack(self):
+        department = part3.Department("R&D")
+        stack = [f"skill{i}" for i in range(0x10000 + 5)]
+        department.add_employee(
+            part3.Developer(1, "Alice", "DEV", 5000, stack, "senior")
+        )
+        restored = loads_department(dumps_department(department))
+        assert restored.get_employees()[0].tech_stack == stack
+
+    def test_benchmark_company_roundtrip(self):
+        company = binary_snapshot._build_company(400)
+        assert loads_company(dumps_company(company)).to_dict() == company.to_dict()
+
+
+class TestDepartmentAddEmployees:
+
+    def test_batch_updates_aggregates(self):
+        department = Department("Разработка", "DEV")
+        department.add_employees(
+            [Employee(1, "Bob", "DEV", 4000), Manager(2, "Carol", "DEV", 6000, 1000)]
+        )
+        assert department.calculate_total_salary() == 11000
+        assert department.get_employee_count() == {"Employee": 1, "Manager": 1}
+
+    def test_conflict_adds_nobody(self):
+        company = Company("ТехКорп")
+        department = Department("Разработка", "DEV")
+        company.add_department(department)
+        department.add_employee(Employee(1, "Bob", "DEV", 4000))
+        with pytest.raises(DuplicateIdError):
+            department.add_employees(
+                [Employee(2, "Dan", "DEV", 1000), Employee(1, "Clone", "DEV", 1)]
+            )
+        assert company.find_employee_by_id(2) is None
+        assert len(department) == 1
@@ -0,0 +1,153 @@
+import os
+import time
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from source_code.changelog import ChangeLog, restore
+from source_code.part4 import (
+    Employee,
+    Manager,
+    Developer,
+    Department,
+    Project,
+    Company,
+    EmployeeInProjectError,
+)
+
+
+@pytest.fixture
+def company():
+    company = Company("TechCorp")
+    company.add_department(Department("Разработка", "DEV"))
+    company.add_department(Department("Продажи", "SALES"))
+    company.find_department_by_code("DEV").add_employee(
+        Employee(1, "Bob", "DEV", 4000)
+    )
+    return company
+
+
+def fill(log):
+    log.hire("DEV", Developer(2, "Alice", "DEV", 5000, ["Python"], "senior"))
+    log.hire("SALES", Manager(3, "Carol", "SALES", 6000, 1000))
+    log.add_project(Project(101, "AI", "Платформа", "2030-12-31"))
+    log.assign([1, 2], 101)
+    log.change_status(101, "active")
+    log.update_salary(1, 4500)
+    log.transfer(3, "DEV")
+    log.unassign([1], 101)
+    log.fire(1)
+
+
+class TestChangeLog:
+
+    def test_replay_matches_live_state(self, company, tmp_path):
+        with ChangeLog(str(tmp_path), company) as log:
+            fill(log)
+            expected = log.company.to_dict()
+            assert log.seq == 9
+        reopened = ChangeLog(str(tmp_path))
+        try:
+            assert reopened.company.to_dict() == expected
+            assert reopened.company.find_project_by_id(101).status == "active"
+            assert reopened.seq == 9
+        finally:
+            reopened.close()
+
+    def test_failed_operation_is_not_logged(self, company, tmp_path):
+        with ChangeLog(str(tmp_path), company) as log:
+            fill(log)
+            with pytest.raises(EmployeeInProjectError):
+                log.fire(2)
+            assert log.seq == 9
+        assert restore(str(tmp_path)).find_employee_by_id(2) is not None
+
+    def test_point_in_time(self, company, tmp_path):
+        with ChangeLog(str(tmp_path), company) as log:
+            log.update_salary(1, 4100)
+            middle = datetime.now()
+            time.sleep(0.001)  # Метки времени операций не совпадут с middle
+            log.update_salary(1, 4200)
+        first = restore(str(tmp_path), until=0)
+        assert first.find_employee_by_id(1).base_salary == 4000
+        second = restore(str(tmp_path), until=middle)
+        assert second.find_employee_by_id(1).base_salary == 4100
+
+    def test_group_commit_batches_fsync(self, company, tmp_path, monkeypatch):
+        calls = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(
+            os, "fsync", lambda fd: calls.append(fd) or real_fsync(fd)
+        )
+        with ChangeLog(str(tmp_path), company, group_size=4) as log:
+            calls.clear()
+            for salary in range(4000, 4010):
+                log.update_salary(1, salary)
+            assert len(calls) == 2
+        assert len(calls) == 3
+
+    def test_compaction(self, company, tmp_path):
+        with ChangeLog(str(tmp_path), company, compact_every=4) as log:
+            fill(log)
+            expected = log.company.to_dict()
+        names = sorted(os.listdir(tmp_path))
+        assert names == ["base-000000000008.json", "log-000000000008.jsonl"]
+        assert restore(str(tmp_path)).to_dict() == expected
+        with pytest.raises(ValueError):
+            restore(str(tmp_path), until=3)
+
+    def test_compacted_time_is_not_restored(self, company, tmp_path):
+        before = datetime.now()
+        time.sleep(0.01)  # Время записи снимка будет позже before
+        with ChangeLog(str(tmp_path), company) as log:
+            log.hire("SALES", Manager(3, "Carol", "SALES", 6000, 1000))
+            log.update_salary(3, 200)
+            log.compact()
+        with pytest.raises(ValueError):
+            restore(str(tmp_path), until=before)
+        latest = restore(str(tmp_path), until=datetime.now())
+        assert latest.find_employee_by_id(3).base_salary == 200
+
+    def test_unserializable_args_change_nothing(self, company, tmp_path):
+        with ChangeLog(str(tmp_path), company) as log:
+            with pytest.raises(TypeError):
+                log.update_salary(1, Decimal("4100"))
+            assert log.seq == 0
+            assert log.company.find_employee_by_id(1).base_salary == 4000
+        assert restore(str(tmp_path)).to_dict() == company.to_dict()
+
+    def test_closed_log_rejects_writes(self, company, tmp_path):
+        log = ChangeLog(str(tmp_path), company)
+        log.update_salary(1, 4100)
+        log.close()
+        with pytest.raises(RuntimeError):
+            log.compact()
+        with pytest.raises(RuntimeError):
+            log.update_salary(1, 4200)
+        assert sorted(os.listdir(tmp_path)) == [
+            "base-000000000000.json",
+            "log-000000000000.jsonl",
+        ]
+
+    def test_history_is_kept_on_request(self, company, tmp_path):
+        directory = str(tmp_path)
+        with ChangeLog(directory, company, compact_every=4, keep_history=True) as log:
+            fill(log)
+        assert restore(directory, until=5).find_employee_by_id(1).base_salary == 4000
+        assert restore(directory, until=6).find_employee_by_id(1).base_salary == 4500
+
+    def test_torn_tail_is_discarded(self, company, tmp_path):
+        with ChangeLog(str(tmp_path), company) as log:
+            log.update_salary(1, 4100)
+        with open(tmp_path / "log-000000000000.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"seq": 2, "ts": "20')
+        with ChangeLog(str(tmp_path)) as log:
+            assert log.company.find_employee_by_id(1).base_salary == 4100
+            log.update_salary(1, 4300)
+        assert restore(str(tmp_path)).find_employee_by_id(1).base_salary == 4300
+
+    def test_directory_rules(self, company, tmp_path):
+        with pytest.raises(ValueError):
+            ChangeLog(str(tmp_path))
+        ChangeLog(str(tmp_path), company).close()
+        with pytest.raises(ValueError):
+            ChangeLog(str(tmp_path), company)
@@ -0,0 +1,84 @@
+import pytest
+from source_code import employee_table
+from source_code.employee_table import EmployeeTable
+from source_code.part4 import (
+    AbstractEmployee,
+    Employee,
+    Manager,
+    Developer,
+    Salesperson,
+    Department,
+)
+
+
+@pytest.fixture(params=["numpy", "array"])
+def table(request, monkeypatch):
+    if request.param == "array":
+        monkeypatch.setattr(employee_table, "np", None)
+    elif employee_table.np is None:
+        pytest.skip("NumPy не установлен")
+    return EmployeeTable.from_employees(
+        [
+            Employee(1, "Alice", "IT", 100.0),
+            Manager(2, "Bob", "MGMT", 200.0, 50.0),
+            Developer(3, "Carol", "IT", 100.0, ["Python"], "senior"),
+            Salesperson(4, "Dan", "SALES", 100.0, 0.1, 1000.0),
+        ]
+    )
+
+
+class TestEmployeeTable:
+
+    def test_payroll(self, table):
+        assert list(table.payroll()) == [100.0, 250.0, 200.0, 200.0]
+        assert table.total_payroll() == 750.0
+
+    def test_department_totals(self, table):
+        assert table.department_totals() == {"IT": 300.0, "MGMT": 250.0, "SALES": 200.0}
+
+    def test_salary_histogram(self, table):
+        counts, edges = table.salary_histogram(bins=2)
+        assert counts == [1, 3]
+        assert edges == [100.0, 175.0, 250.0]
+
+    def test_row_views_behave_like_employees(self, table):
+        dev = table.get(3)
+        assert isinstance(dev, Developer)
+        assert isinstance(dev, AbstractEmployee)
+        assert dev.__class__.__name__ == "Developer"
+        assert dev.calculate_salary() == 200.0
+        assert list(dev) == ["Python"]
+        assert dev.to_dict()["seniority_level"] == "senior"
+
+    def test_row_setters_write_columns(self, table):
+        table.get(3).seniority_level = "middle"
+        table.get(4).update_sales(500.0)
+        with pytest.raises(ValueError):
+            table.get(2).bonus = -1
+        assert list(table.payroll()) == [100.0, 250.0, 150.0, 250.0]
+
+    def test_views_in_department(self, table):
+        dept = Department("IT", "IT")
+        for row in table:
+            dept.add_employee(row)
+        table.get(1).base_salary = 300.0
+        assert dept.calculate_total_salary() == table.total_payroll()
+        with pytest.raises(ValueError):
+            table.get(1).id = 10
+        assert dept.find_employee_by_id(1) is not None
+
+    def test_attached_row_is_not_removed(self, table):
+        dept = Department("IT", "IT")
+        dept.add_employee(table.get(2))
+        with pytest.raises(ValueError):
+            table.remove(2)
+        assert dept.get_employees()[0].name == table.get(2).name
+        dept.remove_employee(2)
+        table.remove(2)
+        assert table.get(2) is None
+
+    def test_remove_moves_last_row(self, table):
+        table.remove(2)
+        assert [row.id for row in table] == [1, 4, 3]
+        assert table.get(4).sales_volume == 1000.0
+        assert table.get(2) is None
@@ -0,0 +1,133 @@
+import copy
+import pickle
+import pytest
+from source_code.binary_snapshot import load_company, save_company
+from source_code.mapped_roster import MappedRoster, LazyEmployee
+from source_code.part4 import (
+    Employee,
+    Manager,
+    Developer,
+    Salesperson,
+    Department,
+    Project,
+    Company,
+)
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    company = Company("ТехКорп")
+    dev = Department("Разработка", "DEV")
+    sales = Department("Продажи", "SALES")
+    company.add_department(dev)
+    company.add_department(sales)
+    dev.add_employee(Developer(1, "Алиса", "DEV", 5000, ["Python", "SQL"], "senior"))
+    sales.add_employee(Manager(2, "Carol", "SALES", 6000, 1000))
+    dev.add_employee(Employee(3, "Bob", "DEV", 4000))
+    sales.add_employee(Salesperson(4, "Dan", "SALES", 3000, 0.1, 25000))
+    path = str(tmp_path / "company.emps")
+    save_company(company, path)
+    return company, path
+
+
+@pytest.fixture
+def roster(snapshot):
+    with MappedRoster(snapshot[1]) as roster:
+        yield roster
+
+
+class TestMappedRoster:
+
+    def test_departments_keep_order(self, roster):
+        dev = roster.find_department_by_code("DEV")
+        assert roster.company_name == "ТехКорп"
+        assert [d.name for d in roster.get_departments()] == ["Разработка", "Продажи"]
+        assert [emp.id for emp in dev] == [1, 3]
+        assert dev[-1].name == "Bob"
+        assert [emp.id for emp in roster] == [1, 3, 2, 4]
+        assert len(roster) == 4
+
+    def test_record_fields_do_not_materialize(self, roster):
+        emp = roster.find_employee_by_id(1)
+        assert (emp.id, emp.name, emp.department, emp.base_salary) == (
+            1,
+            "Алиса",
+            "DEV",
+            5000,
+        )
+        assert emp.employee_type == "Developer"
+        assert type(emp.base_salary) is int
+        assert not emp.is_materialized
+        assert roster.materialized_count == 0
+
+    def test_methods_build_full_object(self, snapshot, roster):
+        company, _ = snapshot
+        for original in company.get_all_employees():
+            emp = roster.find_employee_by_id(original.id)
+            assert emp.calculate_salary() == original.calculate_salary()
+            assert emp.to_dict() == original.to_dict()
+        assert roster.materialized_count == 4
+
+    def test_mutation_is_shared_between_proxies(self, roster):
+        dev = roster.find_department_by_code("DEV")
+        dev[1].base_salary = 4500
+        assert roster.find_employee_by_id(3).base_salary == 4500
+        assert dev.find_employee_by_id(3).calculate_salary() == 4500
+        assert roster.materialized_count == 1
+
+    def test_find_is_scoped_to_department(self, roster):
+        sales = roster.find_department_by_code("SALES")
+        assert sales.find_employee_by_id(1) is None
+        assert roster.find_employee_by_id(1) not in sales
+        assert roster.find_employee_by_id(99) is None
+
+    def test_pickle_reopens_file(self, roster):
+        clone = pickle.loads(pickle.dumps(roster))
+        try:
+            assert isinstance(clone.find_employee_by_id(4), LazyEmployee)
+            assert clone.find_employee_by_id(4).calculate_salary() == 5500
+        finally:
+            clone.close()
+
+    def test_copy_and_pickle_proxy(self, roster):
+        emp = roster.find_employee_by_id(3)
+        emp.base_salary = 4500
+        twin = copy.copy(emp)
+        assert twin == emp and twin.base_salary == 4500
+        with pytest.raises(AttributeError):
+            twin._missing
+        clone = pickle.loads(pickle.dumps(emp))
+        try:
+            assert isinstance(clone, LazyEmployee)
+            assert clone.base_salary == 4000  # Из файла, без изменений в памяти
+            assert clone.calculate_salary() == 4000
+        finally:
+            clone._roster.close()
+
+    def test_assignments_match_full_load(self, snapshot):
+        company, path = snapshot
+        company.add_project(Project(10, "AI", "Платформа", "2030-12-31", "active"))
+        company.assign_employees_to_project([3, 1], 10)
+        save_company(company, path)
+        loaded = load_company(path)
+        with MappedRoster(path) as roster:
+            bob = roster.find_employee_by_id(3)
+            assert bob.to_dict() == loaded.find_employee_by_id(3).to_dict()
+            assert bob.get_project_count() == 1
+            project = bob.assigned_projects[0]
+            assert [emp.id for emp in project.get_team()] == [3, 1]
+            assert project.calculate_total_salary() == 14000
+            assert roster.materialized_count == 2
+
+    def test_close_keeps_built_objects(self, snapshot):
+        roster = MappedRoster(snapshot[1])
+        emp = roster.find_employee_by_id(2).materialize()
+        roster.close()
+        roster.close()
+        assert emp.calculate_salary() == 7000
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "company.json"
+        path.write_bytes(b"{}" * 8)
+        with pytest.raises(ValueError):
+            MappedRoster(str(path))
@@ -0,0 +1,472 @@
+import io
+import json
+import os
+import pytest
+from datetime import date
+from source_code import part4
+from source_code.part4 import (
+    Employee,
+    Manager,
+    Developer,
+    Department,
+    Project,
+    Company,
+    DuplicateIdError,
+    EmployeeFactory,
+    iter_company_json,
+    iter_company_json_records,
+)
+
+
+@pytest.fixture
+def company():
+    company = Company("TechCorp")
+    dev = Department("Разработка", "DEV")
+    sales = Department("Продажи", "SALES")
+    company.add_department(dev)
+    company.add_department(sales)
+    dev.add_employee(Developer(1, "Alice", "DEV", 5000, ["Python"], "senior"))
+    dev.add_employee(Employee(2, "Bob", "DEV", 4000))
+    sales.add_employee(Manager(3, "Carol", "SALES", 6000, 1000))
+    company.add_project(Project(101, "AI", "Платформа", "2030-12-31", "active"))
+    return company
+
+
+class TestCompanyIndexes:
+
+    def test_find_by_id_and_code(self, company):
+        assert company.find_employee_by_id(3).name == "Carol"
+        assert company.find_project_by_id(101).name == "AI"
+        assert company.find_department_by_code("SALES").name == "Продажи"
+        assert company.find_employee_by_id(999) is None
+
+    def test_index_follows_department_changes(self, company):
+        dev = company.find_department_by_code("DEV")
+        dev.add_employee(Employee(4, "Dan", "DEV", 3000))
+        assert company.find_employee_by_id(4).name == "Dan"
+        dev.remove_employee(4)
+        assert company.find_employee_by_id(4) is None
+
+    def test_transfer_keeps_index(self, company):
+        dev = company.find_department_by_code("DEV")
+        sales = company.find_department_by_code("SALES")
+        dev.transfer_employee(2, sales)
+        assert company.find_employee_by_id(2) is sales.find_employee_by_id(2)
+        assert dev.find_employee_by_id(2) is None
+
+    def test_duplicate_employee_id_rejected(self, company):
+        sales = company.find_department_by_code("SALES")
+        with pytest.raises(DuplicateIdError):
+            sales.add_employee(Employee(1, "Clone", "SALES", 1000))
+        assert company.find_employee_by_id(1).name == "Alice"
+
+    def test_attached_id_is_frozen(self, company):
+        dev = company.find_department_by_code("DEV")
+        bob = company.find_employee_by_id(2)
+        bob.id = 2
+        with pytest.raises(ValueError):
+            bob.id = 7
+        assert company.find_employee_by_id(2) is bob
+        dev.remove_employee(2)
+        bob.id = 7
+        project = company.find_project_by_id(101)
+        project.add_team_member(bob)
+        with pytest.raises(ValueError):
+            bob.id = 8
+        assert project.get_team() == [bob]
+
+    def test_assign_employee_to_project(self, company):
+        assert company.assign_employee_to_project(1, 101)
+        assert not company.assign_employee_to_project(1, 101)
+        assert company.find_project_by_id(101).get_team_size() == 1
+
+
+class TestCompanyJsonStreaming:
+
+    def test_writer_matches_json_dump(self, company):
+        company.assign_employee_to_project(1, 101)
+        company.add_department(Department("Пустой", "EMPTY"))
+        expected = json.dumps(company.to_dict(), ensure_ascii=False, indent=2)
+        assert "".join(iter_company_json(company)) == expected
+
+    def test_reader_yields_records_in_order(self, company):
+        text = json.dumps(company.to_dict(), ensure_ascii=False, indent=2)
+        kinds = [kind for kind, _ in iter_company_json_records(io.StringIO(text))]
+        assert kinds == [
+            "company",
+            "department",
+            "employee",
+            "employee",
+            "department",
+            "employee",
+            "project",
+        ]
+
+    def test_roundtrip_with_small_chunks(self, company, tmp_path, monkeypatch):
+        monkeypatch.setattr(part4._JsonStreamReader, "CHUNK_SIZE", 5)
+        company.assign_employee_to_project(3, 101)
+        path = tmp_path / "company.json"
+        company.save_to_json(str(path))
+        loaded = Company.load_from_json(str(path))
+        assert loaded.to_dict() == company.to_dict()
+        assert loaded.find_employee_by_id(3).get_project_count() == 1
+
+
+    def test_key_order_does_not_matter(self, company, tmp_path):
+        company.assign_employee_to_project(3, 101)
+        data = company.to_dict()
+        path = tmp_path / "company.json"
+        reordered = {key: data[key] for key in ("projects", "departments", "name")}
+        path.write_text(json.dumps(reordered, ensure_ascii=False), encoding="utf-8")
+        loaded = Company.load_from_json(str(path))
+        assert loaded.to_dict() == data
+        assert loaded.find_employee_by_id(3).get_project_count() == 1
+
+    def test_missing_name_is_format_error(self, company):
+        data = company.to_dict()
+        del data["name"]
+        with pytest.raises(ValueError, match="name"):
+            list(iter_company_json_records(io.StringIO(json.dumps(data))))
+
+class TestPayrollAggregates:
+
+    def test_department_totals(self, company):
+        dev = company.find_department_by_code("DEV")
+        assert dev.calculate_total_salary() == 14000
+        assert dev.get_employee_count() == {"Developer": 1, "Employee": 1}
+        assert company.calculate_total_monthly_cost() == 21000
+        assert company.get_employee_total() == 3
+
+    def test_setters_update_aggregates(self, company):
+        dev = company.find_department_by_code("DEV")
+        sales = company.find_department_by_code("SALES")
+        company.find_employee_by_id(1).seniority_level = "junior"
+        company.find_employee_by_id(2).base_salary = 4500
+        company.find_employee_by_id(3).bonus = 2000
+        assert dev.calculate_total_salary() == 9500
+        assert sales.calculate_total_salary() == 8000
+        assert company.get_department_stats()["SALES"]["avg_salary"] == 8000
+
+    def test_transfer_moves_aggregates(self, company):
+        dev = company.find_department_by_code("DEV")
+        sales = company.find_department_by_code("SALES")
+        dev.transfer_employee(1, sales)
+        assert dev.calculate_total_salary() == 4000
+        assert sales.calculate_total_salary() == 17000
+        assert sales.get_employee_count() == {"Manager": 1, "Developer": 1}
+
+    def test_project_budget_follows_salary(self, company):
+        project = company.find_project_by_id(101)
+        company.assign_employee_to_project(2, 101)
+        company.find_employee_by_id(2).base_salary = 5000
+        assert project.calculate_total_salary() == 5000
+        project.remove_team_member(2)
+        assert project.calculate_total_salary() == 0
+
+
+class TestSalaryCache:
+
+    def test_repeated_reports_hit_cache(self, company):
+        company.calculate_total_monthly_cost()
+        part4.reset_salary_cache_stats()
+        dev = company.find_department_by_code("DEV")
+        employees = dev.get_employees()
+        for _ in range(3):
+            sorted(employees)
+        stats = part4.salary_cache_stats()
+        assert stats["misses"] == 0
+        assert stats["hits"] > 0
+
+    @pytest.mark.parametrize(
+        "attribute, value, expected",
+        [
+            ("base_salary", 6000, 12000),
+            ("seniority_level", "middle", 7500),
+        ],
+    )
+    def test_setter_invalidates(self, company, attribute, value, expected):
+        dev = company.find_employee_by_id(1)
+        assert dev.calculate_salary() == 10000
+        setattr(dev, attribute, value)
+        assert dev.calculate_salary() == expected
+
+    def test_salesperson_invalidation(self):
+        seller = part4.Salesperson(5, "Eve", "SALES", 1000, 0.1, 0)
+        assert seller.calculate_salary() == 1000
+        seller.update_sales(5000)
+        assert seller.calculate_salary() == 1500
+        seller.commission_rate = 0.2
+        assert seller.calculate_salary() == 2000
+
+    def test_failed_setter_keeps_cache(self, company):
+        manager = company.find_employee_by_id(3)
+        manager.calculate_salary()
+        part4.reset_salary_cache_stats()
+        with pytest.raises(ValueError):
+            manager.bonus = -1
+        assert manager.calculate_salary() == 7000
+        assert part4.salary_cache_stats()["misses"] == 0
+
+
+class TestDeadlineIndex:
+
+    TODAY = date(2030, 6, 10)
+
+    @pytest.fixture
+    def company(self, company):
+        for project_id, deadline, status in [
+            (102, "2030-06-01", "active"),
+            (103, "2030-06-10", "planning"),
+            (104, "2030-06-12", "active"),
+            (105, "2030-06-20", "active"),
+            (106, "2030-06-05", "completed"),
+        ]:
+            company.add_project(Project(project_id, "P", "", deadline, status))
+        return company
+
+    @staticmethod
+    def ids(projects):
+        return [proj.project_id for proj in projects]
+
+    def test_deadline_is_ordinal(self, company):
+        project = company.find_project_by_id(104)
+        assert project.deadline_ordinal == date(2030, 6, 12).toordinal()
+        assert project.deadline.strftime("%Y-%m-%d") == "2030-06-12"
+        assert project.to_dict()["deadline"] == "2030-06-12"
+        assert project.days_until_deadline(self.TODAY) == 1
+        assert not project.is_overdue(self.TODAY)
+
+    def test_queries_match_scan(self, company):
+        overdue = [
+            proj
+            for proj in company.get_projects()
+            if proj.status in Company.OPEN_STATUSES and proj.is_overdue(self.TODAY)
+        ]
+        assert self.ids(company.get_overdue_projects(self.TODAY)) == [102, 103]
+        assert set(self.ids(overdue)) == {102, 103}
+        assert self.ids(company.get_projects_due_within(9, self.TODAY)) == [104, 105]
+        assert self.ids(company.get_projects_due_within(8, self.TODAY)) == [104]
+        assert self.ids(company.get_next_deadlines(2, self.TODAY)) == [104, 105]
+
+    def test_status_change_moves_project(self, company):
+        company.find_project_by_id(102).change_status("completed")
+        company.find_project_by_id(106).change_status("active")
+        assert self.ids(company.get_overdue_projects(self.TODAY)) == [106, 103]
+        assert self.ids(
+            company.get_overdue_projects(self.TODAY, statuses=("completed",))
+        ) == [102]
+
+    def test_removed_project_leaves_index(self, company):
+        company.remove_project(103)
+        assert self.ids(company.get_overdue_projects(self.TODAY)) == [102]
+        analysis = company.get_project_budget_analysis(self.TODAY)
+        assert analysis["overdue_projects"] == 1
+
+    def test_id_change_rekeys_index(self, company):
+        project = company.find_project_by_id(102)
+        project.project_id = 10
+        assert company.find_project_by_id(10) is project
+        assert company.find_project_by_id(102) is None
+        assert self.ids(company.get_overdue_projects(self.TODAY)) == [10, 103]
+        with pytest.raises(part4.DuplicateIdError):
+            project.project_id = 103
+        assert project.project_id == 10
+        company.remove_project(10)
+        assert self.ids(company.get_overdue_projects(self.TODAY)) == [103]
+
+
+class TestAssignments:
+
+    @pytest.fixture
+    def company(self, company):
+        for project_id in (102, 103):
+            company.add_project(Project(project_id, "P", "", "2030-12-31"))
+        return company
+
+    def test_bulk_assign_is_all_or_nothing(self, company):
+        project = company.find_project_by_id(101)
+        assert company.assign_employees_to_project([1, 2], 101)
+        assert not company.assign_employees_to_project([3, 2], 101)
+        assert [emp.id for emp in project.get_team()] == [1, 2]
+        assert project.has_member(2) and not project.has_member(3)
+        assert project.calculate_total_salary() == 14000
+
+    def test_bulk_unassign(self, company):
+        company.assign_employees_to_project([1, 2, 3], 101)
+        with pytest.raises(part4.EmployeeNotFoundError):
+            company.unassign_employees_from_project([1, 99], 101)
+        company.unassign_employees_from_project([1, 3], 101)
+        project = company.find_project_by_id(101)
+        assert [emp.id for emp in project.get_team()] == [2]
+        assert company.find_employee_by_id(1).get_project_count() == 0
+
+    def test_project_id_change_keeps_assignments(self, company):
+        project = company.find_project_by_id(101)
+        company.assign_employee_to_project(2, 101)
+        project.project_id = 11
+        bob = company.find_employee_by_id(2)
+        assert bob.to_dict()["assigned_project_ids"] == [11]
+        project.remove_team_member(2)
+        assert bob.get_project_count() == 0
+        company.find_department_by_code("DEV").remove_employee(2)
+        assert company.find_employee_by_id(2) is None
+
+    def test_overloaded_index(self, company):
+        for project_id in (101, 102, 103):
+            company.assign_employee_to_project(1, project_id)
+        alice = company.find_employee_by_id(1)
+        assert company.find_overloaded_employees() == [alice]
+        company.add_project(Project(104, "P", "", "2030-12-31"))
+        assert not company.assign_employee_to_project(1, 104)
+        company.find_project_by_id(102).remove_team_member(1)
+        assert company.find_overloaded_employees() == []
+        assert alice.is_available()
+
+    def test_overloaded_in_department_order(self, company):
+        for project_id in (101, 102, 103):
+            for employee_id in (3, 2, 1):
+                company.assign_employee_to_project(employee_id, project_id)
+        assert [emp.id for emp in company.find_overloaded_employees()] == [1, 2, 3]
+
+    def test_overloaded_follows_transfer_and_projects_outside_company(self, company):
+        alice = company.find_employee_by_id(1)
+        side_project = Project(200, "Side", "", "2030-12-31")
+        for project_id in (101, 102):
+            company.assign_employee_to_project(1, project_id)
+        side_project.add_team_member(alice)
+        assert company.find_overloaded_employees() == [alice]
+        dev = company.find_department_by_code("DEV")
+        dev.transfer_employee(1, company.find_department_by_code("SALES"))
+        assert company.find_overloaded_employees() == [alice]
+        side_project.remove_team_member(1)
+        assert company.find_overloaded_employees() == []
+
+
+class TestExportAll:
+
+    def test_matches_serial_exports(self, company, tmp_path):
+        company.assign_employees_to_project([1, 3], 101)
+        company.export_employees_csv(str(tmp_path / "employees.csv"))
+        company.export_projects_csv(str(tmp_path / "projects.csv"))
+        company.export_financial_report(str(tmp_path / "financial.txt"))
+        paths = company.export_all(str(tmp_path / "out"))
+        for key, serial in [
+            ("employees", "employees.csv"),
+            ("projects", "projects.csv"),
+            ("financial", "financial.txt"),
+        ]:
+            with open(paths[key], encoding="utf-8") as parallel:
+                assert parallel.read() == (tmp_path / serial).read_text("utf-8")
+
+    def test_department_shards(self, company, tmp_path):
+        paths = company.export_all(str(tmp_path))
+        with open(paths["employees_SALES"], encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 2
+        assert lines[1].startswith("3,Carol,SALES,Manager")
+
+    def test_shard_names_stay_inside(self, company, tmp_path):
+        for name, code in [("Отчеты", "report"), ("Взлом", "../x"), ("Копия", ".._x")]:
+            company.add_department(Department(name, code))
+        out = tmp_path / "out"
+        paths = company.export_all(str(out))
+        assert paths["employees"] == str(out / "employees_report.csv")
+        assert paths["employees_report"] == str(out / "departments" / "report.csv")
+        assert paths["employees_../x"] == str(out / "departments" / "___x.csv")
+        assert paths["employees_.._x"] == str(out / "departments" / "___x_2.csv")
+        assert sorted(os.listdir(tmp_path)) == ["out"]
+        assert len(os.listdir(out / "departments")) == 5
+
+
+class TestCreateMany:
+
+    @staticmethod
+    def records():
+        return [
+            {
+                "type": "developer",
+                "id": "1",
+                "name": "Alice",
+                "department": "DEV",
+                "base_salary": "5000",
+                "tech_stack": ("Python",),
+                "seniority_level": "senior",
+            },
+            {
+                "type": "Manager",
+                "id": 2,
+                "name": "Carol",
+                "department": "SALES",
+                "base_salary": 6000,
+                "bonus": "1000",
+            },
+            {
+                "type": "employee",
+                "id": 3,
+                "name": "Bob",
+                "department": "DEV",
+                "base_salary": 4000,
+            },
+        ]
+
+    def test_matches_single_construction(self):
+        created = EmployeeFactory.create_many(self.records())
+        single = EmployeeFactory.create_employee(
+            "developer",
+            id=1,
+            name="Alice",
+            department="DEV",
+            base_salary=5000.0,
+            tech_stack=["Python"],
+            seniority_level="senior",
+        )
+        assert [type(emp) for emp in created] == [Developer, Manager, Employee]
+        assert created[0].to_dict() == single.to_dict()
+        assert created[1].calculate_salary() == 7000
+
+    def test_accepts_to_dict_output(self, company):
+        records = [emp.to_dict() for emp in company.get_all_employees()]
+        created = EmployeeFactory.create_many(records)
+        assert [emp.to_dict() for emp in created] == [
+            dict(record, assigned_project_ids=[]) for record in records
+        ]
+
+    @pytest.mark.parametrize(
+        "field, value, message",
+        [
+            ("id", 0, "Запись 2: ID"),
+            ("name", "", "Запись 2: Имя"),
+            ("base_salary", -1, "Запись 2: Зарплата"),
+            ("base_salary", "много", "Запись 2: некорректное поле base_salary"),
+            ("type", "intern", "Запись 2: неизвестный тип"),
+        ],
+    )
+    def test_reports_bad_record(self, field, value, message):
+        records = self.records()
+        records[2][field] = value
+        with pytest.raises(ValueError, match=message):
+            EmployeeFactory.create_many(records)
+
+    def test_type_specific_checks(self):
+        records = self.records()
+        records[0]["seniority_level"] = "lead"
+        with pytest.raises(ValueError, match="Запись 0: Уровень"):
+            EmployeeFactory.create_many(records)
+        records = self.records()
+        del records[1]["bonus"]
+        with pytest.raises(ValueError, match="Запись 1: нет поля bonus"):
+            EmployeeFactory.create_many(records)
+
+    def test_tech_stack_defaults_and_type(self):
+        records = self.records()
+        del records[0]["tech_stack"]
+        assert EmployeeFactory.create_many(records)[0].tech_stack == []
+        records[0]["tech_stack"] = "Python"
+        with pytest.raises(ValueError, match="Запись 0: Стек"):
+            EmployeeFactory.create_many(records)
+
+    def test_duplicate_ids(self):
+        records = self.records()
+        records[2]["id"] = 1
+        with pytest.raises(DuplicateIdError):
+            EmployeeFactory.create_many(records)
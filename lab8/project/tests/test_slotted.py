@@ -0,0 +1,47 @@
+import pytest
+from source_code import part4, slotted
+
+
+class TestSlottedEmployees:
+
+    def test_no_instance_dict(self):
+        dev = slotted.Developer(1, "Alice", "DEV", 5000, ["Python"], "senior")
+        assert not hasattr(dev, "__dict__")
+        with pytest.raises(AttributeError):
+            dev.extra = 1
+
+    def test_same_salary_and_serialization(self):
+        args = (3, "Carol", "SALES", 4000, 0.1, 100000)
+        compact = slotted.Salesperson(*args)
+        regular = part4.Salesperson(*args)
+        assert compact.calculate_salary() == regular.calculate_salary()
+        assert compact.to_dict() == regular.to_dict()
+        assert compact.get_info() == regular.get_info()
+
+    def test_validation(self):
+        mgr = slotted.Manager(2, "Bob", "MGMT", 5000, 1000)
+        with pytest.raises(ValueError):
+            mgr.bonus = -1
+        with pytest.raises(ValueError):
+            mgr.id = 0
+
+    def test_department_interned(self):
+        code = "".join(["D", "E", "V"])
+        emp = slotted.Employee(1, "Alice", code, 5000)
+        assert emp.department is slotted.Employee(2, "Bob", "DEV", 100).department
+
+    def test_works_with_part4_containers(self):
+        company = part4.Company("TechCorp")
+        dept = part4.Department("Разработка", "DEV")
+        company.add_department(dept)
+        dev = slotted.Developer(1, "Alice", "DEV", 5000, ["Python"], "junior")
+        dept.add_employee(dev)
+        project = part4.Project(1, "AI", "Платформа", "2030-12-31")
+        project.add_team_member(dev)
+        dev.seniority_level = "senior"
+        assert isinstance(dev, part4.AbstractEmployee)
+        assert dept.calculate_total_salary() == 10000
+        assert project.calculate_total_salary() == 10000
+        assert dev.to_dict()["assigned_project_ids"] == [1]
+        with pytest.raises(ValueError):
+            dev.id = 2
@@ -0,0 +1,87 @@
+import functools
+import random
+import pytest
+from source_code.part4 import (
+    Employee,
+    Manager,
+    Developer,
+    compare_by_department_and_name,
+)
+from source_code.sorting import sort_employees, top_k, bottom_k
+
+
+class CountingEmployee:
+    calls = 0
+
+    def __init__(self, id, name, department, salary):
+        self.id = id
+        self.name = name
+        self.department = department
+        self._salary = salary
+
+    def calculate_salary(self):
+        CountingEmployee.calls += 1
+        return self._salary
+
+
+@pytest.fixture
+def staff():
+    return [
+        Developer(1, "Alice", "DEV", 5000, ["Python"], "senior"),
+        Employee(2, "Bob", "DEV", 4000),
+        Manager(3, "Carol", "SALES", 6000, 1000),
+        Employee(4, "Dan", "SALES", 7000),
+        Employee(5, "Alice", "HR", 2000),
+    ]
+
+
+class TestSortEmployees:
+
+    def test_matches_comparator(self, staff):
+        by_cmp = functools.cmp_to_key(compare_by_department_and_name)
+        expected = sorted(staff, key=by_cmp)
+        assert sort_employees(staff, "department", "name") == expected
+
+    def test_mixed_directions(self, staff):
+        result = sort_employees(staff, "department", "-salary")
+        assert [emp.id for emp in result] == [1, 2, 5, 3, 4]
+        result = sort_employees(staff, "-department", "name")
+        assert [emp.id for emp in result] == [3, 4, 5, 1, 2]
+
+    def test_stable_for_equal_keys(self, staff):
+        assert [emp.id for emp in sort_employees(staff, "name")] == [1, 5, 2, 3, 4]
+        assert [emp.id for emp in sort_employees(staff, "-name")] == [4, 3, 2, 1, 5]
+
+    def test_callable_and_tuple_keys(self, staff):
+        by_len = sort_employees(staff, (lambda emp: len(emp.name), True), "id")
+        assert [emp.id for emp in by_len] == [1, 3, 5, 2, 4]
+
+    def test_unknown_key(self, staff):
+        with pytest.raises(ValueError):
+            sort_employees(staff, "age")
+
+
+class TestTopK:
+
+    def test_top_earners(self, staff):
+        assert [emp.id for emp in top_k(staff, 2)] == [1, 3]
+        assert [emp.id for emp in bottom_k(staff, 2)] == [5, 2]
+
+    def test_agrees_with_full_sort(self):
+        rng = random.Random(7)
+        staff = [
+            CountingEmployee(i, f"E{i}", rng.choice("ABC"), rng.randrange(50))
+            for i in range(300)
+        ]
+        expected = sort_employees(staff, "-salary", "department")[:25]
+        assert top_k(staff, 25, "salary", ("department", True)) == expected
+        assert bottom_k(staff, 25, "salary") == sort_employees(staff, "salary")[:25]
+
+    def test_one_salary_call_per_employee(self):
+        staff = [CountingEmployee(i, f"E{i}", "DEV", i % 17) for i in range(1000)]
+        CountingEmployee.calls = 0
+        top_k(staff, 100)
+        assert CountingEmployee.calls == 1000
+        CountingEmployee.calls = 0
+        sort_employees(staff, "-salary", "name")
+        assert CountingEmployee.calls == 1000
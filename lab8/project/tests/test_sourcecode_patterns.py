@@ -0,0 +1,725 @@
+import sqlite3
+import threading
+import time
+import pytest
+from source_code import sourcecode
+from source_code.sourcecode import (
+    Employee,
+    Manager,
+    Developer,
+    Salesperson,
+    Company,
+    CompanyFacade,
+    NotificationBus,
+    HireManyCommand,
+    FireManyCommand,
+    HireEmployeeCommand,
+    UpdateSalaryCommand,
+    MacroCommand,
+    CommandInvoker,
+    Specification,
+    SalarySpecification,
+    DepartmentSpecification,
+    SkillSpecification,
+    EmployeeRepository,
+    SqliteEmployeeRepository,
+    DatabaseConnection,
+    UnitOfWork,
+    BonusDecorator,
+    TrainingDecorator,
+    DecoratorStack,
+    EmployeeDecorator,
+    PerformanceBonusStrategy,
+    SalaryAdapter,
+    SimulatedSalarySystem,
+    ExternalSalarySystem,
+    compile_to_sql,
+    compile_predicate,
+    specification_mask,
+)
+
+
+@pytest.fixture
+def sqlite_repo(tmp_path):
+    repo = SqliteEmployeeRepository(str(tmp_path / "employees.db"))
+    yield repo
+    repo.close()
+
+
+def create_staff():
+    manager = Manager(0, "Bob", "MGMT", 6000)
+    manager.bonus = 1000
+    salesperson = Salesperson(0, "Carol", "SALES", 3000, 0.1)
+    salesperson.update_sales(10000)
+    return [
+        Developer(0, "Alice", "DEV", 5000, ["Python", "SQL"], "senior"),
+        manager,
+        salesperson,
+        Employee(0, "Dan", "HR", 2500),
+    ]
+
+
+class TestSqliteEmployeeRepository:
+
+    def test_add_assigns_ids(self, sqlite_repo):
+        sqlite_repo.add_many(create_staff())
+        assert [emp.id for emp in sqlite_repo.get_all()] == [1, 2, 3, 4]
+        assert sqlite_repo.count() == 4
+
+    def test_roundtrip_keeps_salary(self, sqlite_repo):
+        staff = create_staff()
+        sqlite_repo.add_many(staff)
+        for original in staff:
+            loaded = sqlite_repo.get(original.id)
+            assert type(loaded) is type(original)
+            assert loaded.calculate_salary() == original.calculate_salary()
+
+    def test_update_and_delete(self, sqlite_repo):
+        dev = Developer(0, "Alice", "DEV", 5000, ["Python"], "junior")
+        sqlite_repo.add(dev)
+        dev.base_salary = 7000
+        assert sqlite_repo.update(dev)
+        assert sqlite_repo.get(dev.id).base_salary == 7000
+        assert sqlite_repo.delete(dev.id)
+        assert not sqlite_repo.delete(dev.id)
+        assert sqlite_repo.get(dev.id) is None
+
+    def test_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "employees.db")
+        with SqliteEmployeeRepository(path) as repo:
+            repo.add_many(create_staff())
+        with SqliteEmployeeRepository(path) as repo:
+            assert repo.count() == 4
+            assert repo.get(1).skills == ["Python", "SQL"]
+
+    def test_find_by_specification(self, sqlite_repo):
+        sqlite_repo.add_many(create_staff())
+        found = sqlite_repo.find_by_specification(DepartmentSpecification("DEV"))
+        assert [emp.name for emp in found] == ["Alice"]
+
+    def test_salary_filter_ignores_unsaved_strategy(self, sqlite_repo):
+        dan = Employee(0, "Dan", "HR", 2500)
+        dan.set_bonus_strategy(PerformanceBonusStrategy())
+        sqlite_repo.add(dan)
+        salary = SalarySpecification(dan.calculate_salary())
+        in_sql = sqlite_repo.find_by_specification(salary)
+        with_residual = salary | CaseInsensitiveDepartment("none")
+        in_python = sqlite_repo.find_by_specification(with_residual)
+        assert compile_to_sql(with_residual).where is None
+        assert [emp.id for emp in in_sql] == [emp.id for emp in in_python] == []
+
+    def test_rejects_unknown_types(self, sqlite_repo):
+        class Intern(Employee):
+            pass
+
+        with pytest.raises(TypeError):
+            sqlite_repo.add(Intern(0, "Eve", "HR", 1000))
+        assert sqlite_repo.count() == 0
+        sqlite_repo.connection.execute(
+            "INSERT INTO employees VALUES (7, 'Eve', 'HR', 1000, 1000, 'Intern', '{}')"
+        )
+        with pytest.raises(ValueError, match="Intern"):
+            sqlite_repo.get(7)
+
+    def test_path_is_required(self):
+        with pytest.raises(TypeError):
+            SqliteEmployeeRepository()
+
+    def test_concurrent_writers_get_distinct_ids(self, sqlite_repo):
+        def hire(n):
+            for i in range(n):
+                sqlite_repo.add(Employee(0, f"Emp{i}", "DEV", 1000))
+
+        threads = [threading.Thread(target=hire, args=(25,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sqlite_repo.count() == 100
+        assert [emp.id for emp in sqlite_repo.get_all()] == list(range(1, 101))
+
+    def test_database_connection_shares_repository(self, tmp_path):
+        path = str(tmp_path / "shared.db")
+        db = DatabaseConnection()
+        try:
+            repo = db.open(path)
+            assert DatabaseConnection().open(path) is repo
+            assert DatabaseConnection().get_connection() is repo.connection
+            with pytest.raises(ValueError):
+                db.open(str(tmp_path / "other.db"))
+            repo.add(Employee(0, "Dan", "HR", 2500))
+        finally:
+            db.close_connection()
+        with pytest.raises(RuntimeError):
+            db.repository
+        with SqliteEmployeeRepository(path) as reopened:
+            assert reopened.count() == 1
+
+
+class OddIdSpecification(Specification):
+    def is_satisfied_by(self, employee):
+        return employee.id % 2 == 1
+
+
+class CaseInsensitiveDepartment(DepartmentSpecification):
+    def is_satisfied_by(self, employee):
+        return employee.department.lower() == self._department.lower()
+
+
+class TestSpecificationCompiler:
+
+    @pytest.fixture
+    def staff(self):
+        staff = create_staff()
+        for i, emp in enumerate(staff, 1):
+            emp.id = i
+        return staff
+
+    def test_sql_where_clause(self):
+        spec = SalarySpecification(4000) & DepartmentSpecification("DEV")
+        compiled = compile_to_sql(spec)
+        assert compiled.where == "salary >= ? AND department = ?"
+        assert compiled.params == [4000, "DEV"]
+        assert compiled.residual is None
+
+    def test_unsupported_leaf_becomes_residual(self):
+        odd = OddIdSpecification()
+        compiled = compile_to_sql(DepartmentSpecification("DEV") & odd)
+        assert compiled.where == "department = ?"
+        assert compiled.residual is odd
+        assert compile_to_sql(DepartmentSpecification("DEV") | odd).where is None
+
+    def test_predicate_matches_specification(self, staff):
+        spec = (SkillSpecification("SQL") | SalarySpecification(6500)) & (
+            OddIdSpecification() | DepartmentSpecification("MGMT")
+        )
+        predicate = compile_predicate(spec)
+        assert [predicate(emp) for emp in staff] == [
+            spec.is_satisfied_by(emp) for emp in staff
+        ]
+
+    def test_overridden_subclass_is_not_inlined(self, staff):
+        spec = CaseInsensitiveDepartment("dev") | SalarySpecification(6500)
+        predicate = compile_predicate(spec)
+        expected = [spec.is_satisfied_by(emp) for emp in staff]
+        assert any(expected)
+        assert [predicate(emp) for emp in staff] == expected
+        assert compile_to_sql(spec).where is None
+        assert list(specification_mask(spec, staff)) == expected
+
+    def test_repositories_agree(self, sqlite_repo):
+        spec = (SalarySpecification(3000) & OddIdSpecification()) | SkillSpecification(
+            "Python"
+        )
+        memory_repo = EmployeeRepository()
+        staff = create_staff()
+        sqlite_repo.add_many(staff)
+        for emp in staff:
+            memory_repo.add(emp)
+        expected = [emp.id for emp in staff if spec.is_satisfied_by(emp)]
+        assert [emp.id for emp in memory_repo.find_by_specification(spec)] == expected
+        assert [emp.id for emp in sqlite_repo.find_by_specification(spec)] == expected
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_mask(self, staff, monkeypatch, use_numpy):
+        if not use_numpy:
+            monkeypatch.setattr(sourcecode, "np", None)
+        elif sourcecode.np is None:
+            pytest.skip("NumPy не установлен")
+        spec = SalarySpecification(4000) & OddIdSpecification()
+        assert list(specification_mask(spec, staff)) == [
+            spec.is_satisfied_by(emp) for emp in staff
+        ]
+
+
+class TestUnitOfWork:
+
+    def test_commit_flushes_batch(self, sqlite_repo):
+        staff = create_staff()
+        sqlite_repo.add_many(staff[:3])
+        alice, bob, carol, dan = staff
+        uow = UnitOfWork(sqlite_repo)
+        uow.register_new(dan)
+        alice.base_salary = 5500
+        uow.register_dirty(alice)
+        uow.register_dirty(alice)
+        uow.register_removed(bob)
+        uow.commit()
+        assert [emp.name for emp in sqlite_repo.get_all()] == ["Alice", "Carol", "Dan"]
+        assert sqlite_repo.get(alice.id).base_salary == 5500
+
+    def test_failed_commit_keeps_new_ids_unassigned(self, sqlite_repo):
+        alice, bob, carol, dan = create_staff()
+        sqlite_repo.add(alice)
+        bob.id = alice.id
+        uow = UnitOfWork(sqlite_repo)
+        uow.register_new(dan)
+        uow.register_new(carol)
+        uow.register_new(bob)
+        with pytest.raises(sqlite3.IntegrityError):
+            uow.commit()
+        assert (dan.id, carol.id) == (0, 0)
+        assert [emp.name for emp in sqlite_repo.get_all()] == ["Alice"]
+
+    def test_new_then_removed_is_dropped(self):
+        repo = EmployeeRepository()
+        dan = Employee(0, "Dan", "HR", 2500)
+        uow = UnitOfWork(repo)
+        uow.register_new(dan)
+        uow.register_dirty(dan)
+        uow.register_removed(dan)
+        uow.commit()
+        assert repo.get_all() == []
+
+    def test_rollback_restores_snapshot(self):
+        repo = EmployeeRepository()
+        dev = Developer(0, "Alice", "DEV", 5000, ["Python"], "junior")
+        repo.add(dev)
+        uow = UnitOfWork(repo)
+        uow.register_dirty(dev)
+        dev.base_salary = 9000
+        dev.name = "Alicia"
+        uow.rollback()
+        assert (dev.name, dev.base_salary) == ("Alice", 5000)
+        uow.commit()
+        assert repo.get(dev.id) is dev
+
+    def test_rollback_after_register_clean(self):
+        repo = EmployeeRepository()
+        dev = Developer(0, "Alice", "DEV", 5000, ["Python"], "junior")
+        repo.add(dev)
+        bonus = BonusDecorator(dev, 500)
+        assert bonus.calculate_salary() == 5500
+        uow = UnitOfWork(repo)
+        uow.register_clean(dev)
+        dev.base_salary = 9000
+        dev.name = "Alicia"
+        uow.register_dirty(dev)
+        assert bonus.calculate_salary() == 9500
+        uow.rollback()
+        assert (dev.name, dev.base_salary) == ("Alice", 5000)
+        assert bonus.calculate_salary() == 5500
+
+    def test_clean_object_is_not_committed(self, sqlite_repo):
+        staff = create_staff()
+        sqlite_repo.add_many(staff[:1])
+        uow = UnitOfWork(sqlite_repo)
+        uow.register_clean(staff[0])
+        staff[0].base_salary = 1
+        uow.commit()
+        assert sqlite_repo.get(staff[0].id).base_salary != 1
+
+    def test_failed_commit_leaves_database_untouched(self, sqlite_repo):
+        staff = create_staff()
+        sqlite_repo.add_many(staff[:2])
+        uow = UnitOfWork(sqlite_repo)
+        uow.register_removed(staff[0])
+        uow.register_new(Employee(staff[1].id, "Clash", "HR", 1000))
+        with pytest.raises(sqlite3.IntegrityError):
+            uow.commit()
+        assert sqlite_repo.count() == 2
+
+
+class TestCompanyBulkOperations:
+
+    def test_hire_many_assigns_ids_in_order(self):
+        company = Company("TechCorp")
+        company.hire_employee(Employee(10, "Eve", "HR", 2000))
+        company.hire_many(create_staff())
+        assert [emp.id for emp in company.get_all_employees()] == [10, 11, 12, 13, 14]
+        assert company.get_employee(12).name == "Bob"
+
+    def test_duplicate_id_rejects_whole_batch(self):
+        company = Company("TechCorp")
+        company.hire_employee(Employee(1, "Eve", "HR", 2000))
+        with pytest.raises(ValueError):
+            company.hire_many([Employee(2, "Dan", "HR", 1000), Employee(1, "X", "HR", 1)])
+        assert company.get_employee_count() == 1
+
+    def test_fire_many_skips_unknown_ids(self):
+        company = Company("TechCorp")
+        company.hire_many(create_staff())
+        fired = company.fire_many([2, 99, 4])
+        assert [emp.name for emp in fired] == ["Bob", "Dan"]
+        assert [emp.id for emp in company.get_all_employees()] == [1, 3]
+        assert company.fire_employee(2) is None
+
+    def test_bulk_commands_undo(self):
+        company = Company("TechCorp")
+        hire = HireManyCommand(company, create_staff())
+        hire.execute()
+        fire = FireManyCommand(company, [1, 3])
+        fire.execute()
+        assert company.get_employee_count() == 2
+        fire.undo()
+        assert company.get_employee_count() == 4
+        hire.undo()
+        assert company.get_all_employees() == []
+
+
+class TestNotificationBus:
+
+    def test_batches_reach_sinks(self):
+        batches = []
+        with NotificationBus(sinks=[batches.append]) as bus:
+            emp = Employee(1, "Alice", "DEV", 5000)
+            emp.add_observer(bus)
+            for i in range(10):
+                emp.notify_observers(f"event {i}")
+            bus.flush()
+        delivered = [line for batch in batches for line in batch]
+        assert len(delivered) == 10
+        assert delivered[-1].endswith("Alice: event 9")
+
+    def test_history_is_capped(self):
+        with NotificationBus(history_size=3) as bus:
+            for i in range(5):
+                bus.notify(f"event {i}")
+            bus.flush()
+            history = bus.get_notifications()
+        assert [line.split(": ", 1)[1] for line in history] == [
+            "event 2",
+            "event 3",
+            "event 4",
+        ]
+
+    def test_full_queue_blocks_producer(self):
+        release = threading.Event()
+        bus = NotificationBus(
+            sinks=[lambda batch: release.wait()], maxsize=1, batch_size=1
+        )
+        with bus:
+            bus.notify("first")
+            bus.notify("second")
+            producer = threading.Thread(target=bus.notify, args=("third",))
+            producer.start()
+            producer.join(0.1)
+            assert producer.is_alive()
+            release.set()
+            producer.join()
+            bus.flush()
+            assert len(bus.get_notifications()) == 3
+
+    def test_failing_sink_does_not_stop_delivery(self):
+        def broken(batch):
+            raise IOError("disk full")
+
+        with NotificationBus(sinks=[broken]) as bus:
+            facade = CompanyFacade(Company("TechCorp"), bus)
+            assert facade.hire({"name": "Dan", "department": "HR", "base_salary": 1})
+            bus.flush()
+            assert bus.get_notifications()[0].endswith("System: Hired: Dan")
+        with pytest.raises(RuntimeError):
+            bus.notify("late")
+
+
+    def test_event_is_not_queued_after_stop(self):
+        bus = NotificationBus()
+        entered = threading.Event()
+        original_put = bus._queue.put
+
+        def slow_put(item, *args, **kwargs):
+            if item is not NotificationBus._STOP:
+                entered.set()
+                time.sleep(0.1)  # close() успевает вмешаться между проверкой и put
+            original_put(item, *args, **kwargs)
+
+        bus._queue.put = slow_put
+        producer = threading.Thread(target=bus.notify, args=("last",))
+        producer.start()
+        entered.wait()
+        bus.close()
+        producer.join()
+        assert bus.get_notifications()[-1].endswith("System: last")
+
+class TestSalaryCache:
+
+    def test_cached_until_change(self):
+        dev = Developer(1, "Alice", "DEV", 5000, ["Python"], "senior")
+        dev.calculate_salary()
+        sourcecode.reset_salary_cache_stats()
+        assert dev.calculate_salary() == 10000
+        dev.set_bonus_strategy(PerformanceBonusStrategy())
+        assert dev.calculate_salary() == 10500
+        assert sourcecode.salary_cache_stats() == {"hits": 1, "misses": 1}
+
+    def test_decorator_chain_follows_wrapped_employee(self):
+        manager = Manager(1, "Bob", "MGMT", 6000)
+        decorated = TrainingDecorator(BonusDecorator(manager, 500), "Python")
+        assert decorated.calculate_salary() == 6500
+        manager.bonus = 1000
+        assert decorated.calculate_salary() == 7500
+        manager.base_salary = 7000
+        assert decorated.calculate_salary() == 8500
+        decorated.set_bonus_strategy(PerformanceBonusStrategy())
+        assert decorated.calculate_salary() == 9200
+
+
+class TestCommandHistory:
+
+    @pytest.fixture
+    def company(self):
+        company = Company("TechCorp")
+        company.hire_many(create_staff())
+        return company
+
+    def test_undo_redo(self, company):
+        invoker = CommandInvoker(quiet=True)
+        alice = company.get_employee(1)
+        invoker.execute_command(UpdateSalaryCommand(alice, 6000))
+        assert invoker.undo_last()
+        assert alice.base_salary == 5000
+        assert invoker.redo_last()
+        assert alice.base_salary == 6000
+        assert not invoker.redo_last()
+        invoker.undo_last()
+        invoker.execute_command(UpdateSalaryCommand(alice, 7000))
+        assert invoker.redo_size == 0
+
+    def test_old_salary_taken_at_execute(self, company):
+        alice = company.get_employee(1)
+        command = UpdateSalaryCommand(alice, 6000)
+        alice.base_salary = 5500
+        command.quiet = True
+        command.execute()
+        command.undo()
+        assert alice.base_salary == 5500
+
+    def test_macro_is_one_unit(self, company, capsys):
+        invoker = CommandInvoker()
+        staff = company.get_all_employees()
+        invoker.execute_command(
+            MacroCommand(UpdateSalaryCommand(emp, emp.base_salary * 2) for emp in staff)
+        )
+        assert capsys.readouterr().out == "Executed: Batch (4 commands)\n"
+        assert invoker.history_size == 1
+        invoker.undo_last()
+        assert [emp.base_salary for emp in staff] == [5000, 6000, 3000, 2500]
+
+    def test_failed_macro_rolls_back(self, company):
+        alice = company.get_employee(1)
+        macro = MacroCommand(
+            [
+                UpdateSalaryCommand(alice, 9000),
+                HireEmployeeCommand(company, Employee(0, "Eve", "HR", 1000)),
+                UpdateSalaryCommand(alice, -1),
+            ]
+        )
+        macro.quiet = True
+        with pytest.raises(ValueError):
+            macro.execute()
+        assert alice.base_salary == 5000
+        assert company.get_employee_count() == 4
+
+    def test_history_is_capped(self, company):
+        invoker = CommandInvoker(max_history=2, quiet=True)
+        alice = company.get_employee(1)
+        for salary in (5100, 5200, 5300):
+            invoker.execute_command(UpdateSalaryCommand(alice, salary))
+        assert invoker.history_size == 2
+        assert invoker.undo_last() and invoker.undo_last()
+        assert not invoker.undo_last()
+        assert alice.base_salary == 5100
+
+    def test_spilled_commands_undo_live_objects(self, company, tmp_path):
+        alice = company.get_employee(1)
+        with CommandInvoker(
+            max_history=2, spill_path=str(tmp_path / "history.bin"), quiet=True
+        ) as invoker:
+            for salary in range(5100, 5600, 100):
+                invoker.execute_command(UpdateSalaryCommand(alice, salary))
+            assert invoker.history_size == 5
+            while invoker.undo_last():
+                pass
+            assert alice.base_salary == 5000
+            assert invoker.redo_size == 5
+
+    def test_spilled_objects_are_released(self, company, tmp_path):
+        alice, bob = company.get_employee(1), company.get_employee(2)
+        with CommandInvoker(
+            max_history=1, spill_path=str(tmp_path / "history.bin"), quiet=True
+        ) as invoker:
+            for employee in (alice, alice, bob, bob):
+                invoker.execute_command(UpdateSalaryCommand(employee, 1000))
+            assert set(invoker._live_objects) == {id(alice), id(bob)}
+            invoker.undo_last()
+            invoker.undo_last()
+            assert set(invoker._live_objects) == {id(alice)}
+            while invoker.undo_last():
+                pass
+            assert invoker._live_objects == {}
+            assert (alice.base_salary, bob.base_salary) == (5000, 6000)
+
+    def test_spill_keeps_other_objects_live(self, company, tmp_path):
+        alice = company.get_employee(1)
+        log = []
+        with CommandInvoker(
+            max_history=1, spill_path=str(tmp_path / "history.bin"), quiet=True
+        ) as invoker:
+            command = UpdateSalaryCommand(alice, 5100)
+            command.lock = threading.Lock()
+            command.log = LogBox(log)
+            invoker.execute_command(command)
+            invoker.execute_command(UpdateSalaryCommand(alice, 5200))
+            assert invoker.undo_last() and invoker.undo_last()
+            restored = invoker._redo[-1]
+            assert restored.lock is command.lock
+            assert restored.log.entries is log
+            assert alice.base_salary == 5000
+
+    def test_failed_spill_drops_oldest_with_warning(self, company, tmp_path):
+        alice = company.get_employee(1)
+        with CommandInvoker(
+            max_history=1, spill_path=str(tmp_path / "history.bin"), quiet=True
+        ) as invoker:
+            invoker.execute_command(UpdateSalaryCommand(alice, 5100))
+            invoker.execute_command(UnpicklableCommand(alice, 5200))
+            with pytest.warns(RuntimeWarning):
+                invoker.execute_command(UpdateSalaryCommand(alice, 5300))
+            invoker.execute_command(UpdateSalaryCommand(alice, 5400))
+            assert alice.base_salary == 5400
+            assert invoker.history_size == 2
+            while invoker.undo_last():
+                pass
+            assert alice.base_salary == 5200
+
+    def test_macro_restores_child_quiet(self, company, capsys):
+        command = UpdateSalaryCommand(company.get_employee(1), 6000)
+        macro = MacroCommand([command])
+        macro.execute()
+        macro.undo()
+        assert command.quiet is False
+        capsys.readouterr()
+        command.execute()
+        assert capsys.readouterr().out != ""
+
+
+class LogBox:
+    """Посторонний объект, на который ссылается команда"""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+
+class UnpicklableCommand(UpdateSalaryCommand):
+    def __reduce__(self):
+        raise TypeError("команду нельзя сериализовать")
+
+
+class FlakySalarySystem(ExternalSalarySystem):
+    """Первые failures пакетных вызовов падают"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def compute_compensations(self, batch):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("timeout")
+        return super().compute_compensations(batch)
+
+
+class TestBatchedSalaryAdapter:
+
+    @pytest.fixture
+    def staff(self):
+        staff = [Employee(i, f"Emp{i}", "DEV", 1000 * i) for i in range(1, 26)]
+        staff[0].set_bonus_strategy(PerformanceBonusStrategy())
+        return staff
+
+    def test_matches_single_calls(self, staff):
+        system = SimulatedSalarySystem(latency=0)
+        with SalaryAdapter(system, batch_size=10) as adapter:
+            expected = [adapter.calculate_salary(emp) for emp in staff]
+            system.calls = 0
+            assert adapter.calculate_salaries(staff) == expected
+        assert system.calls == 3
+        assert adapter.calculate_salaries([]) == []
+
+    def test_retries_failed_batch(self, staff):
+        system = FlakySalarySystem(failures=2)
+        adapter = SalaryAdapter(system, batch_size=100, retries=2, backoff=0)
+        assert len(adapter.calculate_salaries(staff)) == 25
+        system = FlakySalarySystem(failures=3)
+        adapter = SalaryAdapter(system, batch_size=100, retries=2, backoff=0)
+        with pytest.raises(ConnectionError):
+            adapter.calculate_salaries(staff)
+
+    def test_timeout(self, staff):
+        system = SimulatedSalarySystem(latency=0.2)
+        adapter = SalaryAdapter(system, batch_size=5, max_workers=1, timeout=0.05)
+        with adapter, pytest.raises(TimeoutError):
+            adapter.calculate_salaries(staff)
+
+    def test_timeout_for_single_batch(self, staff):
+        system = SimulatedSalarySystem(latency=0.2)
+        adapter = SalaryAdapter(system, batch_size=100, timeout=0.05)
+        with adapter, pytest.raises(TimeoutError):
+            adapter.calculate_salaries(staff)
+
+    def test_batches_run_concurrently(self, staff):
+        system = SimulatedSalarySystem(latency=0.05)
+        with SalaryAdapter(system, batch_size=5, max_workers=5) as adapter:
+            start = time.perf_counter()
+            adapter.calculate_salaries(staff)
+            assert time.perf_counter() - start < 0.2
+
+
+class UppercaseDecorator(EmployeeDecorator):
+    def get_info(self):
+        return self._employee.get_info().upper()
+
+
+class TestDecoratorStack:
+
+    @staticmethod
+    def nested(employee):
+        decorated = BonusDecorator(employee, 500)
+        decorated = TrainingDecorator(decorated, "Python")
+        decorated = BonusDecorator(decorated, 250)
+        return TrainingDecorator(decorated, "SQL")
+
+    def test_flatten_matches_nested(self):
+        developer = Developer(1, "Alice", "DEV", 5000, ["Python"], "senior")
+        nested = self.nested(developer)
+        flat = DecoratorStack.flatten(nested)
+        assert flat.calculate_salary() == nested.calculate_salary() == 10750
+        assert flat.get_info() == nested.get_info()
+        assert flat.get_info().endswith(
+            "[+Bonus: 500] | Training: Python [+Bonus: 250] | Training: SQL"
+        )
+
+    def test_builder_methods_match_nested(self):
+        manager = Manager(2, "Bob", "MGMT", 6000)
+        flat = (
+            DecoratorStack(manager)
+            .add_bonus(500)
+            .add_training("Python")
+            .add_bonus(250)
+            .add_training("SQL")
+        )
+        nested = self.nested(manager)
+        assert flat.get_info() == nested.get_info()
+        assert flat.calculate_salary() == 6750
+        flat.add_bonus(50)
+        assert flat.calculate_salary() == 6800
+
+    def test_follows_wrapped_employee(self):
+        manager = Manager(2, "Bob", "MGMT", 6000)
+        flat = DecoratorStack.flatten(self.nested(manager))
+        assert flat.calculate_salary() == 6750
+        manager.bonus = 1000
+        assert flat.calculate_salary() == 7750
+        flat.set_bonus_strategy(PerformanceBonusStrategy())
+        assert flat.calculate_salary() == 7750 + manager.calculate_bonus()
+
+    def test_foreign_decorators_stay_inside(self):
+        employee = Employee(3, "Dan", "HR", 2500)
+        nested = BonusDecorator(UppercaseDecorator(self.nested(employee)), 100)
+        flat = DecoratorStack.flatten(nested)
+        assert isinstance(flat._employee, UppercaseDecorator)
+        assert flat.get_info() == nested.get_info()
+        assert flat.calculate_salary() == nested.calculate_salary() == 3350
+        again = DecoratorStack.flatten(TrainingDecorator(flat, "Go"))
+        assert again.get_info() == flat.get_info() + " | Training: Go"
@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy необязателен, без него расчет идет списками
+    np = None
 
 
 class Validator(ABC):
@@ -52,8 +58,9 @@ class BonusStrategy(ABC):
         pass
 
 class PerformanceBonusStrategy(BonusStrategy):
+    RATE = 0.1
     def calculate_bonus(self, base_salary: float, **kwargs) -> float:
-        return base_salary * 0.1
+        return base_salary * self.RATE
 
 class SeniorityBonusStrategy(BonusStrategy):
     RATES = {"junior": 0.05, "middle": 0.10, "senior": 0.20}
@@ -61,6 +68,103 @@ class SeniorityBonusStrategy(BonusStrategy):
         rate = self.RATES.get(seniority, 0.05)
         return base_salary * rate
 
+# общие экземпляры: стратегии и валидаторы без состояния, создаются один раз
+
+VALIDATORS: Dict[str, Validator] = {
+    "positive_number": PositiveNumberValidator(),
+    "string_not_empty": StringNotEmptyValidator(),
+}
+
+SALARY_STRATEGIES: Dict[str, SalaryStrategy] = {
+    "developer": DeveloperSalaryStrategy(),
+    "manager": ManagerSalaryStrategy(),
+    "salesperson": SalespersonSalaryStrategy(),
+}
+
+BUILTIN_SALARY_STRATEGIES = frozenset(type(s) for s in SALARY_STRATEGIES.values())
+
+BONUS_STRATEGIES: Dict[str, BonusStrategy] = {
+    "performance": PerformanceBonusStrategy(),
+    "seniority": SeniorityBonusStrategy(),
+}
+
+
+# готовые функции расчета для каждого типа: методы стратегий связываются один раз.
+# встроенные стратегии вызываются позиционно, без словаря **kwargs на каждый вызов;
+# остальные получают параметры по имени, как того требует интерфейс стратегии
+
+def compile_developer_salary(
+        salary_strategy: SalaryStrategy,
+        bonus_strategy: BonusStrategy
+) -> Callable[[float, str], float]:
+    calculate = salary_strategy.calculate
+    if type(salary_strategy) is not DeveloperSalaryStrategy:
+        custom_calculate = calculate
+
+        def calculate(base_salary: float, seniority: str) -> float:
+            return custom_calculate(base_salary=base_salary, seniority=seniority)
+
+    calculate_bonus = bonus_strategy.calculate_bonus
+    if type(bonus_strategy) is not SeniorityBonusStrategy:
+        custom_bonus = calculate_bonus
+
+        def calculate_bonus(base_salary: float, seniority: str) -> float:
+            return custom_bonus(base_salary, seniority=seniority)
+
+    def developer_salary(base_salary: float, seniority: str) -> float:
+        return (calculate(base_salary, seniority)
+                + calculate_bonus(base_salary, seniority))
+    return developer_salary
+
+
+def compile_manager_salary(
+        salary_strategy: SalaryStrategy,
+        bonus_strategy: BonusStrategy
+) -> Callable[[float, float], float]:
+    calculate = salary_strategy.calculate
+    if type(salary_strategy) is not ManagerSalaryStrategy:
+        custom_calculate = calculate
+
+        def calculate(base_salary: float, bonus: float) -> float:
+            return custom_calculate(base_salary=base_salary, bonus=bonus)
+
+    # базовая ставка у всех стратегий бонуса - первый позиционный аргумент
+    calculate_bonus = bonus_strategy.calculate_bonus
+
+    def manager_salary(base_salary: float, bonus: float) -> float:
+        return calculate(base_salary, bonus) + calculate_bonus(base_salary)
+    return manager_salary
+
+
+def compile_salesperson_salary(
+        salary_strategy: SalaryStrategy
+) -> Callable[[float, float, float], float]:
+    calculate = salary_strategy.calculate
+    if type(salary_strategy) is not SalespersonSalaryStrategy:
+        custom_calculate = calculate
+
+        def calculate(base_salary: float, commission_rate: float,
+                      total_sales: float) -> float:
+            return custom_calculate(base_salary=base_salary,
+                                    commission_rate=commission_rate,
+                                    total_sales=total_sales)
+
+    def salesperson_salary(base_salary: float, commission_rate: float,
+                           total_sales: float) -> float:
+        return calculate(base_salary, commission_rate, total_sales)
+    return salesperson_salary
+
+
+SALARY_FUNCTIONS: Dict[str, Callable[..., float]] = {
+    "developer": compile_developer_salary(
+        SALARY_STRATEGIES["developer"], BONUS_STRATEGIES["seniority"]
+    ),
+    "manager": compile_manager_salary(
+        SALARY_STRATEGIES["manager"], BONUS_STRATEGIES["performance"]
+    ),
+    "salesperson": compile_salesperson_salary(SALARY_STRATEGIES["salesperson"]),
+}
+
 class ISalaryCalculable(ABC):
     @abstractmethod
     def calculate_salary(self) -> float:
@@ -89,9 +193,9 @@ class Employee(ISalaryCalculable, IInfoProvidable, ISerializable):
             salary_strategy: Optional[SalaryStrategy] = None,
             bonus_strategy: Optional[BonusStrategy] = None
     ):
-        self.__name = StringNotEmptyValidator().validate(name)
+        self.__name = VALIDATORS["string_not_empty"].validate(name)
         self.__department = department
-        self.__base_salary = PositiveNumberValidator().validate(base_salary)
+        self.__base_salary = VALIDATORS["positive_number"].validate(base_salary)
         self.__id = employee_id
         self._salary_strategy = salary_strategy or SalaryStrategy
         self._bonus_strategy = bonus_strategy or BonusStrategy
@@ -109,8 +213,13 @@ class Employee(ISalaryCalculable, IInfoProvidable, ISerializable):
         return self.__base_salary
 
     def calculate_salary(self) -> float:
-        base = self._salary_strategy.calculate(base_salary=self.__base_salary)
-        bonus = self._bonus_strategy.calculate_bonus(base_salary=self.__base_salary)
+        salary_strategy = self._salary_strategy
+        if type(salary_strategy) in BUILTIN_SALARY_STRATEGIES:
+            base = salary_strategy.calculate(self.__base_salary)
+        else:
+            # интерфейс SalaryStrategy.calculate принимает только именованные
+            base = salary_strategy.calculate(base_salary=self.__base_salary)
+        bonus = self._bonus_strategy.calculate_bonus(self.__base_salary)
         return base + bonus
 
     def get_info(self) -> str:
@@ -125,6 +234,7 @@ class Employee(ISalaryCalculable, IInfoProvidable, ISerializable):
         }
 
 class Developer(Employee):
+    _salary_function = staticmethod(SALARY_FUNCTIONS["developer"])
 
     def __init__(
             self,
@@ -133,32 +243,37 @@ class Developer(Employee):
             base_salary: float,
             seniority: str = "junior",
             skills: Optional[List[str]] = None,
-            employee_id: int = 0
+            employee_id: int = 0,
+            salary_strategy: Optional[SalaryStrategy] = None,
+            bonus_strategy: Optional[BonusStrategy] = None
     ):
         self.__seniority = seniority
         self.__skills: List[str] = skills or []
+        salary_strategy = salary_strategy or SALARY_STRATEGIES["developer"]
+        bonus_strategy = bonus_strategy or BONUS_STRATEGIES["seniority"]
         super().__init__(
             name=name,
             department=department,
             base_salary=base_salary,
             employee_id=employee_id,
-            salary_strategy=DeveloperSalaryStrategy(),
-            bonus_strategy=SeniorityBonusStrategy()
+            salary_strategy=salary_strategy,
+            bonus_strategy=bonus_strategy
         )
+        # общая функция класса подходит только для общих стратегий
+        if (salary_strategy is not SALARY_STRATEGIES["developer"]
+                or bonus_strategy is not BONUS_STRATEGIES["seniority"]):
+            self._salary_function = compile_developer_salary(
+                salary_strategy, bonus_strategy
+            )
 
     @property
     def seniority(self) -> str:
         return self.__seniority
     def calculate_salary(self) -> float:
-        return self._salary_strategy.calculate(
-            base_salary=self.base_salary,
-            seniority=self.__seniority
-        ) + self._bonus_strategy.calculate_bonus(
-            base_salary=self.base_salary,
-            seniority=self.__seniority
-        )
+        return self._salary_function(self.base_salary, self.__seniority)
 
 class Manager(Employee):
+    _salary_function = staticmethod(SALARY_FUNCTIONS["manager"])
 
     def __init__(
             self,
@@ -166,25 +281,36 @@ class Manager(Employee):
             department: str,
             base_salary: float,
             bonus: float = 0,
-            employee_id: int = 0
+            employee_id: int = 0,
+            salary_strategy: Optional[SalaryStrategy] = None,
+            bonus_strategy: Optional[BonusStrategy] = None
     ):
         self.__bonus = bonus
+        salary_strategy = salary_strategy or SALARY_STRATEGIES["manager"]
+        bonus_strategy = bonus_strategy or BONUS_STRATEGIES["performance"]
         super().__init__(
             name=name,
             department=department,
             base_salary=base_salary,
             employee_id=employee_id,
-            salary_strategy=ManagerSalaryStrategy(),
-            bonus_strategy=PerformanceBonusStrategy()
+            salary_strategy=salary_strategy,
+            bonus_strategy=bonus_strategy
         )
+        if (salary_strategy is not SALARY_STRATEGIES["manager"]
+                or bonus_strategy is not BONUS_STRATEGIES["performance"]):
+            self._salary_function = compile_manager_salary(
+                salary_strategy, bonus_strategy
+            )
+
+    @property
+    def bonus(self) -> float:
+        return self.__bonus
 
     def calculate_salary(self) -> float:
-        return self._salary_strategy.calculate(
-            base_salary=self.base_salary,
-            bonus=self.__bonus
-        ) + self._bonus_strategy.calculate_bonus(base_salary=self.base_salary)
+        return self._salary_function(self.base_salary, self.__bonus)
 
 class Salesperson(Employee):
+    _salary_function = staticmethod(SALARY_FUNCTIONS["salesperson"])
 
     def __init__(
             self,
@@ -192,25 +318,35 @@ class Salesperson(Employee):
             department: str,
             base_salary: float,
             commission_rate: float = 0.1,
-            employee_id: int = 0
+            employee_id: int = 0,
+            salary_strategy: Optional[SalaryStrategy] = None
     ):
         self.__commission_rate = commission_rate
         self.__total_sales = 0.0
+        salary_strategy = salary_strategy or SALARY_STRATEGIES["salesperson"]
         super().__init__(
             name=name,
             department=department,
             base_salary=base_salary,
             employee_id=employee_id,
-            salary_strategy=SalespersonSalaryStrategy()
+            salary_strategy=salary_strategy
         )
+        if salary_strategy is not SALARY_STRATEGIES["salesperson"]:
+            self._salary_function = compile_salesperson_salary(salary_strategy)
+
+    @property
+    def commission_rate(self) -> float:
+        return self.__commission_rate
+
+    @property
+    def total_sales(self) -> float:
+        return self.__total_sales
 
     def add_sales(self, amount: float) -> None:
-        self.__total_sales += PositiveNumberValidator().validate(amount)
+        self.__total_sales += VALIDATORS["positive_number"].validate(amount)
     def calculate_salary(self) -> float:
-        return self._salary_strategy.calculate(
-            base_salary=self.base_salary,
-            commission_rate=self.__commission_rate,
-            total_sales=self.__total_sales
+        return self._salary_function(
+            self.base_salary, self.__commission_rate, self.__total_sales
         )
 
 
@@ -225,6 +361,23 @@ class IEmployeeRepository(ABC):
     def get_all(self) -> List[Employee]:
         pass
 
+    # операции ниже выражены через get_all; хранилища переопределяют их,
+    # если умеют отвечать без копии всего списка
+
+    def count(self) -> int:
+        return len(self.get_all())
+
+    def iter_all(self) -> Iterator[Employee]:
+        return iter(self.get_all())
+
+    def get_page(self, offset: int, limit: int) -> List[Employee]:
+        if offset < 0 or limit < 0:
+            raise ValueError("смещение и размер страницы не могут быть отрицательными")
+        return list(islice(self.iter_all(), offset, offset + limit))
+
+    def aggregate_salary(self) -> float:
+        return sum(emp.calculate_salary() for emp in self.iter_all())
+
 class InMemoryEmployeeRepository(IEmployeeRepository):
 
     def __init__(self):
@@ -241,6 +394,13 @@ class InMemoryEmployeeRepository(IEmployeeRepository):
     def get_all(self) -> List[Employee]:
         return list(self._employees.values())
 
+    def count(self) -> int:
+        return len(self._employees)
+
+    def iter_all(self) -> Iterator[Employee]:
+        # без копии: нанимать сотрудников во время обхода нельзя
+        yield from self._employees.values()
+
 
 class Company:
 
@@ -254,11 +414,160 @@ class Company:
     def get_all_employees(self) -> List[Employee]:
         return self.__repository.get_all()
 
+    def iter_employees(self) -> Iterator[Employee]:
+        return self.__repository.iter_all()
+
+    def get_employees_page(self, offset: int, limit: int) -> List[Employee]:
+        return self.__repository.get_page(offset, limit)
+
     def calculate_total_salary(self) -> float:
-        return sum(emp.calculate_salary() for emp in self.__repository.get_all())
+        return self.__repository.aggregate_salary()
 
     def get_employee_count(self) -> int:
-        return len(self.__repository.get_all())
+        return self.__repository.count()
+
+    def calculate_average_salary(self) -> float:
+        count = self.__repository.count()
+        return self.__repository.aggregate_salary() / count if count else 0.0
+
+
+#расчет фонда оплаты
+
+# функция, возвращающая (coeff, addend) для сотрудника
+PayrollTerms = Callable[[Employee], Tuple[float, float]]
+
+
+class PayrollReport:
+
+    def __init__(self, salaries: List[float], slow_path: List[Employee]):
+        self.salaries = salaries
+        self.total = sum(salaries)
+        self.slow_path = slow_path
+
+
+class PayrollCompiler:
+    """
+    Сводит зарплату к base * coeff + addend и считает весь список одним проходом.
+
+    Коэффициенты встроенных стратегий линейны по базовой ставке, поэтому
+    считаются один раз на тип сотрудника и уровень. Сотрудники с другими
+    стратегиями или наследники считаются через calculate_salary и попадают
+    в slow_path отчета. Порядок сложения отличается от calculate_salary,
+    поэтому результат может расходиться с ним в последнем знаке.
+    """
+
+    LINEAR_STRATEGIES = {
+        Developer: (DeveloperSalaryStrategy, SeniorityBonusStrategy),
+        Manager: (ManagerSalaryStrategy, PerformanceBonusStrategy),
+        Salesperson: (SalespersonSalaryStrategy, None),
+    }
+
+    def __init__(self):
+        # (тип, стратегия зарплаты, стратегия бонуса) -> функция (coeff, addend)
+        self.__rules: Dict[tuple, Optional[PayrollTerms]] = {}
+
+    def __rule(
+            self,
+            employee_type: type,
+            salary_strategy: SalaryStrategy,
+            bonus_strategy: BonusStrategy
+    ) -> Optional[PayrollTerms]:
+        strategies = self.LINEAR_STRATEGIES.get(employee_type)
+        if strategies is None:
+            return None
+        salary_type, bonus_type = strategies
+        if type(salary_strategy) is not salary_type:
+            return None
+        if bonus_type is not None and type(bonus_strategy) is not bonus_type:
+            return None
+
+        # для линейных стратегий salary(base) = base * coeff + addend:
+        # addend - зарплата при нулевой базе, coeff - прирост на единицу базы
+        if employee_type is Developer:
+            salary = compile_developer_salary(salary_strategy, bonus_strategy)
+            levels: Dict[str, Tuple[float, float]] = {}
+
+            def developer_terms(employee: Developer) -> Tuple[float, float]:
+                level = employee.seniority
+                terms = levels.get(level)
+                if terms is None:
+                    addend = salary(0.0, level)
+                    terms = levels[level] = (salary(1.0, level) - addend, addend)
+                return terms
+            return developer_terms
+
+        if employee_type is Manager:
+            salary = compile_manager_salary(salary_strategy, bonus_strategy)
+            manager_coefficient = salary(1.0, 0.0) - salary(0.0, 0.0)
+            return lambda employee: (manager_coefficient, salary(0.0, employee.bonus))
+
+        salary = compile_salesperson_salary(salary_strategy)
+        sales_coefficient = salary(1.0, 0.0, 0.0) - salary(0.0, 0.0, 0.0)
+        return lambda employee: (
+            sales_coefficient,
+            salary(0.0, employee.commission_rate, employee.total_sales),
+        )
+
+    def compile(self, employees: Iterable[Employee]) -> "CompiledPayroll":
+        rules = self.__rules
+        bases: List[float] = []
+        coefficients: List[float] = []
+        addends: List[float] = []
+        slow_path: List[Employee] = []
+        for employee in employees:
+            key = (type(employee), employee._salary_strategy, employee._bonus_strategy)
+            if key in rules:
+                rule = rules[key]
+            else:
+                rule = rules[key] = self.__rule(*key)
+            if rule is None:
+                # медленный путь: готовая зарплата целиком уходит в addend
+                slow_path.append(employee)
+                coefficient, addend = 0.0, employee.calculate_salary()
+            else:
+                coefficient, addend = rule(employee)
+            bases.append(employee.base_salary)
+            coefficients.append(coefficient)
+            addends.append(addend)
+        return CompiledPayroll(bases, coefficients, addends, slow_path)
+
+    def price(self, employees: Iterable[Employee]) -> PayrollReport:
+        return self.compile(employees).price()
+
+
+class CompiledPayroll:
+    """Столбцы base, coeff и addend; повторный расчет не обращается к объектам"""
+
+    def __init__(
+            self,
+            bases: List[float],
+            coefficients: List[float],
+            addends: List[float],
+            slow_path: List[Employee]
+    ):
+        self.slow_path = slow_path
+        if np is not None:
+            self.__bases = np.array(bases, dtype=float)
+            self.__coefficients = np.array(coefficients, dtype=float)
+            self.__addends = np.array(addends, dtype=float)
+        else:
+            self.__bases = bases
+            self.__coefficients = coefficients
+            self.__addends = addends
+
+    def __len__(self) -> int:
+        return len(self.__bases)
+
+    def price(self) -> PayrollReport:
+        if np is not None:
+            salaries = (self.__bases * self.__coefficients + self.__addends).tolist()
+        else:
+            salaries = [
+                base * coefficient + addend
+                for base, coefficient, addend
+                in zip(self.__bases, self.__coefficients, self.__addends)
+            ]
+        return PayrollReport(salaries, self.slow_path)
 
 
 # demo
@@ -296,12 +605,14 @@ def main():
     company.hire_employee(salesperson)
     salesperson.add_sales(5000)
     print("\nсотрудники:")
-    for emp in company.get_all_employees():
+    for emp in company.iter_employees():
         print(f"- {emp.get_info()}")
     print("\nстатистика:")
-    print(f"всего сотрудников: {company.get_employee_count()}")
-    print(f"общая зарплата: ${company.calculate_total_salary():.2f}")
-    print(f"средняя зарплата: ${company.calculate_total_salary() / company.get_employee_count():.2f}")
+    count = company.get_employee_count()
+    total = company.calculate_total_salary()
+    print(f"всего сотрудников: {count}")
+    print(f"общая зарплата: ${total:.2f}")
+    print(f"средняя зарплата: ${total / count:.2f}")
     print('demo end')
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import pytest
 from refactored_code import (
     PositiveNumberValidator,
     StringNotEmptyValidator,
+    SalaryStrategy,
     DeveloperSalaryStrategy,
     ManagerSalaryStrategy,
     SalespersonSalaryStrategy,
@@ -11,9 +12,17 @@ from refactored_code import (
     Developer,
     Manager,
     Salesperson,
+    IEmployeeRepository,
     InMemoryEmployeeRepository,
     Company,
+    VALIDATORS,
+    SALARY_STRATEGIES,
+    BONUS_STRATEGIES,
+    SALARY_FUNCTIONS,
+    compile_developer_salary,
+    PayrollCompiler,
 )
+import refactored_code
 
 # tests for validators
 
@@ -184,6 +193,37 @@ class TestInMemoryEmployeeRepository:
         repo.add(emp)
         assert len(repo.get_all()) == 1
 
+    def test_views_do_not_copy(self, monkeypatch):
+        repo = InMemoryEmployeeRepository()
+        for i in range(1, 6):
+            repo.add(Developer(f"Dev{i}", "DEV", 1000 * i, employee_id=i))
+        monkeypatch.setattr(repo, "get_all", lambda: pytest.fail("копия списка"))
+        assert repo.count() == 5
+        assert [emp.id for emp in repo.iter_all()] == [1, 2, 3, 4, 5]
+        assert [emp.id for emp in repo.get_page(3, 10)] == [4, 5]
+        assert repo.get_page(5, 2) == []
+        assert repo.aggregate_salary() == 15000 * 1.05
+        with pytest.raises(ValueError):
+            repo.get_page(-1, 2)
+
+    def test_defaults_for_other_repositories(self):
+        class ListRepository(IEmployeeRepository):
+            def __init__(self):
+                self.items = []
+
+            def add(self, employee):
+                self.items.append(employee)
+
+            def get_all(self):
+                return list(self.items)
+
+        repo = ListRepository()
+        repo.add(Manager("Diana", "MGMT", 5000, 1000, 1))
+        repo.add(Manager("Eve", "MGMT", 4000, 0, 2))
+        assert repo.count() == 2
+        assert [emp.name for emp in repo.get_page(1, 1)] == ["Eve"]
+        assert repo.aggregate_salary() == 10900
+
 
 # tests for company
 
@@ -199,6 +239,15 @@ class TestCompany:
         company.hire_employee(Manager("Diana", "MGMT", 5000, 1000, 3))
         assert company.calculate_total_salary() == 15200
 
+    def test_average_and_paging(self, company):
+        assert company.calculate_average_salary() == 0.0
+        company.hire_employee(Manager("Diana", "MGMT", 5000, 1000, 1))
+        company.hire_employee(Manager("Eve", "MGMT", 3000, 0, 2))
+        assert company.get_employee_count() == 2
+        assert company.calculate_average_salary() == 4900
+        assert [emp.name for emp in company.get_employees_page(0, 1)] == ["Diana"]
+        assert [emp.name for emp in company.iter_employees()] == ["Diana", "Eve"]
+
 
 # integration tests
 
@@ -244,5 +293,148 @@ class TestEdgeCases:
         assert mgr.calculate_salary() == 999999 + 100000 + 99999.9
 
 
+# shared strategies and compiled salary functions
+
+class TestFlyweights:
+
+    def test_strategies_are_shared(self):
+        first = Developer("A", "DEV", 1000, "middle", employee_id=1)
+        second = Developer("B", "DEV", 2000, "senior", employee_id=2)
+        assert first._salary_strategy is second._salary_strategy
+        assert first._bonus_strategy is BONUS_STRATEGIES["seniority"]
+        assert Manager("C", "MGMT", 1000)._salary_strategy is SALARY_STRATEGIES["manager"]
+
+    def test_validators_are_not_allocated(self, monkeypatch):
+        created = []
+        original = PositiveNumberValidator.__init__
+
+        def counting_init(self):
+            created.append(self)
+            original(self)
+
+        monkeypatch.setattr(PositiveNumberValidator, "__init__", counting_init)
+        sales = Salesperson("George", "SALES", 2000, 0.1, employee_id=1)
+        sales.add_sales(5000)
+        assert created == []
+        with pytest.raises(ValueError):
+            sales.add_sales(-1)
+        assert VALIDATORS["positive_number"].validate("5") == 5.0
+
+    @pytest.mark.parametrize("name,args,expected", [
+        ("developer", (1000, "senior"), 2200),
+        ("manager", (5000, 2000), 7500),
+        ("salesperson", (2000, 0.1, 5000), 2500),
+    ])
+    def test_positional_functions(self, name, args, expected):
+        assert SALARY_FUNCTIONS[name](*args) == expected
+
+    def test_compile_with_custom_strategy(self):
+        salary = compile_developer_salary(
+            DeveloperSalaryStrategy(), PerformanceBonusStrategy()
+        )
+        assert salary(1000, "middle") == 1600
+
+    def test_instance_strategies_are_used(self):
+        class DoubleStrategy(SalaryStrategy):
+            def calculate(self, base_salary: float, **kwargs) -> float:
+                return base_salary * 2
+
+        dev = Developer("A", "DEV", 1000, "senior", employee_id=1,
+                        salary_strategy=DoubleStrategy())
+        mgr = Manager("B", "MGMT", 1000, 500, employee_id=2,
+                      bonus_strategy=SeniorityBonusStrategy())
+        sales = Salesperson("C", "SALES", 1000, employee_id=3,
+                            salary_strategy=DoubleStrategy())
+        assert dev.calculate_salary() == 2000 + 200
+        assert mgr.calculate_salary() == 1500 + 50
+        assert sales.calculate_salary() == 2000
+        assert "_salary_function" not in vars(Developer("D", "DEV", 1000))
+        report = PayrollCompiler().price([dev, mgr, sales])
+        assert report.slow_path == [dev, mgr, sales]
+        assert report.salaries == pytest.approx([2200, 1550, 2000])
+
+
+    def test_keyword_only_strategies(self):
+        class KeywordStrategy(SalaryStrategy):
+            def calculate(self, **kwargs) -> float:
+                return kwargs["base_salary"] + 1
+
+        emp = Employee("A", "OPS", 1000, 1, KeywordStrategy(),
+                       PerformanceBonusStrategy())
+        dev = Developer("B", "DEV", 1000, "senior", employee_id=2,
+                        salary_strategy=KeywordStrategy())
+        mgr = Manager("C", "MGMT", 1000, 500, employee_id=3,
+                      salary_strategy=KeywordStrategy())
+        sales = Salesperson("D", "SALES", 1000, employee_id=4,
+                            salary_strategy=KeywordStrategy())
+        assert emp.calculate_salary() == 1001 + 100
+        assert dev.calculate_salary() == 1001 + 200
+        assert mgr.calculate_salary() == 1001 + 100
+        assert sales.calculate_salary() == 1001
+
+# tests for payroll compiler
+
+class TestPayrollCompiler:
+
+    @pytest.fixture
+    def staff(self):
+        sales = Salesperson("George", "SALES", 2000, 0.1, employee_id=4)
+        sales.add_sales(5000)
+        return [
+            Developer("Alice", "DEV", 1000, "junior", employee_id=1),
+            Developer("Bob", "DEV", 3000, "senior", employee_id=2),
+            Developer("Kate", "DEV", 1500, "lead", employee_id=3),
+            sales,
+            Manager("Diana", "MGMT", 5000, 1000, employee_id=5),
+        ]
+
+    def test_matches_objects(self, staff):
+        report = PayrollCompiler().price(staff)
+        expected = [emp.calculate_salary() for emp in staff]
+        assert report.salaries == pytest.approx(expected)
+        assert report.total == pytest.approx(sum(expected))
+        assert report.slow_path == []
+
+    def test_slow_path_is_reported(self, staff):
+        class LeadDeveloper(Developer):
+            def calculate_salary(self) -> float:
+                return super().calculate_salary() + 500
+
+        class FlatStrategy(SalaryStrategy):
+            def calculate(self, base_salary: float, **kwargs) -> float:
+                return 100.0
+
+        lead = LeadDeveloper("Eve", "DEV", 1000, "senior", employee_id=6)
+        flat = Employee("Frank", "OPS", 1000, 7, FlatStrategy(),
+                        PerformanceBonusStrategy())
+        report = PayrollCompiler().price(staff + [lead, flat])
+        assert report.slow_path == [lead, flat]
+        assert report.salaries[-2:] == [2700, 200]
+
+    def test_terms_follow_strategies(self, staff, monkeypatch):
+        def calculate(self, base_salary, commission_rate=0.1, total_sales=0,
+                      **kwargs):
+            return base_salary + total_sales * commission_rate * 2 + 300
+
+        monkeypatch.setattr(SalespersonSalaryStrategy, "calculate", calculate)
+        report = PayrollCompiler().price(staff)
+        assert report.salaries[3] == pytest.approx(2000 + 5000 * 0.1 * 2 + 300)
+
+    def test_reprice_without_objects(self, staff, monkeypatch):
+        compiled = PayrollCompiler().compile(staff)
+        monkeypatch.setattr(Developer, "calculate_salary", lambda self: pytest.fail())
+        monkeypatch.setattr(
+            Developer, "seniority", property(lambda self: pytest.fail())
+        )
+        assert len(compiled) == 5
+        assert compiled.price().total == pytest.approx(18225)
+
+    def test_without_numpy(self, staff, monkeypatch):
+        monkeypatch.setattr(refactored_code, "np", None)
+        report = PayrollCompiler().price(staff)
+        assert isinstance(report.salaries, list)
+        assert report.total == pytest.approx(18225)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])